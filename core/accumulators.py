@@ -0,0 +1,172 @@
+"""
+accumulators.py
+
+Mergowalne akumulatory statystyk opisowych kolumn numerycznych.
+
+Każdy chunk (w dowolnym procesie roboczym) wylicza dla każdej kolumny obiekt `MetricStats`
+(liczność, suma, minimum, maksimum, średnia i M2 – suma kwadratów odchyleń od średniej).
+Obiekty łączy się wzorem Chana (równoległa wersja algorytmu Welforda), więc wariancja
+i odchylenie standardowe całego zbioru powstają w tym samym, jednym przebiegu co sumy –
+bez drugiego przebiegu po danych i bez utraty precyzji typowej dla wzoru E[x²] − E[x]².
+Łączenie jest łączne, więc kolejność chunków i podział na procesy nie mają znaczenia.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+
+
+class MetricStats:
+    """
+    Statystyki jednej kolumny: count, sum, min, max, mean i M2 (braki danych są pomijane).
+    """
+
+    def __init__(
+        self,
+        count: int = 0,
+        total: float = 0.0,
+        minimum: float = math.inf,
+        maximum: float = -math.inf,
+        mean: float = 0.0,
+        m2: float = 0.0
+    ):
+        """
+        Args:
+            count (int): Liczba wartości (bez braków).
+            total (float): Suma wartości.
+            minimum (float): Wartość minimalna.
+            maximum (float): Wartość maksymalna.
+            mean (float): Średnia.
+            m2 (float): Suma kwadratów odchyleń od średniej.
+        """
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_values(cls, values: np.ndarray | pd.Series) -> "MetricStats":
+        """
+        Wylicza statystyki jednego fragmentu danych (dwa wektorowe przebiegi po chunku).
+
+        Args:
+            values (np.ndarray | pd.Series): Wartości kolumny (NaN/NA są pomijane).
+
+        Returns:
+            MetricStats: Statystyki fragmentu.
+        """
+        values = np.asarray(pd.Series(values).astype("float64").dropna(), dtype=np.float64)
+        if len(values) == 0:
+            return cls()
+        total = float(values.sum())
+        mean = total / len(values)
+        m2 = float(np.square(values - mean).sum())
+        return cls(len(values), total, float(values.min()), float(values.max()), mean, m2)
+
+    def merge(self, other: "MetricStats") -> "MetricStats":
+        """
+        Dołącza statystyki innego fragmentu (wzór Chana dla średniej i M2).
+
+        Args:
+            other (MetricStats): Statystyki do dołączenia.
+
+        Returns:
+            MetricStats: Ten obiekt (po scaleniu).
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """
+        Returns:
+            float: Wariancja z próby (NaN dla mniej niż dwóch wartości).
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """
+        Returns:
+            float: Odchylenie standardowe z próby.
+        """
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: Statystyki opisowe (min/max/średnia jako None, gdy brak wartości).
+        """
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": None if empty else self.mean,
+            "std": None if self.count < 2 else self.std,
+            "min": None if empty else self.minimum,
+            "max": None if empty else self.maximum
+        }
+
+
+def describe_chunk(df: pd.DataFrame, columns: list[str] | None = None) -> dict[str, MetricStats]:
+    """
+    Wylicza akumulatory dla kolumn numerycznych chunku.
+
+    Args:
+        df (pd.DataFrame): Fragment danych.
+        columns (list[str] | None): Kolumny do opisania (domyślnie wszystkie numeryczne).
+
+    Returns:
+        dict[str, MetricStats]: Statystyki per kolumna.
+    """
+    numeric = df[columns] if columns is not None else df.select_dtypes("number")
+    return {name: MetricStats.from_values(numeric[name]) for name in numeric.columns}
+
+
+def merge_column_stats(
+    left: dict[str, MetricStats] | None,
+    right: dict[str, MetricStats] | None
+) -> dict[str, MetricStats] | None:
+    """
+    Łączy akumulatory kolumn z dwóch fragmentów (`left` jest modyfikowany w miejscu).
+
+    Args:
+        left (dict[str, MetricStats] | None): Dotychczasowe statystyki.
+        right (dict[str, MetricStats] | None): Statystyki do dołączenia.
+
+    Returns:
+        dict[str, MetricStats] | None: Połączone statystyki.
+    """
+    if right is None:
+        return left
+    if left is None:
+        left = {}
+    for name, stats in right.items():
+        left.setdefault(name, MetricStats()).merge(stats)
+    return left
+
+
+def column_stats_frame(stats: dict[str, MetricStats]) -> pd.DataFrame:
+    """
+    Zestawia statystyki kolumn w tabelę (wiersz = kolumna danych).
+
+    Args:
+        stats (dict[str, MetricStats]): Statystyki per kolumna.
+
+    Returns:
+        pd.DataFrame: Kolumny count, sum, mean, std, min, max.
+    """
+    frame = pd.DataFrame.from_dict({name: s.to_dict() for name, s in stats.items()}, orient="index")
+    frame.index.name = "kolumna"
+    return frame
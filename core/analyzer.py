@@ -3,25 +3,52 @@ analyzer.py
 
 Moduł odpowiedzialny za analizę danych z pliku .parquet w dwóch trybach:
 - parallel_analysis: analiza z użyciem multiprocessing.Pool
-- streaming_global_analysis: analiza sekwencyjna chunków + walidacja
+- streaming_global_analysis: analiza sekwencyjna chunków + walidacja (opcjonalnie
+  wznawialna – z checkpointami per jednostka grup wierszy, core.checkpoint)
 
 Funkcje obliczają sumaryczne metryki (dystans, napiwki, pasażerowie itp.)
 i zapisują podsumowanie do pliku tekstowego. Obsługuje błędy, loguje zdarzenia
-i wykorzystuje dekoratory pomiaru czasu i zliczania wywołań.
+i wykorzystuje dekoratory pomiaru czasu i zliczania wywołań. Chunki, których analiza
+się nie powiodła, nie są wliczane do sum (ich liczba trafia do podsumowania).
 """
 
 import os
 import logging
+import numpy as np
 import pandas as pd
-from multiprocessing import Pool, cpu_count
+from multiprocessing import Pool
 from decorators.timer import measure_time
 from decorators.counter import count_calls
-from core.loader import load_parquet_in_chunks
-from validation.validation_runner import run_all_validations
+from core.loader import load_parquet_in_chunks, load_row_groups, prefetch_chunks, resolve_parquet_files
+from core.schema import TAXI_DTYPES, column_sum
+from core.chunk_sizing import AdaptiveChunkSizer
+from core.dedup import HashIndex, batch_fingerprints, row_fingerprints
+from core.checkpoint import CheckpointStore, run_fingerprint
+from core.work_units import plan_work_units
+from core.arrow_engine import analyze_batch
+from core.dispatch import bounded_imap_unordered
+from core.metadata import get_row_count
+from core.run_options import AnalysisOptions, prepare_run
+from core.transport import SharedFrame, share_chunks, unwrap
+from validation.validation_runner import run_all_validations, build_pushdown_filter, validate_batch
+from validation.stats import ValidationStats
 
 logger = logging.getLogger(__name__)
 
 
+def analyze_shared_chunk(chunk: pd.DataFrame | SharedFrame) -> dict:
+    """
+    Analizuje chunk przekazany bezpośrednio lub przez pamięć współdzieloną (zadanie dla Pool).
+
+    Args:
+        chunk (pd.DataFrame | SharedFrame): Chunk lub uchwyt do chunku w pamięci współdzielonej.
+
+    Returns:
+        dict: Wynik analyze_chunk.
+    """
+    return analyze_chunk(unwrap(chunk))
+
+
 def analyze_chunk(df: pd.DataFrame) -> dict:
     """
     Analizuje pojedynczy fragment danych (chunk) i zwraca metryki.
@@ -30,14 +57,15 @@ def analyze_chunk(df: pd.DataFrame) -> dict:
         df (pd.DataFrame): Fragment danych do analizy.
 
     Returns:
-        dict: Słownik z wynikami (liczba wierszy, sumy wartości, liczba długich kursów).
+        dict: Słownik z wynikami (liczba wierszy, sumy wartości, liczba długich kursów);
+        w razie błędu – zera i klucz "error" (wynik nie jest wliczany do sum).
     """
     try:
         return {
             "rows": len(df),
             "distance": df["trip_distance"].sum(),
-            "tip": df["tip_amount"].sum(),
-            "amount": df["total_amount"].sum(),
+            "tip": column_sum(df["tip_amount"]),
+            "amount": column_sum(df["total_amount"]),
             "passengers": df["passenger_count"].sum(),
             "long_trips": (df["trip_distance"] > 10).sum()
         }
@@ -45,36 +73,76 @@ def analyze_chunk(df: pd.DataFrame) -> dict:
         logger.exception("Błąd podczas analizy chunku: %s", e)
         return {
             "rows": 0, "distance": 0.0, "tip": 0.0, "amount": 0.0,
-            "passengers": 0, "long_trips": 0
+            "passengers": 0, "long_trips": 0, "error": str(e)
         }
 
 
+def _add_result(total: dict, result: dict) -> bool:
+    """
+    Dodaje metryki chunku do sum (wynik z kluczem "error" jest pomijany).
+
+    Args:
+        total (dict): Sumy częściowe.
+        result (dict): Wynik analyze_chunk lub analyze_batch.
+
+    Returns:
+        bool: Czy wynik został wliczony.
+    """
+    if "error" in result:
+        return False
+    for key in total:
+        total[key] += result[key]
+    return True
+
+
 @measure_time
 @count_calls
-def parallel_analysis(path: str, chunksize: int = 100_000) -> dict:
+def parallel_analysis(
+    path: str,
+    options: AnalysisOptions | None = None,
+    **overrides
+) -> dict:
     """
     Wykonuje równoległą analizę danych z pliku .parquet z użyciem multiprocessing.Pool.
 
+    Chunki są wysyłane strumieniowo – w toku jest najwyżej `max_in_flight` zadań,
+    a wyniki są sumowane w kolejności ukończenia (core.dispatch). Z opcji przebiegu
+    używane są: `chunksize`, `low_memory`, `memory_budget`, `deduplicate` (przed wysłaniem
+    chunków do procesów roboczych), `transport` i `max_in_flight`. Wznawialny przebieg
+    z checkpointami zapewnia core.pool_processor.parallel_analysis (`checkpoint_dir`).
+
     Args:
         path (str): Ścieżka do pliku .parquet.
-        chunksize (int): Liczba wierszy na chunk.
+        options (AnalysisOptions | None): Opcje przebiegu (domyślnie AnalysisOptions()).
+        **overrides: Pojedyncze opcje nadpisujące `options` (np. `transport="shm"`).
 
     Returns:
         dict: Podsumowanie analizowanych danych (zapisane też do pliku).
     """
+    options = (options or AnalysisOptions()).replace(**overrides)
     os.makedirs("data/output", exist_ok=True)
     total = {
         "rows": 0, "distance": 0.0, "tip": 0.0,
         "amount": 0.0, "passengers": 0, "long_trips": 0
     }
 
+    shared = set()
     try:
-        with Pool(cpu_count()) as pool:
-            results = pool.map(analyze_chunk, load_parquet_in_chunks(path, chunksize))
+        run = prepare_run(path, options)
+        chunks = load_parquet_in_chunks(path, run.chunksize, low_memory=options.low_memory, dtypes=TAXI_DTYPES)
+        if run.index is not None:
+            chunks = (run.index.drop_seen(chunk) for chunk in chunks)
+        if options.transport == "shm":
+            chunks = share_chunks(chunks, shared)
 
-        for result in results:
-            for key in total:
-                total[key] += result[key]
+        with Pool(run.workers) as pool:
+            failed = 0
+            for chunk, result in bounded_imap_unordered(pool, analyze_shared_chunk, chunks, run.max_in_flight):
+                if isinstance(chunk, SharedFrame):
+                    shared.discard(chunk)
+                    chunk.release()
+                if not _add_result(total, result):
+                    failed += 1
 
         average_fare = total["amount"] / total["rows"] if total["rows"] > 0 else 0
 
@@ -88,6 +156,9 @@ def parallel_analysis(path: str, chunksize: int = 100_000) -> dict:
             "Średnia liczba pasażerów na kurs": round(total["passengers"] / total["rows"], 2),
             "Liczba długich kursów (>10 mil)": total["long_trips"]
         }
+        if failed:
+            summary["Nieudane chunki (niewliczone)"] = failed
+            logger.error(f"Analiza {failed} chunków nie powiodła się – nie zostały wliczone do wyniku.")
 
         _save_summary(summary, "data/output/parallel_summary.txt")
         logger.info("Analiza równoległa zakończona. Wynik zapisany.")
@@ -96,17 +167,55 @@ def parallel_analysis(path: str, chunksize: int = 100_000) -> dict:
     except Exception as e:
         logger.exception("Błąd podczas analizy równoległej: %s", e)
         return {}
+    finally:
+        for frame in shared:
+            frame.release()
 
 
 @measure_time
 @count_calls
-def streaming_global_analysis(path: str, chunksize: int = 100_000) -> dict:
+def streaming_global_analysis(
+    path: str,
+    chunksize: int = 100_000,
+    low_memory: bool = False,
+    prefetch_depth: int = 2,
+    memory_budget: str | int | None = None,
+    deduplicate: bool = True,
+    engine: str = "pandas",
+    collect_stats: bool = True,
+    checkpoint_dir: str | None = None
+) -> dict:
     """
     Wykonuje analizę danych chunk po chunku z walidacją, bez multiprocessing.
 
+    Kolejne chunki są dekodowane w tle (prefetching), równolegle z walidacją i analizą
+    bieżącego. Liczba odrzuceń i czas każdej reguły walidacji (łącznie i per chunk) trafiają
+    do `validation_stats.json` (z `collect_stats=False` nie są zapisywane). Proste reguły
+    walidacji są przekazywane do skanera Parquet jako filtr, więc odrzucone rekordy nie są
+    w ogóle konwertowane do pandas – w statystykach trafiają do pozycji "pushdown".
+
+    Silnik "arrow" waliduje i analizuje paczki rekordów Arrow kernelami pyarrow.compute,
+    bez konwersji chunków do pandas (mniejszy narzut i szczytowe zużycie pamięci).
+
+    Z `checkpoint_dir` dane są czytane jednostkami grup wierszy (core.work_units), a sumy,
+    statystyki walidacji i odciski deduplikacji każdej ukończonej jednostki trafiają
+    do checkpointu. Ponowne uruchomienie po przerwaniu przetwarza tylko brakujące lub
+    nieudane jednostki; checkpointy są usuwane po pełnym sukcesie. Jednostki mają `chunksize`
+    wierszy także z `memory_budget` (budżet wyznacza tylko rozmiar chunków w jednostce).
+
     Args:
         path (str): Ścieżka do pliku .parquet.
         chunksize (int): Liczba wierszy na chunk.
+        low_memory (bool): Odczyt przez mmap i konwersja Arrow → pandas bez zbędnych kopii.
+        prefetch_depth (int): Liczba chunków wczytywanych z wyprzedzeniem (0 – bez prefetchingu).
+        memory_budget (str | int | None): Budżet pamięci (np. "256 MB" na chunk); jeśli podany,
+            rozmiar chunku jest wyliczany z budżetu i korygowany na podstawie zmierzonego RSS.
+        deduplicate (bool): Czy usuwać duplikaty wierszy w obrębie całego zbioru, a nie tylko chunku
+            (indeks odcisków zajmuje ~8 B na poprawny wiersz).
+        engine (str): "pandas" (domyślnie) lub "arrow".
+        collect_stats (bool): Czy zapisać statystyki walidacji.
+        checkpoint_dir (str | None): Katalog checkpointów (np. core.checkpoint.CHECKPOINT_DIR);
+            None – bez checkpointów.
 
     Returns:
         dict: Podsumowanie analizowanych danych (zapisane też do pliku).
@@ -118,12 +227,74 @@ def streaming_global_analysis(path: str, chunksize: int = 100_000) -> dict:
     }
 
     try:
-        for chunk in load_parquet_in_chunks(path, chunksize):
-            chunk = run_all_validations(chunk)
+        if engine not in ("pandas", "arrow"):
+            raise ValueError(f"Nieznany silnik analizy: {engine}")
+        arrow = engine == "arrow"
+        unit_rows = chunksize
+
+        sizer = None
+        if memory_budget is not None:
+            sizer = AdaptiveChunkSizer(
+                path, memory_budget, dtypes=TAXI_DTYPES, concurrent_chunks=prefetch_depth + 1
+            )
+            chunksize = sizer
+
+        stats = ValidationStats()
+        index = HashIndex() if deduplicate else None
+        pushdown = build_pushdown_filter()
+        dtypes = None if arrow else TAXI_DTYPES
+        failed = 0
+
+        if checkpoint_dir is None:
+            chunks = load_parquet_in_chunks(
+                path, chunksize, filters=pushdown, low_memory=low_memory, dtypes=dtypes, arrow=arrow
+            )
+            for chunk in prefetch_chunks(chunks, depth=prefetch_depth):
+                result = _stream_chunk(chunk, arrow, stats, index)
+                if not _add_result(total, result):
+                    failed += 1
+                if sizer is not None:
+                    sizer.observe()
+        else:
+            files = resolve_parquet_files(path)
+            units = plan_work_units(path, unit_rows)
+            store = CheckpointStore(run_fingerprint(
+                files, analysis="streaming", unit_rows=unit_rows,
+                deduplicate=deduplicate, engine=engine
+            ), checkpoint_dir, files)
 
-            result = analyze_chunk(chunk)
-            for key in total:
-                total[key] += result[key]
+            # Najpierw zapisane jednostki – indeks deduplikacji musi znać ich wiersze,
+            # zanim brakujące jednostki zostaną przetworzone
+            pending = []
+            for unit in units:
+                saved = store.load(unit)
+                if saved is None:
+                    pending.append(unit)
+                    continue
+                if index is not None:
+                    index.add(saved["hashes"])
+                    index.dropped += saved["dropped"]
+                _add_result(total, saved["total"])
+                stats.merge(saved["stats"])
+            if len(pending) < len(units):
+                logger.info(
+                    f"[Checkpoint] Wznowiono przebieg {store.path}: {len(units) - len(pending)} "
+                    f"ukończonych jednostek, do przetworzenia: {len(pending)}"
+                )
+
+            for unit in pending:
+                saved = _stream_unit(
+                    unit, chunksize, arrow, index, pushdown, low_memory, dtypes, prefetch_depth, sizer
+                )
+                if saved is None:
+                    failed += 1
+                    continue
+                store.save(unit, saved)
+                _add_result(total, saved["total"])
+                stats.merge(saved["stats"])
+
+            if not failed:
+                store.clear()
 
         average_fare = total["amount"] / total["rows"] if total["rows"] > 0 else 0
 
@@ -137,8 +308,17 @@ def streaming_global_analysis(path: str, chunksize: int = 100_000) -> dict:
             "Średnia liczba pasażerów na kurs": round(total["passengers"] / total["rows"], 2),
             "Liczba długich kursów (>10 mil)": total["long_trips"]
         }
+        if failed:
+            label = "chunki" if checkpoint_dir is None else "jednostki"
+            summary[f"Nieudane {label} (niewliczone)"] = failed
+            logger.error(f"Analiza {failed} fragmentów danych nie powiodła się – nie zostały wliczone do wyniku.")
+        else:
+            # Przy nieudanych fragmentach liczba odczytanych wierszy byłaby niepełna
+            stats.record_pushdown(get_row_count(path), stats.rows_in)
 
         _save_summary(summary, "data/output/streaming_summary.txt")
+        if collect_stats:
+            stats.save("data/output/validation_stats.json")
         logger.info("Analiza streamingowa zakończona. Wynik zapisany.")
         return summary
 
@@ -147,6 +327,86 @@ def streaming_global_analysis(path: str, chunksize: int = 100_000) -> dict:
         return {}
 
 
+def _stream_chunk(
+    chunk, arrow: bool, stats: ValidationStats, index: HashIndex | None, hashes: list | None = None
+) -> dict:
+    """
+    Waliduje, deduplikuje i analizuje jeden chunk analizy streamingowej.
+
+    Args:
+        chunk: Chunk danych (DataFrame lub paczka rekordów Arrow).
+        arrow (bool): Czy chunk jest paczką Arrow.
+        stats (ValidationStats): Statystyki walidacji (uzupełniane).
+        index (HashIndex | None): Indeks deduplikacji globalnej.
+        hashes (list | None): Lista, do której trafiają odciski wierszy zachowanych przez deduplikację.
+
+    Returns:
+        dict: Wynik analyze_chunk / analyze_batch.
+    """
+    chunk = validate_batch(chunk, stats=stats) if arrow else run_all_validations(chunk, stats=stats)
+    if index is not None:
+        chunk = index.drop_seen(chunk)
+        if hashes is not None and len(chunk):
+            hashes.append(batch_fingerprints(chunk, index.columns) if arrow
+                          else row_fingerprints(chunk, index.columns))
+    return analyze_batch(chunk) if arrow else analyze_chunk(chunk)
+
+
+def _stream_unit(
+    unit, chunksize, arrow: bool, index: HashIndex | None, pushdown, low_memory: bool,
+    dtypes, prefetch_depth: int, sizer
+) -> dict | None:
+    """
+    Przetwarza jedną jednostkę grup wierszy analizy streamingowej z checkpointami.
+
+    Odciski wierszy zachowanych przez deduplikację są zbierane, by po wznowieniu
+    odtworzyć z checkpointu stan indeksu bez ponownego czytania jednostki. Po błędzie
+    indeks jest przywracany do stanu sprzed jednostki (nie zawiera jej wierszy).
+
+    Args:
+        unit (WorkUnit): Jednostka pracy.
+        chunksize (int | AdaptiveChunkSizer): Rozmiar chunku.
+        arrow (bool): Czy używać silnika Arrow.
+        index (HashIndex | None): Indeks deduplikacji globalnej.
+        pushdown: Filtr walidacji przekazywany do skanera Parquet (None – bez filtra).
+        low_memory (bool): Odczyt przez mmap.
+        dtypes: Docelowe typy kolumn (silnik pandas).
+        prefetch_depth (int): Liczba chunków wczytywanych z wyprzedzeniem.
+        sizer (AdaptiveChunkSizer | None): Adaptacyjny rozmiar chunku.
+
+    Returns:
+        dict | None: Agregaty jednostki ("total", "stats", "hashes", "dropped")
+        lub None, gdy analiza któregoś chunku się nie powiodła.
+    """
+    total = dict.fromkeys(["rows", "distance", "tip", "amount", "passengers", "long_trips"], 0)
+    stats = ValidationStats()
+    hashes = []
+    state = index.snapshot() if index is not None else None
+    try:
+        chunks = load_row_groups(
+            unit.file_path, unit.row_groups, chunksize, low_memory=low_memory, dtypes=dtypes,
+            filters=pushdown, arrow=arrow, strict=True
+        )
+        for chunk in prefetch_chunks(chunks, depth=prefetch_depth):
+            result = _stream_chunk(chunk, arrow, stats, index, hashes)
+            if not _add_result(total, result):
+                raise RuntimeError(result["error"])
+            if sizer is not None:
+                sizer.observe()
+    except Exception as e:
+        logger.error(f"[Checkpoint] Jednostka {unit.file_path} {unit.row_groups} nie powiodła się: {e}")
+        if index is not None:
+            index.rollback(state)
+        return None
+
+    return {
+        "total": total,
+        "stats": stats,
+        "hashes": np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64),
+        "dropped": index.dropped - state[1] if index is not None else 0,
+    }
+
+
 def _save_summary(summary: dict, path: str) -> None:
     """
     Zapisuje słownik wyników analizy do pliku tekstowego.
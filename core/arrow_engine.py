@@ -0,0 +1,54 @@
+"""
+arrow_engine.py
+
+Silnik analizy działający bezpośrednio na paczkach rekordów Arrow (`pa.RecordBatch`,
+także złożonych w `pa.Table` przy odczycie z filtrem)
+z użyciem kerneli `pyarrow.compute` – bez konwersji chunków do pandas.
+
+Zawiera funkcję analyze_batch: metryki chunku (liczba wierszy, sumy, długie kursy) –
+odpowiednik analyze_chunk. Walidacja paczek odbywa się w
+`validation.validation_runner.validate_batch`, a deduplikacja w `core.dedup.HashIndex`.
+DataFrame powstaje tylko tam, gdzie wymaga go raport (np. raport per VendorID).
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+LONG_TRIP_MILES = 10
+
+
+def _sum(column: pa.Array | pa.ChunkedArray, dtype: pa.DataType | None = None):
+    """
+    Sumuje kolumnę (opcjonalnie po rzutowaniu), zwracając 0 dla pustej kolumny.
+
+    Args:
+        column (pa.Array | pa.ChunkedArray): Kolumna do zsumowania.
+        dtype (pa.DataType | None): Typ akumulatora (np. float64 dla kolumn float32).
+
+    Returns:
+        int | float: Suma wartości (z pominięciem braków).
+    """
+    if dtype is not None and column.type != dtype:
+        column = pc.cast(column, dtype)
+    return pc.sum(column).as_py() or 0
+
+
+def analyze_batch(batch: pa.RecordBatch | pa.Table) -> dict:
+    """
+    Oblicza metryki paczki rekordów – te same klucze co `analyze_chunk` w core.analyzer.
+
+    Args:
+        batch (pa.RecordBatch | pa.Table): Paczka rekordów lub tabela złożona z paczek (po walidacji).
+
+    Returns:
+        dict: Słownik z wynikami (liczba wierszy, sumy wartości, liczba długich kursów).
+    """
+    distance = batch.column("trip_distance")
+    return {
+        "rows": batch.num_rows,
+        "distance": _sum(distance),
+        "tip": _sum(batch.column("tip_amount"), pa.float64()),
+        "amount": _sum(batch.column("total_amount"), pa.float64()),
+        "passengers": _sum(batch.column("passenger_count")),
+        "long_trips": pc.sum(pc.greater(distance, LONG_TRIP_MILES)).as_py() or 0
+    }
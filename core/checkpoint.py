@@ -0,0 +1,164 @@
+"""
+checkpoint.py
+
+Lokalny magazyn punktów kontrolnych (checkpointów) dla wznawialnych przebiegów analizy.
+
+Po ukończeniu każdej jednostki pracy (grupy wierszy pliku, core.work_units) jej agregaty
+częściowe są zapisywane do osobnego pliku w katalogu przebiegu. Po przerwaniu analizy
+(OOM, wywłaszczenie procesu) ponowne uruchomienie z tym samym katalogiem wczytuje zapisane
+agregaty i przetwarza tylko brakujące lub nieudane jednostki.
+
+Katalog przebiegu jest wyznaczany z odcisku wejścia (ścieżki, rozmiary i czasy modyfikacji
+plików) oraz parametrów wpływających na wynik (`run_fingerprint`) – zmiana danych lub
+parametrów rozpoczyna nowy przebieg zamiast mieszać niezgodne agregaty. Pliki są zapisywane
+atomowo (plik tymczasowy + `os.replace`), więc przerwanie w trakcie zapisu nie zostawia
+uszkodzonego checkpointu.
+
+Katalog przebiegu zawiera też manifest z odciskiem plików wejściowych. Przy otwarciu magazynu
+usuwane są przebiegi, których pliki zmieniły się lub zniknęły – takich przebiegów nie da się
+już wznowić (`prune_stale_runs`).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from core.logger import logger
+from core.work_units import WorkUnit
+
+# Domyślny katalog checkpointów
+CHECKPOINT_DIR = "data/checkpoints"
+
+# Nazwa pliku z odciskiem wejścia w katalogu przebiegu
+MANIFEST_FILE = "run.json"
+
+
+def _file_entries(files: list[str]) -> list[list]:
+    """
+    Zwraca ścieżki bezwzględne, rozmiary i czasy modyfikacji plików (OSError, gdy pliku brak).
+    """
+    entries = []
+    for file_path in files:
+        stat = os.stat(file_path)
+        entries.append([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns])
+    return entries
+
+
+def run_fingerprint(files: list[str], **params) -> str:
+    """
+    Wyznacza identyfikator przebiegu z plików wejściowych i parametrów analizy.
+
+    Args:
+        files (list[str]): Pliki wejściowe.
+        **params: Parametry wpływające na wynik (np. rozmiar jednostek, walidacja).
+
+    Returns:
+        str: Identyfikator przebiegu (16 znaków szesnastkowych).
+    """
+    payload = json.dumps({"files": _file_entries(files), "params": params}, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def prune_stale_runs(directory: str = CHECKPOINT_DIR) -> int:
+    """
+    Usuwa katalogi przebiegów, których pliki wejściowe zmieniły się lub zostały usunięte.
+
+    Przebiegi bez manifestu są pomijane, a przebiegi innych parametrów na niezmienionych
+    danych zostają (można je jeszcze wznowić).
+
+    Args:
+        directory (str): Katalog bazowy checkpointów.
+
+    Returns:
+        int: Liczba usuniętych przebiegów.
+    """
+    removed = 0
+    for name in os.listdir(directory):
+        run_path = os.path.join(directory, name)
+        try:
+            with open(os.path.join(run_path, MANIFEST_FILE), encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            continue
+        try:
+            current = _file_entries([entry[0] for entry in entries])
+        except OSError:
+            current = None
+        if current != entries:
+            shutil.rmtree(run_path, ignore_errors=True)
+            logger.info(f"[Checkpoint] Usunięto przebieg {run_path} – jego dane wejściowe zmieniły się.")
+            removed += 1
+    return removed
+
+
+class CheckpointStore:
+    """
+    Katalog z agregatami częściowymi ukończonych jednostek pracy jednego przebiegu.
+    """
+
+    def __init__(self, run_id: str, directory: str = CHECKPOINT_DIR, files: list[str] | None = None):
+        """
+        Args:
+            run_id (str): Identyfikator przebiegu (run_fingerprint).
+            directory (str): Katalog bazowy checkpointów.
+            files (list[str] | None): Pliki wejściowe przebiegu – zapisywane w manifeście,
+                a przebiegi na zmienionych danych są usuwane (prune_stale_runs).
+        """
+        self.path = os.path.join(directory, run_id)
+        os.makedirs(self.path, exist_ok=True)
+        if files is not None:
+            temp_path = os.path.join(self.path, MANIFEST_FILE + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(_file_entries(files), f)
+            os.replace(temp_path, os.path.join(self.path, MANIFEST_FILE))
+            prune_stale_runs(directory)
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.path) if name.endswith(".pkl"))
+
+    def _file(self, unit: WorkUnit) -> str:
+        key = f"{os.path.abspath(unit.file_path)}:{unit.row_groups}"
+        return os.path.join(self.path, hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + ".pkl")
+
+    def load(self, unit: WorkUnit):
+        """
+        Wczytuje zapisane agregaty jednostki.
+
+        Args:
+            unit (WorkUnit): Jednostka pracy.
+
+        Returns:
+            Zapisane agregaty lub None, gdy jednostka nie została ukończona
+            (uszkodzony checkpoint jest usuwany).
+        """
+        file_path = self._file(unit)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"[Checkpoint] Uszkodzony checkpoint {file_path} ({e}) – jednostka zostanie przeliczona.")
+            os.remove(file_path)
+            return None
+
+    def save(self, unit: WorkUnit, payload) -> None:
+        """
+        Zapisuje atomowo agregaty ukończonej jednostki.
+
+        Args:
+            unit (WorkUnit): Jednostka pracy.
+            payload: Agregaty częściowe (obiekt możliwy do serializacji przez pickle).
+        """
+        file_path = self._file(unit)
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, file_path)
+
+    def clear(self) -> None:
+        """
+        Usuwa checkpointy przebiegu (po jego pełnym ukończeniu).
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
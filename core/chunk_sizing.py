@@ -0,0 +1,298 @@
+"""
+chunk_sizing.py
+
+Moduł dobierający rozmiar chunku (liczbę wierszy) na podstawie budżetu pamięci
+zamiast stałej wartości `chunksize=100_000`.
+
+Zawiera:
+- parse_memory_budget: zamienia budżet ("256 MB", "2GB", "60%") na bajty na chunk,
+- estimate_row_bytes: szacuje rozmiar wiersza w pamięci ze schematu Parquet i statystyk grup wierszy,
+- rows_for_budget: wylicza liczbę wierszy na chunk dla zadanego budżetu,
+- AdaptiveChunkSizer: koryguje rozmiar chunku w trakcie pracy na podstawie zmierzonego RSS,
+- rows_per_task: zmniejsza chunk tak, by zadań dla puli procesów było dość do równoważenia obciążenia.
+"""
+
+import math
+import re
+import psutil
+import pyarrow as pa
+import pyarrow.parquet as pq
+from core.loader import resolve_parquet_files
+from core.logger import logger
+
+DEFAULT_CHUNKSIZE = 100_000
+MIN_CHUNK_ROWS = 1_000
+MAX_CHUNK_ROWS = 5_000_000
+
+# Współczynnik na kopie pośrednie powstające przy walidacji i analizie chunku
+PROCESSING_OVERHEAD = 2.0
+
+# Tolerancja przekroczenia budżetu, poniżej której rozmiar chunku nie jest zmieniany
+BUDGET_TOLERANCE = 1.1
+
+# Szacowana szerokość (w bajtach) kolumn po zastosowaniu schematu z core.schema
+_TARGET_WIDTHS = {
+    "category": 1,
+    "Int8": 2,
+    "float32": 4,
+}
+
+# Minimalna liczba zadań na proces roboczy – przy nierównych chunkach szybsze procesy
+# pobierają kolejne zadania zamiast czekać na najwolniejszy
+TASKS_PER_WORKER = 4
+
+# Dolna granica rozmiaru zadania (narzut na zadanie nie może dominować nad pracą)
+MIN_TASK_ROWS = 10_000
+
+_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def current_rss() -> int:
+    """
+    Zwraca bieżące zużycie pamięci (RSS) procesu w bajtach.
+
+    Returns:
+        int: RSS w bajtach.
+    """
+    return psutil.Process().memory_info().rss
+
+
+def parse_memory_budget(budget: str | int | float, concurrent_chunks: int = 1) -> int:
+    """
+    Zamienia budżet pamięci na liczbę bajtów przypadającą na jeden chunk.
+
+    - wartość bezwzględna (np. 268435456, "256 MB", "1.5GB") oznacza budżet na jeden chunk,
+    - procent (np. "60%") oznacza część aktualnie dostępnej pamięci RAM przeznaczoną
+      na wszystkie równoczesne chunki (np. wszystkie procesy robocze), dzieloną przez
+      `concurrent_chunks`.
+
+    Args:
+        budget (str | int | float): Budżet pamięci.
+        concurrent_chunks (int): Liczba chunków przetwarzanych jednocześnie.
+
+    Returns:
+        int: Budżet w bajtach na jeden chunk.
+
+    Raises:
+        ValueError: Gdy budżetu nie da się sparsować lub nie jest dodatni.
+    """
+    if isinstance(budget, (int, float)):
+        value = int(budget)
+    else:
+        text = budget.strip().upper()
+        if text.endswith("%"):
+            fraction = float(text[:-1]) / 100
+            available = psutil.virtual_memory().available
+            value = int(available * fraction / max(concurrent_chunks, 1))
+        else:
+            match = re.fullmatch(r"([0-9]*\.?[0-9]+)\s*([KMGT]?B?)", text)
+            if not match:
+                raise ValueError(f"Niepoprawny budżet pamięci: {budget}")
+            unit = match.group(2)
+            if unit and not unit.endswith("B"):
+                unit += "B"
+            value = int(float(match.group(1)) * _UNITS[unit])
+
+    if value <= 0:
+        raise ValueError(f"Budżet pamięci musi być dodatni: {budget}")
+    return value
+
+
+def estimate_row_bytes(
+    path: str,
+    columns: list[str] | None = None,
+    dtypes: dict[str, str] | None = None
+) -> float:
+    """
+    Szacuje rozmiar jednego wiersza w pamięci na podstawie metadanych pliku Parquet.
+
+    Kolumny o stałej szerokości są liczone według typu (po zastosowaniu schematu `dtypes`),
+    a kolumny o zmiennej szerokości (np. tekst) według nieskompresowanego rozmiaru
+    zapisanego w statystykach grup wierszy. Wynik uwzględnia narzut na kopie pośrednie.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet (dla katalogu/globu – pierwszy z plików).
+        columns (list[str] | None): Wczytywane kolumny (domyślnie wszystkie).
+        dtypes (dict[str, str] | None): Schemat typów stosowany przy odczycie.
+
+    Returns:
+        float: Szacowana liczba bajtów na wiersz (0 dla pustego pliku lub braku plików).
+
+    Raises:
+        ValueError: Gdy któraś z kolumn `columns` nie występuje w schemacie pliku.
+    """
+    dtypes = dtypes or {}
+    files = resolve_parquet_files(path)
+    if not files:
+        return 0.0
+
+    with pq.ParquetFile(files[0]) as parquet_file:
+        metadata = parquet_file.metadata
+        schema = parquet_file.schema_arrow
+        if metadata.num_rows == 0:
+            return 0.0
+
+        names = columns or schema.names
+        unknown = [name for name in names if name not in schema.names]
+        if unknown:
+            raise ValueError(f"Kolumny spoza schematu pliku {files[0]}: {unknown}")
+        uncompressed = dict.fromkeys(names, 0)
+        for rg in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg)
+            for ci in range(row_group.num_columns):
+                column = row_group.column(ci)
+                if column.path_in_schema in uncompressed:
+                    uncompressed[column.path_in_schema] += column.total_uncompressed_size
+
+        row_bytes = 0.0
+        for name in names:
+            arrow_type = schema.field(name).type
+            if name in dtypes and dtypes[name] in _TARGET_WIDTHS:
+                row_bytes += _TARGET_WIDTHS[dtypes[name]]
+            elif pa.types.is_primitive(arrow_type) and not pa.types.is_boolean(arrow_type):
+                row_bytes += arrow_type.bit_width // 8
+            else:
+                row_bytes += uncompressed[name] / metadata.num_rows
+
+    return row_bytes * PROCESSING_OVERHEAD
+
+
+def rows_for_budget(
+    path: str,
+    memory_budget: str | int | float,
+    columns: list[str] | None = None,
+    dtypes: dict[str, str] | None = None,
+    concurrent_chunks: int = 1
+) -> int:
+    """
+    Wylicza liczbę wierszy na chunk mieszczącą się w budżecie pamięci.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet (dla katalogu/globu – dowolny z plików).
+        memory_budget (str | int | float): Budżet, np. "256 MB" na chunk lub "60%" RAM łącznie.
+        columns (list[str] | None): Wczytywane kolumny.
+        dtypes (dict[str, str] | None): Schemat typów stosowany przy odczycie.
+        concurrent_chunks (int): Liczba chunków przetwarzanych jednocześnie (np. liczba procesów).
+
+    Returns:
+        int: Liczba wierszy na chunk (w przedziale MIN_CHUNK_ROWS–MAX_CHUNK_ROWS).
+    """
+    chunk_budget = parse_memory_budget(memory_budget, concurrent_chunks)
+    row_bytes = estimate_row_bytes(path, columns, dtypes)
+    return _rows_within(chunk_budget, row_bytes)
+
+
+def _rows_within(chunk_budget: int, row_bytes: float) -> int:
+    """
+    Wylicza liczbę wierszy o rozmiarze `row_bytes` mieszczącą się w budżecie chunku.
+    """
+    if row_bytes <= 0:
+        return DEFAULT_CHUNKSIZE
+
+    rows = int(chunk_budget / row_bytes)
+    rows = min(max(rows, MIN_CHUNK_ROWS), MAX_CHUNK_ROWS)
+    logger.info(
+        f"[ChunkSizing] Budżet {chunk_budget / 1024 ** 2:.1f} MB na chunk, "
+        f"~{row_bytes:.0f} B/wiersz → {rows} wierszy na chunk"
+    )
+    return rows
+
+
+def rows_per_task(total_rows: int, chunksize: int, workers: int) -> int:
+    """
+    Dobiera rozmiar zadania dla puli procesów: nie większy niż `chunksize`, ale na tyle mały,
+    by każdy proces otrzymał co najmniej TASKS_PER_WORKER zadań (nie mniej niż MIN_TASK_ROWS wierszy).
+
+    Args:
+        total_rows (int): Liczba wierszy w zbiorze danych (np. z metadanych Parquet).
+        chunksize (int): Maksymalna liczba wierszy na chunk.
+        workers (int): Liczba procesów roboczych.
+
+    Returns:
+        int: Liczba wierszy na zadanie.
+    """
+    if total_rows <= 0:
+        return chunksize
+    balanced = math.ceil(total_rows / (max(workers, 1) * TASKS_PER_WORKER))
+    return min(chunksize, max(balanced, MIN_TASK_ROWS))
+
+
+class AdaptiveChunkSizer:
+    """
+    Dobiera rozmiar chunku na podstawie budżetu pamięci i koryguje go w trakcie pracy.
+
+    Początkowa liczba wierszy pochodzi z `rows_for_budget`. Po przetworzeniu każdego chunku
+    należy wywołać `observe` (robi to m.in. `clean_data`). Pierwszy pomiar kalibruje poziom
+    bazowy – jednorazowe koszty (importy, pule pamięci pyarrow) ponad szacowany rozmiar
+    chunków nie są wliczane do budżetu. Kolejne pomiary porównują przyrost RSS z budżetem:
+    przy przekroczeniu (o ponad 10%) chunk jest zmniejszany, a przy wykorzystaniu poniżej połowy budżetu
+    – zwiększany (maksymalnie dwukrotnie na krok).
+
+    Obiekt jest wywoływalny i może być przekazany do `load_parquet_in_chunks` jako `chunksize`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memory_budget: str | int | float,
+        columns: list[str] | None = None,
+        dtypes: dict[str, str] | None = None,
+        concurrent_chunks: int = 1
+    ):
+        """
+        Args:
+            path (str): Ścieżka do pliku Parquet (dla katalogu/globu – dowolny z plików).
+            memory_budget (str | int | float): Budżet pamięci, np. "256 MB" lub "60%".
+            columns (list[str] | None): Wczytywane kolumny.
+            dtypes (dict[str, str] | None): Schemat typów stosowany przy odczycie.
+            concurrent_chunks (int): Liczba chunków jednocześnie w pamięci (np. 1 + prefetch).
+        """
+        self.chunk_budget = parse_memory_budget(memory_budget, concurrent_chunks)
+        self.concurrent_chunks = concurrent_chunks
+        self.total_budget = self.chunk_budget * concurrent_chunks
+        self.row_bytes = estimate_row_bytes(path, columns, dtypes)
+        self.rows = _rows_within(self.chunk_budget, self.row_bytes)
+        self.baseline_rss = current_rss()
+        self._calibrated = False
+
+    def __call__(self) -> int:
+        """
+        Returns:
+            int: Bieżąca liczba wierszy na chunk.
+        """
+        return self.rows
+
+    def observe(self, rss_bytes: int | None = None) -> int:
+        """
+        Koryguje rozmiar chunku na podstawie zmierzonego zużycia pamięci.
+
+        Args:
+            rss_bytes (int | None): Zmierzony RSS w bajtach (domyślnie mierzony teraz).
+
+        Returns:
+            int: Nowa liczba wierszy na chunk.
+        """
+        rss = current_rss() if rss_bytes is None else rss_bytes
+        if not self._calibrated:
+            expected = self.rows * self.row_bytes * self.concurrent_chunks
+            self.baseline_rss = max(self.baseline_rss, rss - expected)
+            self._calibrated = True
+            return self.rows
+
+        used = max(rss - self.baseline_rss, 1)
+
+        if used > self.total_budget * BUDGET_TOLERANCE:
+            factor = max(self.total_budget / used, 0.5)
+        elif used < self.total_budget / 2:
+            factor = min(self.total_budget / (2 * used), 2.0)
+        else:
+            return self.rows
+
+        new_rows = min(max(int(self.rows * factor), MIN_CHUNK_ROWS), MAX_CHUNK_ROWS)
+        if new_rows != self.rows:
+            logger.info(
+                f"[ChunkSizing] RSS +{used / 1024 ** 2:.1f} MB przy budżecie "
+                f"{self.total_budget / 1024 ** 2:.1f} MB → chunk {self.rows} → {new_rows} wierszy"
+            )
+            self.rows = new_rows
+        return self.rows
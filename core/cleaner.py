@@ -4,9 +4,11 @@ cleaner.py
 Moduł odpowiedzialny za czyszczenie i walidację danych w formie chunków.
 
 Zawiera funkcję clean_data, która:
+- rzutuje kolumny na kompaktowy schemat typów (core.schema.TAXI_DTYPES)
 - filtruje dane za pomocą walidatora
 - loguje liczbę rekordów przed i po przetworzeniu
-- mierzy zużycie pamięci RAM
+- mierzy zużycie pamięci RAM (i przekazuje pomiar do AdaptiveChunkSizer, jeśli podano)
+- opcjonalnie zbiera statystyki odrzuceń per reguła (ValidationStats)
 
 W przypadku błędu zwraca pusty DataFrame, aby nie przerywać całego procesu.
 """
@@ -16,7 +18,10 @@ import psutil
 from decorators.timer import measure_time
 from decorators.counter import count_calls
 from validation.validation_runner import validate_chunk
+from validation.stats import ValidationStats
 from core.logger import logger
+from core.schema import apply_schema
+from core.chunk_sizing import AdaptiveChunkSizer
 
 NEEDED_COLUMNS = [
     "passenger_count", "trip_distance", "tip_amount", "total_amount",
@@ -25,21 +30,31 @@ NEEDED_COLUMNS = [
 
 @measure_time
 @count_calls
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_data(
+    df: pd.DataFrame,
+    sizer: AdaptiveChunkSizer | None = None,
+    stats: ValidationStats | None = None
+) -> pd.DataFrame:
     """
     Czyści i waliduje pojedynczy chunk danych.
 
     Args:
         df (pd.DataFrame): Chunk danych do przetworzenia.
+        sizer (AdaptiveChunkSizer | None): Jeśli podano, otrzymuje zmierzony RSS,
+            aby skorygować rozmiar kolejnych chunków.
+        stats (ValidationStats | None): Jeśli podano, zbiera liczbę odrzuceń i czas każdej reguły.
 
     Returns:
         pd.DataFrame: Przefiltrowany i zweryfikowany chunk. W razie błędu — pusty DataFrame.
     """
     try:
         initial_len = len(df)
-        cleaned_df = validate_chunk(df)
+        cleaned_df = validate_chunk(apply_schema(df), stats=stats)
         cleaned_len = len(cleaned_df)
-        mem = psutil.Process().memory_info().rss / 1024 ** 2
+        rss = psutil.Process().memory_info().rss
+        mem = rss / 1024 ** 2
+        if sizer is not None:
+            sizer.observe(rss)
         logger.info(
             f"[Cleaner] Chunk: {initial_len} → {cleaned_len} rekordów po walidacji | RAM: {mem:.2f} MB"
         )
@@ -0,0 +1,158 @@
+"""
+dedup.py
+
+Globalna deduplikacja wierszy w obrębie całego zbioru danych (między chunkami, plikami
+i procesami roboczymi).
+
+Każdy wiersz jest zamieniany na 64-bitowy odcisk (`row_fingerprints`, moduł
+`validation.fingerprints` – wspólny z walidatorem duplikatów), a odciski
+już widzianych wierszy są przechowywane w posortowanych tablicach numpy (`HashIndex`).
+Pamięć indeksu to ~8 bajtów na unikalny wiersz, niezależnie od szerokości danych.
+
+Paczki rekordów Arrow mają własną funkcję odcisków (`batch_fingerprints`); odciski
+z obu funkcji nie są wymienne, więc jeden indeks powinien być zasilany jedną z nich.
+
+Prawdopodobieństwo kolizji 64-bitowych odcisków jest pomijalne (rzędu n² / 2⁶⁵,
+czyli ~10⁻⁵ dla 10⁷ wierszy) – kolizja oznaczałaby błędne usunięcie jednego wiersza.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from core.logger import logger
+from validation.fingerprints import batch_fingerprints, row_fingerprints
+
+
+class HashIndex:
+    """
+    Zbiór odcisków wierszy oparty na posortowanych przebiegach (runs) tablic uint64.
+
+    Nowe odciski z chunku tworzą nowy, krótki przebieg; przebieg nie większy niż dwukrotność
+    następnego jest z nim scalany (jak w drzewie LSM). Przebiegów jest więc O(log n),
+    a każdy odcisk jest kopiowany O(log n) razy w ciągu całego przebiegu – zamiast
+    wstawiania do jednej tablicy, które kopiuje cały indeks przy każdym chunku.
+    Sprawdzenie przynależności to wyszukiwanie binarne (`np.searchsorted`) w każdym przebiegu.
+    """
+
+    # Przebieg jest scalany z następnym, gdy ten ma co najmniej 1/MERGE_RATIO jego rozmiaru
+    MERGE_RATIO = 2
+
+    def __init__(self, columns: list[str] | None = None):
+        """
+        Args:
+            columns (list[str] | None): Kolumny identyfikujące wiersz (domyślnie wszystkie).
+        """
+        self.columns = columns
+        self.dropped = 0
+        # Rozłączne, posortowane przebiegi – od najstarszego (największego) do najnowszego
+        self._runs: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns:
+            int: Rozmiar indeksu w bajtach.
+        """
+        return sum(run.nbytes for run in self._runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Sprawdza, które odciski są już w indeksie.
+
+        Args:
+            hashes (np.ndarray): Odciski uint64.
+
+        Returns:
+            np.ndarray: Maska bool (True – odcisk już widziany).
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes)
+            inside = positions < len(run)
+            found[inside] |= run[positions[inside]] == hashes[inside]
+        return found
+
+    def snapshot(self) -> tuple[tuple[np.ndarray, ...], int]:
+        """
+        Zapamiętuje stan indeksu (O(log n) – przebiegi są zastępowane, a nie modyfikowane).
+
+        Returns:
+            tuple[tuple[np.ndarray, ...], int]: Stan do przywrócenia przez `rollback`.
+        """
+        return tuple(self._runs), self.dropped
+
+    def rollback(self, state: tuple[tuple[np.ndarray, ...], int]) -> None:
+        """
+        Przywraca stan indeksu (np. po nieudanym przetworzeniu jednostki danych).
+
+        Args:
+            state (tuple[tuple[np.ndarray, ...], int]): Wynik `snapshot`.
+        """
+        runs, self.dropped = state
+        self._runs = list(runs)
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Dodaje odciski do indeksu i zwraca maskę pierwszych wystąpień.
+
+        Args:
+            hashes (np.ndarray): Odciski uint64 (w kolejności wierszy).
+
+        Returns:
+            np.ndarray: Maska bool – True dla wierszy niewidzianych wcześniej
+            (ani w poprzednich wywołaniach, ani wcześniej w tej samej tablicy).
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        unique, first = np.unique(hashes, return_index=True)
+        fresh = ~self.contains(unique)
+
+        is_new = np.zeros(len(hashes), dtype=bool)
+        is_new[first[fresh]] = True
+
+        new_hashes = unique[fresh]
+        if len(new_hashes):
+            self._runs.append(new_hashes)
+            self._compact()
+        return is_new
+
+    def _compact(self) -> None:
+        """
+        Scala najnowsze przebiegi, dopóki przedostatni nie jest wyraźnie większy od ostatniego.
+        """
+        runs = self._runs
+        while len(runs) > 1 and len(runs[-2]) <= self.MERGE_RATIO * len(runs[-1]):
+            newest = runs.pop()
+            # Sortowanie stabilne (timsort) łączy dwa posortowane przebiegi w czasie liniowym
+            runs[-1] = np.sort(np.concatenate([runs[-1], newest]), kind="stable")
+
+    def drop_seen(
+        self, data: pd.DataFrame | pa.RecordBatch | pa.Table
+    ) -> pd.DataFrame | pa.RecordBatch | pa.Table:
+        """
+        Usuwa z chunku wiersze, które wystąpiły wcześniej w zbiorze danych, i zapamiętuje resztę.
+
+        Args:
+            data (pd.DataFrame | pa.RecordBatch | pa.Table): Chunk danych (DataFrame lub dane Arrow).
+
+        Returns:
+            pd.DataFrame | pa.RecordBatch | pa.Table: Chunk bez duplikatów globalnych (tego samego typu).
+        """
+        if len(data) == 0:
+            return data
+
+        arrow = isinstance(data, (pa.RecordBatch, pa.Table))
+        fingerprints = batch_fingerprints(data, self.columns) if arrow else row_fingerprints(data, self.columns)
+        is_new = self.add(fingerprints)
+        duplicates = len(data) - int(is_new.sum())
+        if duplicates == 0:
+            return data
+
+        self.dropped += duplicates
+        logger.info(f"[Dedup] Usunięto {duplicates} duplikatów z chunku (indeks: {len(self)} wierszy)")
+        if arrow:
+            return data.filter(pa.array(is_new))
+        return data[is_new].reset_index(drop=True)
@@ -0,0 +1,75 @@
+"""
+dispatch.py
+
+Strumieniowe wysyłanie zadań do puli procesów z ograniczoną liczbą zadań w toku.
+
+`pool.map` i `pool.imap` pobierają cały iterator wejściowy od razu (wątek zadań puli
+nie czeka na wolne procesy), więc przy wolniejszych procesach roboczych w pamięci
+gromadzą się wszystkie zdekodowane chunki. `bounded_imap_unordered` pobiera kolejny
+element wejścia dopiero po otrzymaniu wyniku (backpressure) i zwraca wyniki w kolejności
+ich ukończenia, więc agregaty mogą być aktualizowane na bieżąco.
+"""
+
+import queue
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+
+# Domyślna liczba zadań w toku na proces roboczy (jedno liczone, jedno czekające w kolejce)
+IN_FLIGHT_PER_WORKER = 2
+
+
+class _TaskFailure:
+    """
+    Opakowanie wyjątku zgłoszonego przez zadanie (przekazywane przez kolejkę wyników).
+    """
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def bounded_imap_unordered(
+    pool,
+    func: Callable,
+    items: Iterable,
+    max_in_flight: int
+) -> Iterator[tuple[object, object]]:
+    """
+    Wykonuje `func` dla kolejnych elementów w puli procesów, utrzymując co najwyżej
+    `max_in_flight` zadań w toku.
+
+    Args:
+        pool (multiprocessing.pool.Pool): Pula procesów roboczych.
+        func (Callable): Zadanie (funkcja możliwa do serializacji przez pickle).
+        items (Iterable): Wejście zadań – pobierane leniwie.
+        max_in_flight (int): Maksymalna liczba wysłanych, a nieukończonych zadań.
+
+    Yields:
+        tuple[object, object]: Element wejścia i wynik jego zadania (w kolejności ukończenia).
+
+    Raises:
+        Exception: Wyjątek zgłoszony przez zadanie (pozostałe zadania nie są już wysyłane).
+    """
+    done = queue.SimpleQueue()
+    pending = iter(items)
+
+    def submit(item) -> None:
+        pool.apply_async(
+            func, (item,),
+            callback=lambda result: done.put((item, result)),
+            error_callback=lambda error: done.put((item, _TaskFailure(error)))
+        )
+
+    in_flight = 0
+    for item in islice(pending, max(max_in_flight, 1)):
+        submit(item)
+        in_flight += 1
+
+    while in_flight:
+        item, result = done.get()
+        in_flight -= 1
+        if isinstance(result, _TaskFailure):
+            raise result.error
+        for next_item in islice(pending, 1):
+            submit(next_item)
+            in_flight += 1
+        yield item, result
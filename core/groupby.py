@@ -0,0 +1,191 @@
+"""
+groupby.py
+
+Równoległy silnik grupowania i agregacji (group-by) dla danych czytanych chunkami.
+
+Grupowanie (`GroupBy`) to lista kluczy – kolumn danych (np. "VendorID", "payment_type",
+"PULocationID") lub kluczy pochodnych ("pickup_hour", "pickup_weekday", "pickup_date") –
+oraz agregaty kolumn numerycznych: count, sum, mean, min i max.
+
+Każdy proces roboczy buduje dla swojego chunku agregat częściowy (`GroupBy.partial`) –
+tabelę haszującą grupowania pandas z mergowalnymi składnikami (liczność, suma, minimum,
+maksimum; średnia powstaje dopiero z sumy i liczności). Agregaty częściowe są łączone
+parami w drzewo (`TreeReducer`), więc każde łączenie dotyczy tabel podobnej wielkości,
+a w pamięci jest naraz najwyżej log₂(liczba chunków) tabel. Rozmiar agregatu zależy od
+liczby grup, a nie od liczby wierszy – raport z całego zbioru powstaje w ograniczonej pamięci.
+"""
+
+from collections.abc import Callable
+import pandas as pd
+from core.sampling import DERIVED_STRATA
+
+# Klucze pochodne wyliczane z kolumn danych (te same co warstwy próbkowania)
+DERIVED_KEYS = DERIVED_STRATA
+
+# Obsługiwane agregaty
+AGGREGATES = ("count", "sum", "mean", "min", "max")
+
+# Składniki agregatu częściowego potrzebne do wyliczenia każdego agregatu
+_COMPONENTS = {
+    "count": ["count"],
+    "sum": ["sum"],
+    "mean": ["count", "sum"],
+    "min": ["min"],
+    "max": ["max"],
+}
+
+# Sposób łączenia składników agregatów częściowych
+_MERGE = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+
+
+class GroupBy:
+    """
+    Specyfikacja grupowania: klucze i agregaty kolumn numerycznych.
+    """
+
+    def __init__(self, keys: list[str], aggregates: dict[str, list[str]]):
+        """
+        Args:
+            keys (list[str]): Kolumny lub klucze pochodne (DERIVED_KEYS) grupowania.
+            aggregates (dict[str, list[str]]): Kolumna → lista agregatów (AGGREGATES).
+        """
+        unknown = {agg for aggs in aggregates.values() for agg in aggs} - set(AGGREGATES)
+        if unknown:
+            raise ValueError(f"Nieznane agregaty: {sorted(unknown)}")
+        if not keys:
+            raise ValueError("Grupowanie wymaga co najmniej jednego klucza")
+        self.keys = list(keys)
+        self.aggregates = {column: list(aggs) for column, aggs in aggregates.items()}
+
+    def __repr__(self) -> str:
+        return f"GroupBy(keys={self.keys}, aggregates={self.aggregates})"
+
+    def _components(self, column: str) -> list[str]:
+        needed = {part for agg in self.aggregates[column] for part in _COMPONENTS[agg]}
+        return [part for part in ("count", "sum", "min", "max") if part in needed]
+
+    def _key_series(self, df: pd.DataFrame) -> list[pd.Series] | None:
+        keys = []
+        for key in self.keys:
+            if key in DERIVED_KEYS:
+                if "tpep_pickup_datetime" not in df.columns:
+                    return None
+                keys.append(DERIVED_KEYS[key](df).rename(key))
+            elif key in df.columns:
+                keys.append(df[key])
+            else:
+                return None
+        return keys
+
+    def partial(self, df: pd.DataFrame) -> pd.DataFrame | None:
+        """
+        Wylicza mergowalny agregat częściowy chunku (wiersze z brakującym kluczem są pomijane).
+
+        Args:
+            df (pd.DataFrame): Fragment danych.
+
+        Returns:
+            pd.DataFrame | None: Agregat z kolumnami (kolumna, składnik) indeksowany kluczami
+            lub None, gdy brakuje wymaganych kolumn.
+        """
+        keys = self._key_series(df)
+        if keys is None or not all(column in df.columns for column in self.aggregates):
+            return None
+
+        metrics = df[list(self.aggregates)].astype("float64")
+        return metrics.groupby(keys, observed=True).agg(
+            {column: self._components(column) for column in self.aggregates}
+        )
+
+    def merge(self, partials: list[pd.DataFrame | None]) -> pd.DataFrame | None:
+        """
+        Łączy agregaty częściowe (np. z wielu chunków lub poddrzew redukcji).
+
+        Args:
+            partials (list[pd.DataFrame | None]): Wyniki partial lub merge.
+
+        Returns:
+            pd.DataFrame | None: Połączony agregat lub None, gdy żaden fragment nie miał
+            wymaganych kolumn.
+        """
+        partials = [p for p in partials if p is not None]
+        if not partials:
+            return None
+        if len(partials) == 1:
+            return partials[0]
+
+        combined = pd.concat(partials)
+        grouped = combined.groupby(level=list(range(combined.index.nlevels)), observed=True)
+        return grouped.agg({column: _MERGE[column[1]] for column in combined.columns})
+
+    def finalize(self, partial: pd.DataFrame | None) -> pd.DataFrame | None:
+        """
+        Wylicza żądane agregaty z (połączonego) agregatu częściowego.
+
+        Args:
+            partial (pd.DataFrame | None): Wynik partial lub merge.
+
+        Returns:
+            pd.DataFrame | None: Tabela z kolumnami (kolumna, agregat) posortowana po kluczach.
+        """
+        if partial is None:
+            return None
+
+        result = {}
+        for column, aggs in self.aggregates.items():
+            for agg in aggs:
+                if agg == "mean":
+                    count = partial[(column, "count")]
+                    result[(column, agg)] = partial[(column, "sum")] / count.where(count > 0)
+                else:
+                    result[(column, agg)] = partial[(column, agg)]
+        # Klucze kategoryczne są sortowane według kolejności kategorii, a nie wartości
+        keys = partial.index.to_frame(index=False).astype(object)
+        index = pd.MultiIndex.from_frame(keys) if len(self.keys) > 1 else pd.Index(keys.iloc[:, 0])
+        frame = pd.DataFrame({name: values.to_numpy() for name, values in result.items()}, index=index)
+        frame.columns = pd.MultiIndex.from_tuples(frame.columns)
+        return frame.sort_index()
+
+
+class TreeReducer:
+    """
+    Łączy strumień agregatów częściowych parami w drzewo (jak licznik binarny).
+
+    Agregat z k łączeń trafia na poziom k; dwa agregaty tego samego poziomu są łączone
+    w jeden poziom wyżej. W pamięci jest najwyżej log₂(n) + 1 agregatów, a łączone tabele
+    mają podobne rozmiary (zamiast wielokrotnego doklejania chunku do dużego wyniku).
+    """
+
+    def __init__(self, merge: Callable[[list], object]):
+        """
+        Args:
+            merge (Callable[[list], object]): Funkcja łącząca listę agregatów (np. GroupBy.merge).
+        """
+        self.merge = merge
+        self._stack = []
+
+    def __len__(self) -> int:
+        return len(self._stack)
+
+    def add(self, partial) -> None:
+        """
+        Dołącza kolejny agregat częściowy.
+
+        Args:
+            partial: Agregat częściowy (np. wynik GroupBy.partial).
+        """
+        level = 0
+        while self._stack and self._stack[-1][0] == level:
+            _, earlier = self._stack.pop()
+            partial = self.merge([earlier, partial])
+            level += 1
+        self._stack.append((level, partial))
+
+    def result(self):
+        """
+        Returns:
+            Połączony agregat wszystkich dołączonych fragmentów (None, gdy nic nie dołączono).
+        """
+        if not self._stack:
+            return None
+        return self.merge([partial for _, partial in self._stack])
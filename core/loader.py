@@ -1,36 +1,494 @@
+import glob
+import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from itertools import islice
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
 from decorators.timer import measure_time
 from decorators.counter import count_calls
 from core.logger import logger
+from core.schema import cast_arrow, arrow_types_mapper
+
+# Znacznik końca strumienia w kolejce prefetchera
+_END_OF_STREAM = object()
+
+# Rozmiar paczek odczytu, z których składane są chunki o zmiennym rozmiarze
+ADAPTIVE_READ_ROWS = 10_000
+
+# Domyślna liczba plików czytanych współbieżnie (prefetch_files)
+FILE_READERS = 2
+
+
+def resolve_parquet_files(path: str) -> list[str]:
+    """
+    Zamienia ścieżkę wejściową na listę plików Parquet.
+
+    Obsługiwane są: pojedynczy plik, katalog (przeszukiwany rekurencyjnie, więc także
+    zbiory partycjonowane w stylu Hive, np. `year=2024/month=01/`) oraz wzorzec glob.
+
+    Args:
+        path (str): Plik, katalog lub wzorzec glob (np. "data/raw/yellow_tripdata_2024-*.parquet").
+
+    Returns:
+        list[str]: Posortowana lista ścieżek do plików Parquet.
+    """
+    if os.path.isdir(path):
+        files = glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True)
+    elif any(ch in path for ch in "*?["):
+        files = glob.glob(path, recursive=True)
+    else:
+        return [path]
+    return sorted(files)
 
 
 @measure_time
 @count_calls
-def load_parquet_in_chunks(path: str, chunksize: int = 100_000, columns: list[str] | None = None):
+def load_parquet_in_chunks(
+    path: str,
+    chunksize: int | Callable[[], int] = 100_000,
+    columns: list[str] | None = None,
+    filters: pc.Expression | list | None = None,
+    low_memory: bool = False,
+    dtypes: dict[str, str] | None = None,
+    arrow: bool = False
+):
+    """
+    Generator wczytujący dane z pliku (lub wielu plików) Parquet w chunkach (strumieniowo).
+
+    Plik nie jest wczytywany w całości – kolejne paczki rekordów są dekodowane
+    przez `pyarrow.parquet.ParquetFile.iter_batches`, więc szczytowe zużycie
+    pamięci odpowiada mniej więcej jednemu chunkowi, niezależnie od rozmiaru pliku.
+
+    Jeśli podano `filters`, odczyt odbywa się przez `pyarrow.dataset` z predicate
+    pushdown: grupy wierszy wykluczone przez statystyki są pomijane, a odrzucone
+    rekordy nigdy nie trafiają do pandas.
+
+    Gdy `path` wskazuje katalog lub wzorzec glob, pliki są czytane kolejno
+    (chunki nie przekraczają granic plików). Błąd w jednym pliku jest logowany
+    i nie przerywa odczytu pozostałych.
+
+    Tryb `low_memory` mapuje plik w pamięci (mmap) zamiast kopiować go do buforów
+    odczytu, a konwersja Arrow → pandas odbywa się z opcjami `split_blocks`
+    i `self_destruct`: kolumny numeryczne bez braków stają się widokami na bufory
+    Arrow (bez kopii), a bufory Arrow są zwalniane w trakcie konwersji.
+
+    Jeśli podano `dtypes` (np. `core.schema.TAXI_DTYPES`), kolumny są rzutowane na
+    kompaktowe typy jeszcze po stronie Arrow, przed utworzeniem DataFrame.
+
+    `chunksize` może być funkcją zwracającą bieżącą liczbę wierszy (np.
+    `core.chunk_sizing.AdaptiveChunkSizer`) – wtedy rozmiar każdego kolejnego chunku
+    jest ustalany w chwili jego składania z mniejszych paczek odczytu.
+
+    Z `arrow=True` chunki są zwracane jako dane Arrow bez konwersji do pandas
+    (`pa.RecordBatch` lub – przy filtrze albo zmiennym rozmiarze chunku – `pa.Table`
+    złożona bez kopiowania z paczek odczytu), np. dla silnika `core.arrow_engine`.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+        chunksize (int | Callable[[], int]): Liczba wierszy na chunk (stała lub zmienna).
+        columns (list[str] | None): Lista kolumn do załadowania (opcjonalnie).
+        filters (pc.Expression | list | None): Wyrażenie filtrujące pyarrow
+            lub lista krotek w formacie DNF, np. [("tip_amount", ">=", 0)] (opcjonalnie).
+        low_memory (bool): Włącza odczyt przez mmap i konwersję bez zbędnych kopii.
+        dtypes (dict[str, str] | None): Schemat typów stosowany podczas odczytu (opcjonalnie).
+        arrow (bool): Czy zwracać paczki rekordów Arrow zamiast DataFrame.
+
+    Yields:
+        pd.DataFrame | pa.RecordBatch | pa.Table: Kolejny fragment danych.
     """
-    Generator wczytujący dane z pliku Parquet w chunkach przy użyciu pandas.
+    files = resolve_parquet_files(path)
+    if not files:
+        logger.warning(f"[Loader] Nie znaleziono plików Parquet: {path}")
+        return
+
+    chunk_no = 0
+    for file_path in files:
+        try:
+            for chunk in _iter_chunks(file_path, chunksize, columns, filters, low_memory, dtypes, arrow=arrow):
+                chunk_no += 1
+                logger.info(f"[Loader] Chunk {chunk_no} załadowany ({len(chunk)} wierszy)")
+                yield chunk
+        except Exception as e:
+            logger.error(f"[Loader] Błąd podczas wczytywania pliku {file_path}: {e}")
+
+
+def load_row_groups(
+    file_path: str,
+    row_groups: list[int],
+    chunksize: int | Callable[[], int] = 100_000,
+    columns: list[str] | None = None,
+    low_memory: bool = False,
+    dtypes: dict[str, str] | None = None,
+    filters: pc.Expression | list | None = None,
+    arrow: bool = False,
+    strict: bool = False
+):
+    """
+    Generator wczytujący w chunkach wyłącznie wskazane grupy wierszy jednego pliku Parquet.
+
+    Błąd odczytu jest logowany i kończy generator; z `strict=True` jest dodatkowo zgłaszany
+    dalej, aby niepełny fragment nie został potraktowany jak poprawnie przetworzony.
 
     Args:
-        path (str): Ścieżka do pliku Parquet.
-        chunksize (int): Liczba wierszy na chunk.
+        file_path (str): Ścieżka do pliku Parquet.
+        row_groups (list[int]): Numery grup wierszy do wczytania.
+        chunksize (int | Callable[[], int]): Liczba wierszy na chunk (stała lub zmienna).
         columns (list[str] | None): Lista kolumn do załadowania (opcjonalnie).
+        low_memory (bool): Włącza odczyt przez mmap i konwersję bez zbędnych kopii.
+        dtypes (dict[str, str] | None): Schemat typów stosowany podczas odczytu (opcjonalnie).
+        filters (pc.Expression | list | None): Filtr predicate pushdown (opcjonalnie).
+        arrow (bool): Czy zwracać paczki rekordów Arrow zamiast DataFrame.
+        strict (bool): Czy zgłaszać błędy odczytu zamiast kończyć generator.
 
     Yields:
-        pd.DataFrame: Kolejny fragment danych jako DataFrame.
+        pd.DataFrame | pa.RecordBatch | pa.Table: Kolejny fragment danych.
     """
     try:
-        df = pd.read_parquet(path, columns=columns, engine="pyarrow")
-        total_rows = len(df)
-        logger.info(f"[Loader] Wczytano {total_rows} wierszy z pliku: {path}")
+        yield from _iter_chunks(file_path, chunksize, columns, filters, low_memory, dtypes, row_groups, arrow)
+    except Exception as e:
+        logger.error(f"[Loader] Błąd podczas wczytywania grup wierszy {row_groups} z pliku {file_path}: {e}")
+        if strict:
+            raise
+
+
+def _iter_chunks(
+    file_path: str,
+    chunksize: int | Callable[[], int],
+    columns: list[str] | None,
+    filters: pc.Expression | list | None,
+    low_memory: bool,
+    dtypes: dict[str, str] | None,
+    row_groups: list[int] | None = None,
+    arrow: bool = False
+):
+    """
+    Wczytuje jeden plik Parquet jako strumień DataFrame'ów (wspólna logika loaderów).
+
+    Args:
+        file_path (str): Ścieżka do pliku Parquet.
+        chunksize (int | Callable[[], int]): Liczba wierszy na chunk (stała lub zmienna).
+        columns (list[str] | None): Lista kolumn do załadowania.
+        filters (pc.Expression | list | None): Filtr predicate pushdown.
+        low_memory (bool): Odczyt przez mmap i konwersja bez zbędnych kopii.
+        dtypes (dict[str, str] | None): Schemat typów stosowany podczas odczytu.
+        row_groups (list[int] | None): Numery grup wierszy do odczytu (domyślnie wszystkie).
+        arrow (bool): Czy zwracać paczki rekordów Arrow zamiast DataFrame.
+
+    Yields:
+        pd.DataFrame | pa.RecordBatch | pa.Table: Kolejny chunk danych.
+    """
+    adaptive = callable(chunksize)
+    read_size = ADAPTIVE_READ_ROWS if adaptive else chunksize
+
+    if filters is not None:
+        batches = _iter_filtered_batches(file_path, read_size, columns, filters, low_memory, row_groups)
+    else:
+        batches = _iter_file_batches(file_path, read_size, columns, low_memory, row_groups)
+    if filters is not None or adaptive:
+        batches = _rebatch(batches, chunksize)
+
+    for batch in batches:
+        if arrow:
+            yield cast_arrow(batch, dtypes) if dtypes else batch
+        else:
+            yield _to_pandas(batch, low_memory, dtypes)
+
+
+class _Prefetcher:
+    """
+    Wątek czytający, który od utworzenia wypełnia ograniczoną kolejkę chunkami ze źródła.
+    """
+
+    def __init__(self, chunks, depth: int):
+        """
+        Args:
+            chunks (Iterable): Źródło chunków.
+            depth (int): Pojemność kolejki (liczba chunków wczytywanych z wyprzedzeniem).
+        """
+        self._chunks = chunks
+        self._buffer = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._reader = threading.Thread(target=self._read, name="parquet-prefetch", daemon=True)
+        self._reader.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self) -> None:
+        try:
+            for chunk in self._chunks:
+                if not self._put((chunk, None)):
+                    return
+            self._put((_END_OF_STREAM, None))
+        except Exception as e:
+            self._put((_END_OF_STREAM, e))
+        finally:
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+
+    def __iter__(self):
+        while True:
+            chunk, error = self._buffer.get()
+            if chunk is _END_OF_STREAM:
+                if error is not None:
+                    raise error
+                return
+            yield chunk
+
+    def close(self) -> None:
+        """
+        Zatrzymuje wątek czytający (zamyka też źródło chunków).
+        """
+        self._stop.set()
+        self._reader.join()
+
+
+def prefetch_chunks(chunks, depth: int = 2):
+    """
+    Opakowuje iterator chunków tak, aby kolejne chunki były dekodowane w tle.
+
+    Wątek czytający wypełnia ograniczoną kolejkę (maks. `depth` chunków), a konsument
+    w tym czasie przetwarza bieżący chunk. pyarrow zwalnia GIL podczas dekodowania,
+    więc odczyt i obliczenia nakładają się – czas pętli zbliża się do max(I/O, obliczenia)
+    zamiast ich sumy. W pamięci jest naraz co najwyżej `depth + 1` chunków.
+
+    Wyjątek zgłoszony przez źródło jest przekazywany do konsumenta. Przerwanie iteracji
+    (np. `break`) zatrzymuje wątek czytający.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Źródło chunków, np. `load_parquet_in_chunks(...)`.
+        depth (int): Liczba chunków wczytywanych z wyprzedzeniem (0 wyłącza prefetching).
+
+    Yields:
+        pd.DataFrame: Kolejne chunki w oryginalnej kolejności.
+    """
+    if depth <= 0:
+        yield from chunks
+        return
+
+    prefetcher = _Prefetcher(chunks, depth)
+    try:
+        yield from prefetcher
+    finally:
+        prefetcher.close()
+
+
+def prefetch_files(
+    files: list[str],
+    open_file: Callable[[str], Iterable],
+    readers: int = FILE_READERS,
+    depth: int = 2
+):
+    """
+    Czyta chunki kilku plików współbieżnie, zwracając je w kolejności plików.
+
+    Każdy z (najwyżej) `readers` otwartych plików ma własny wątek czytający (jak w
+    prefetch_chunks), więc następne pliki są dekodowane, gdy konsument przetwarza bieżący.
+    Po wyczerpaniu pliku otwierany jest kolejny. Kolejność wyniku nie zależy od liczby
+    wątków, a w pamięci jest naraz co najwyżej `readers * (depth + 1)` chunków.
+
+    Args:
+        files (list[str]): Pliki w kolejności zbioru danych.
+        open_file (Callable[[str], Iterable]): Zwraca źródło chunków pliku
+            (np. `partial(load_parquet_in_chunks, chunksize=...)`).
+        readers (int): Liczba plików czytanych jednocześnie.
+        depth (int): Liczba chunków wczytywanych z wyprzedzeniem dla każdego pliku.
+
+    Yields:
+        tuple[str, pd.DataFrame]: Ścieżka pliku i kolejny chunk.
+    """
+    pending = iter(files)
+    active = deque(
+        (file_path, _Prefetcher(open_file(file_path), max(depth, 1)))
+        for file_path in islice(pending, max(readers, 1))
+    )
+    try:
+        while active:
+            file_path, prefetcher = active[0]
+            for chunk in prefetcher:
+                yield file_path, chunk
+            active.popleft()
+            prefetcher.close()
+            next_file = next(pending, None)
+            if next_file is not None:
+                active.append((next_file, _Prefetcher(open_file(next_file), max(depth, 1))))
+    finally:
+        for _, prefetcher in active:
+            prefetcher.close()
+
+
+def load_parquet(
+    path: str,
+    columns: list[str] | None = None,
+    low_memory: bool = False,
+    dtypes: dict[str, str] | None = None
+) -> pd.DataFrame:
+    """
+    Wczytuje w całości plik, katalog lub wzorzec glob plików Parquet do jednego DataFrame.
+
+    Przeznaczone wyłącznie do raportów, które wymagają pełnych danych w pamięci.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+        columns (list[str] | None): Lista kolumn do załadowania (opcjonalnie).
+        low_memory (bool): Włącza odczyt przez mmap i konwersję bez zbędnych kopii.
+        dtypes (dict[str, str] | None): Schemat typów stosowany podczas odczytu (opcjonalnie).
+
+    Returns:
+        pd.DataFrame: Połączone dane ze wszystkich plików.
+    """
+    filesystem = pafs.LocalFileSystem(use_mmap=low_memory)
+    dataset = ds.dataset(resolve_parquet_files(path), format="parquet", filesystem=filesystem)
+    return _to_pandas(dataset.to_table(columns=columns), low_memory, dtypes)
+
+
+def _to_pandas(
+    batch: pa.RecordBatch | pa.Table,
+    low_memory: bool,
+    dtypes: dict[str, str] | None = None
+) -> pd.DataFrame:
+    """
+    Konwertuje paczkę rekordów Arrow do DataFrame.
+
+    Args:
+        batch (pa.RecordBatch | pa.Table): Dane do konwersji (w trybie `low_memory`
+            nie mogą być używane po konwersji).
+        low_memory (bool): Czy użyć konwersji bez konsolidacji bloków i z niszczeniem źródła.
+        dtypes (dict[str, str] | None): Schemat typów do zastosowania przed konwersją.
+
+    Returns:
+        pd.DataFrame: Dane jako DataFrame.
+    """
+    options = {}
+    if dtypes:
+        batch = cast_arrow(batch, dtypes)
+        options["types_mapper"] = arrow_types_mapper
+    if low_memory:
+        options.update(split_blocks=True, self_destruct=True)
+    return batch.to_pandas(**options)
+
+
+def _iter_file_batches(
+    path: str,
+    chunksize: int,
+    columns: list[str] | None,
+    memory_map: bool = False,
+    row_groups: list[int] | None = None
+):
+    """
+    Odczytuje plik Parquet paczkami po `chunksize` wierszy bez filtrowania.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet.
+        chunksize (int): Liczba wierszy na paczkę.
+        columns (list[str] | None): Lista kolumn do załadowania.
+        memory_map (bool): Czy mapować plik w pamięci zamiast czytać go do buforów.
+        row_groups (list[int] | None): Numery grup wierszy do odczytu (domyślnie wszystkie).
+
+    Yields:
+        pa.RecordBatch: Kolejna paczka rekordów.
+    """
+    with pq.ParquetFile(path, memory_map=memory_map) as parquet_file:
+        metadata = parquet_file.metadata
+        total_rows = metadata.num_rows
+        logger.info(
+            f"[Loader] Otwarto plik: {path} ({total_rows} wierszy, "
+            f"{metadata.num_row_groups} grup wierszy)"
+        )
 
         if total_rows == 0:
             logger.warning(f"[Loader] Brak danych do przetworzenia w pliku {path}")
             return
 
-        for i in range(0, total_rows, chunksize):
-            chunk = df.iloc[i:i + chunksize]
-            logger.info(f"[Loader] Chunk {i // chunksize + 1} załadowany ({len(chunk)} wierszy)")
-            yield chunk
-    except Exception as e:
-        logger.error(f"[Loader] Błąd podczas wczytywania pliku {path}: {e}")
+        yield from parquet_file.iter_batches(batch_size=chunksize, row_groups=row_groups, columns=columns)
+
+
+def _iter_filtered_batches(
+    path: str,
+    chunksize: int,
+    columns: list[str] | None,
+    filters: pc.Expression | list,
+    memory_map: bool = False,
+    row_groups: list[int] | None = None
+):
+    """
+    Odczytuje plik Parquet przez `pyarrow.dataset` z predicate pushdown.
+
+    Skaner zwraca paczki nie większe niż grupa wierszy, dlatego należy je
+    skleić w chunki docelowego rozmiaru funkcją `_rebatch`.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet.
+        chunksize (int): Maksymalna liczba wierszy w paczce.
+        columns (list[str] | None): Lista kolumn do załadowania.
+        filters (pc.Expression | list): Wyrażenie lub filtry w formacie DNF.
+        memory_map (bool): Czy mapować plik w pamięci zamiast czytać go do buforów.
+        row_groups (list[int] | None): Numery grup wierszy do odczytu (domyślnie wszystkie).
+
+    Yields:
+        pa.RecordBatch: Kolejna paczka przefiltrowanych rekordów.
+    """
+    if not isinstance(filters, pc.Expression):
+        filters = pq.filters_to_expression(filters)
+
+    filesystem = pafs.LocalFileSystem(use_mmap=memory_map)
+    logger.info(f"[Loader] Otwarto plik: {path} z filtrem: {filters}")
+
+    if row_groups is not None:
+        fragment = ds.ParquetFileFormat().make_fragment(path, filesystem=filesystem, row_groups=row_groups)
+        yield from fragment.to_batches(columns=columns, filter=filters, batch_size=chunksize)
         return
+
+    dataset = ds.dataset(path, format="parquet", filesystem=filesystem)
+    yield from dataset.to_batches(columns=columns, filter=filters, batch_size=chunksize)
+
+
+def _rebatch(batches, chunksize: int | Callable[[], int]):
+    """
+    Skleja strumień paczek rekordów (bez kopiowania) w tabele po `chunksize` wierszy.
+
+    Args:
+        batches (Iterable[pa.RecordBatch]): Paczki o dowolnych rozmiarach.
+        chunksize (int | Callable[[], int]): Docelowa liczba wierszy na tabelę
+            (funkcja jest odpytywana przed składaniem każdej kolejnej tabeli).
+
+    Yields:
+        pa.Table: Tabela o `chunksize` wierszach (ostatnia może być mniejsza).
+    """
+    def target() -> int:
+        return chunksize() if callable(chunksize) else chunksize
+
+    pending = []
+    pending_rows = 0
+    rows = target()
+
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        pending.append(batch)
+        pending_rows += batch.num_rows
+
+        while pending_rows >= rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, rows)
+            rest = table.slice(rows)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+            rows = target()
+
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
@@ -0,0 +1,173 @@
+"""
+metadata.py
+
+Moduł odpowiadający na pytania o dane wyłącznie na podstawie metadanych plików Parquet
+(stopki pliku i statystyk grup wierszy) – bez dekodowania danych.
+
+Zawiera funkcje:
+- get_row_count: liczba wierszy we wszystkich plikach,
+- get_schema: schemat kolumn (Arrow),
+- get_column_stats: min/max oraz liczba braków dla każdej kolumny,
+- describe_parquet: zestawienie typów i statystyk jako DataFrame,
+- read_head: pierwsze wiersze danych (czyta tylko początkowe grupy wierszy).
+
+Obsługuje pojedynczy plik, katalog (także partycjonowany w stylu Hive) i wzorzec glob.
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from decorators.timer import measure_time
+from decorators.counter import count_calls
+from core.loader import resolve_parquet_files
+
+
+def get_row_count(path: str) -> int:
+    """
+    Zwraca łączną liczbę wierszy odczytaną ze stopek plików Parquet.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+
+    Returns:
+        int: Liczba wierszy.
+    """
+    total = 0
+    for file_path in resolve_parquet_files(path):
+        with pq.ParquetFile(file_path) as parquet_file:
+            total += parquet_file.metadata.num_rows
+    return total
+
+
+def get_schema(path: str) -> pa.Schema:
+    """
+    Zwraca schemat Arrow pierwszego pliku zbioru danych.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+
+    Returns:
+        pa.Schema: Schemat kolumn.
+
+    Raises:
+        FileNotFoundError: Gdy nie znaleziono żadnego pliku Parquet.
+    """
+    files = resolve_parquet_files(path)
+    if not files:
+        raise FileNotFoundError(f"Nie znaleziono plików Parquet: {path}")
+    return pq.read_schema(files[0])
+
+
+def get_column_stats(path: str, columns: list[str] | None = None) -> dict[str, dict]:
+    """
+    Zbiera min/max i liczbę braków dla kolumn ze statystyk grup wierszy.
+
+    Jeśli którakolwiek grupa wierszy nie ma statystyki danej wartości,
+    wynik dla tej wartości wynosi None (nieznany), zamiast być zaniżonym.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+        columns (list[str] | None): Kolumny do opisania (domyślnie wszystkie).
+
+    Returns:
+        dict[str, dict]: {kolumna: {"min": ..., "max": ..., "null_count": ...}}.
+    """
+    stats: dict[str, dict] = {}
+    for file_path in resolve_parquet_files(path):
+        with pq.ParquetFile(file_path) as parquet_file:
+            metadata = parquet_file.metadata
+        for rg in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg)
+            for ci in range(row_group.num_columns):
+                column = row_group.column(ci)
+                name = column.path_in_schema
+                if columns is not None and name not in columns:
+                    continue
+                if row_group.num_rows == 0:
+                    continue
+                entry = stats.setdefault(name, {"min": None, "max": None, "null_count": 0, "_known": True})
+                _merge_statistics(entry, column.statistics)
+
+    for entry in stats.values():
+        entry.pop("_known")
+    return stats
+
+
+def _merge_statistics(entry: dict, statistics) -> None:
+    """
+    Dołącza statystyki jednej kolumny z jednej grupy wierszy do zbiorczego wpisu.
+
+    Args:
+        entry (dict): Zbiorczy wpis kolumny (modyfikowany w miejscu).
+        statistics (pq.Statistics | None): Statystyki kolumny w grupie wierszy.
+    """
+    if statistics is None or not statistics.has_min_max:
+        entry["_known"] = False
+        entry["min"] = entry["max"] = None
+    elif entry["_known"]:
+        entry["min"] = statistics.min if entry["min"] is None else min(entry["min"], statistics.min)
+        entry["max"] = statistics.max if entry["max"] is None else max(entry["max"], statistics.max)
+
+    if statistics is None or not statistics.has_null_count or entry["null_count"] is None:
+        entry["null_count"] = None
+    else:
+        entry["null_count"] += statistics.null_count
+
+
+@measure_time
+@count_calls
+def describe_parquet(path: str) -> pd.DataFrame:
+    """
+    Zestawia typy kolumn oraz min/max i liczbę braków wyłącznie z metadanych.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+
+    Returns:
+        pd.DataFrame: Wiersz na kolumnę z polami: typ, min, max, braki.
+    """
+    schema = get_schema(path)
+    stats = get_column_stats(path)
+    rows = []
+    for field in schema:
+        column_stats = stats.get(field.name, {})
+        rows.append({
+            "kolumna": field.name,
+            "typ": str(field.type),
+            "min": column_stats.get("min"),
+            "max": column_stats.get("max"),
+            "braki": column_stats.get("null_count"),
+        })
+    return pd.DataFrame(rows).set_index("kolumna")
+
+
+@measure_time
+@count_calls
+def read_head(path: str, n: int = 5, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Zwraca pierwsze `n` wierszy, dekodując tylko początkowe paczki rekordów (najwyżej `n` wierszy),
+    a nie całe grupy wierszy.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+        n (int): Liczba wierszy do zwrócenia.
+        columns (list[str] | None): Kolumny do wczytania (domyślnie wszystkie).
+
+    Returns:
+        pd.DataFrame: Pierwsze wiersze danych (pusty DataFrame, gdy brak danych).
+    """
+    tables = []
+    remaining = n
+    for file_path in resolve_parquet_files(path):
+        with pq.ParquetFile(file_path) as parquet_file:
+            for batch in parquet_file.iter_batches(batch_size=remaining, columns=columns):
+                tables.append(pa.Table.from_batches([batch.slice(0, remaining)]))
+                remaining -= min(batch.num_rows, remaining)
+                if remaining <= 0:
+                    break
+        if remaining <= 0:
+            break
+
+    if not tables:
+        return pd.DataFrame()
+    return pa.concat_tables(tables).to_pandas()
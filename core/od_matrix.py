@@ -0,0 +1,202 @@
+"""
+od_matrix.py
+
+Gęsta macierz źródło–cel (origin–destination) przejazdów między strefami taxi.
+
+Identyfikatory stref to małe liczby całkowite (1–265), więc macierz liczby kursów oraz
+sum opłat i dystansów mieści się w kilku tablicach numpy N × N. Dla chunku macierz
+powstaje jednym wywołaniem `np.bincount` na indeksach `PU · N + DO` na każdą tablicę –
+bez pivotowania i grupowania pandas. Macierze z chunków i procesów roboczych łączy
+się dodawaniem; średnie powstają dopiero z połączonych sum.
+
+Macierze chunków są zwykle rzadkie (chunk trafia tylko w część par stref), więc przy
+serializacji (wysyłce wyników z procesów roboczych) zapisywane są wtedy tylko niezerowe komórki.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Liczba stref (identyfikatory 0–265; 264 i 265 to strefy nieznane)
+ZONE_COUNT = 266
+
+# Metryki sumowane w komórkach macierzy
+OD_METRICS = ["fare_amount", "trip_distance"]
+
+
+class ODMatrix:
+    """
+    Mergowalna macierz źródło–cel: liczba kursów oraz sumy metryk dla każdej pary stref.
+
+    Kursy ze strefą spoza zakresu 0..zones-1 lub bez strefy są pomijane (liczone w `skipped`).
+    """
+
+    def __init__(self, zones: int = ZONE_COUNT, metrics: list[str] | None = None):
+        """
+        Args:
+            zones (int): Liczba stref N (rozmiar macierzy N × N).
+            metrics (list[str] | None): Sumowane metryki (domyślnie OD_METRICS).
+        """
+        self.zones = zones
+        self.metrics = list(OD_METRICS if metrics is None else metrics)
+        self.trips = np.zeros((zones, zones), dtype=np.int64)
+        self.sums = {metric: np.zeros((zones, zones)) for metric in self.metrics}
+        # Liczby niepustych wartości metryki; None oznacza "równe liczbie kursów" (brak braków)
+        self.counts = {metric: None for metric in self.metrics}
+        self.skipped = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        nonzero = np.flatnonzero(self.trips)
+        # Zapis rzadki: indeks int32 i wartości każdej tablicy – opłaca się poniżej 1/3 komórek
+        if 3 * len(nonzero) < self.trips.size:
+            state["trips"] = (nonzero.astype(np.int32), self.trips.ravel()[nonzero])
+            state["sums"] = {metric: array.ravel()[nonzero] for metric, array in self.sums.items()}
+            state["counts"] = {
+                metric: None if array is None else array.ravel()[nonzero]
+                for metric, array in self.counts.items()
+            }
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if not isinstance(self.trips, tuple):
+            return
+        cells, trips = self.trips
+        shape = (self.zones, self.zones)
+
+        def dense(values: np.ndarray, dtype) -> np.ndarray:
+            array = np.zeros(shape, dtype=dtype)
+            array.ravel()[cells] = values
+            return array
+
+        self.trips = dense(trips, np.int64)
+        self.sums = {metric: dense(values, np.float64) for metric, values in self.sums.items()}
+        self.counts = {
+            metric: None if values is None else dense(values, np.int64)
+            for metric, values in self.counts.items()
+        }
+
+    @property
+    def total_trips(self) -> int:
+        """
+        Returns:
+            int: Liczba kursów ujętych w macierzy.
+        """
+        return int(self.trips.sum())
+
+    def add(self, df: pd.DataFrame) -> "ODMatrix":
+        """
+        Dodaje kursy z chunku (wymaga kolumn PULocationID i DOLocationID).
+
+        Args:
+            df (pd.DataFrame): Fragment danych.
+
+        Returns:
+            ODMatrix: Ten obiekt.
+        """
+        if not all(col in df.columns for col in ["PULocationID", "DOLocationID"]) or len(df) == 0:
+            return self
+
+        pickup = df["PULocationID"].to_numpy(dtype=np.float64, na_value=np.nan)
+        dropoff = df["DOLocationID"].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = (pickup >= 0) & (pickup < self.zones) & (dropoff >= 0) & (dropoff < self.zones)
+        self.skipped += int(len(df) - valid.sum())
+        cells = pickup[valid].astype(np.int64) * self.zones + dropoff[valid].astype(np.int64)
+        size = self.zones * self.zones
+
+        shape = self.trips.shape
+        for metric in self.metrics:
+            values = df[metric].to_numpy(dtype=np.float64, na_value=np.nan)[valid] \
+                if metric in df.columns else np.full(len(cells), np.nan)
+            notna = ~np.isnan(values)
+            self.sums[metric] += np.bincount(
+                cells, weights=np.where(notna, values, 0.0), minlength=size
+            ).reshape(shape)
+            if self.counts[metric] is None and not notna.all():
+                # Dotąd liczności były równe liczbie kursów (self.trips przed dodaniem chunku)
+                self.counts[metric] = self.trips.copy()
+            if self.counts[metric] is not None:
+                self.counts[metric] += np.bincount(cells[notna], minlength=size).reshape(shape)
+        self.trips += np.bincount(cells, minlength=size).reshape(shape)
+        return self
+
+    def merge(self, other: "ODMatrix") -> "ODMatrix":
+        """
+        Dołącza macierz innego fragmentu danych.
+
+        Args:
+            other (ODMatrix): Macierz o tej samej liczbie stref i metrykach.
+
+        Returns:
+            ODMatrix: Ten obiekt (po scaleniu).
+        """
+        if other.zones != self.zones or other.metrics != self.metrics:
+            raise ValueError("Nie można łączyć macierzy OD o różnych strefach lub metrykach")
+        for metric in self.metrics:
+            if self.counts[metric] is not None or other.counts[metric] is not None:
+                own = self.trips if self.counts[metric] is None else self.counts[metric]
+                theirs = other.trips if other.counts[metric] is None else other.counts[metric]
+                self.counts[metric] = own + theirs
+            self.sums[metric] += other.sums[metric]
+        self.trips += other.trips
+        self.skipped += other.skipped
+        return self
+
+    def means(self, metric: str) -> np.ndarray:
+        """
+        Args:
+            metric (str): Nazwa metryki.
+
+        Returns:
+            np.ndarray: Macierz średnich N × N (NaN dla par bez kursów).
+        """
+        counts = self.trips if self.counts[metric] is None else self.counts[metric]
+        return np.divide(
+            self.sums[metric], counts, out=np.full(self.trips.shape, np.nan), where=counts > 0
+        )
+
+    def top_pairs(self, n: int = 20) -> pd.DataFrame:
+        """
+        Zwraca `n` par stref z największą liczbą kursów.
+
+        Args:
+            n (int): Liczba par.
+
+        Returns:
+            pd.DataFrame: Kolumny PULocationID, DOLocationID, trips i średnie metryk.
+        """
+        flat = self.trips.ravel()
+        n = min(n, int(np.count_nonzero(flat)))
+        top = np.argpartition(flat, -n)[-n:] if n else np.empty(0, dtype=np.int64)
+        top = top[np.argsort(-flat[top], kind="stable")]
+        pickup, dropoff = np.divmod(top, self.zones)
+        frame = pd.DataFrame({"PULocationID": pickup, "DOLocationID": dropoff, "trips": flat[top]})
+        for metric in self.metrics:
+            frame[f"{metric}_mean"] = self.means(metric).ravel()[top]
+        return frame
+
+    def save(self, path: str) -> None:
+        """
+        Zapisuje macierze (liczby kursów i średnie metryk) do pliku .npz.
+
+        Args:
+            path (str): Ścieżka pliku (np. "data/output/od_matrix.npz").
+        """
+        np.savez_compressed(
+            path, trips=self.trips, **{f"{metric}_mean": self.means(metric) for metric in self.metrics}
+        )
+
+
+def load_od_matrix(path: str = "data/output/od_matrix.npz") -> dict[str, np.ndarray]:
+    """
+    Wczytuje macierze zapisane przez ODMatrix.save.
+
+    Args:
+        path (str): Ścieżka pliku .npz.
+
+    Returns:
+        dict[str, np.ndarray]: "trips" oraz "<metryka>_mean" (wiersz = strefa odbioru,
+        kolumna = strefa docelowa).
+    """
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
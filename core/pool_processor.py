@@ -5,36 +5,122 @@ Moduł wykonujący równoległą analizę danych z pliku .parquet z wykorzystani
 
 Zawiera funkcje:
 - analyze_chunk: analizuje pojedynczy fragment danych (sumy, długie trasy itp.)
-- aggregate_results: sumuje wyniki z chunków
-- save_summary_by_vendor: tworzy raport per VendorID
-- save_anomalies_report: wykrywa podejrzane rekordy (tip > total)
+- process_chunk: zadanie procesu roboczego (walidacja, analiza, agregaty częściowe raportów)
+- merge_totals / summarize_totals / aggregate_results: sumują wyniki z chunków
+- aggregate_column_stats / write_column_stats: statystyki opisowe kolumn numerycznych
+- write_distinct_counts: przybliżone liczby unikalnych stref (HyperLogLog)
+- vendor_partial / merge_vendor_partials / write_summary_by_vendor: raport per VendorID
+- save_summary_by_vendor: raport per VendorID dla całego DataFrame
+- group_partials / write_grouped_reports: raporty grupowane (GROUP_REPORTS)
+- time_rollup_partial: agregaty czasowe (per godzina, dzień tygodnia i dzień)
+- od_partial / write_od_matrix: macierz źródło–cel (liczba kursów, średnia opłata i dystans)
+- anomalies_partial / merge_anomalies_partials / write_anomalies_report: raport podejrzanych rekordów
+- save_anomalies_report: raport podejrzanych rekordów (tip > total) dla całego DataFrame
+- save_per_file_summary: zapisuje częściowe podsumowania dla każdego pliku wejściowego
 - parallel_analysis: główna funkcja analizy równoległej
 
 Zapisuje wszystkie raporty do katalogu 'data/output'.
 """
 
 import os
+from collections.abc import Callable
+from functools import partial
+from itertools import tee
+import numpy as np
 import pandas as pd
-from multiprocessing import Pool, cpu_count
+import pyarrow.compute as pc
+from multiprocessing import Pool
 from decorators.timer import measure_time
 from decorators.counter import count_calls
-from core.loader import load_parquet_in_chunks
+from core.loader import load_parquet_in_chunks, prefetch_files
 from core.logger import logger
+from core.schema import TAXI_DTYPES, column_sum
+from core.accumulators import MetricStats, column_stats_frame, describe_chunk, merge_column_stats
+from core.quantiles import DEFAULT_K, merge_sketches, sketch_columns
+from core.cardinality import DEFAULT_PRECISION, distinct_frame, distinct_partial, merge_distinct_partials
+from core.groupby import GroupBy, TreeReducer
+from core.rollups import TimeRollup, write_time_rollups
+from core.od_matrix import ODMatrix
+from core.checkpoint import CheckpointStore, run_fingerprint
+from core.dedup import HashIndex
+from core.dispatch import bounded_imap_unordered
+from core.run_options import AnalysisOptions, PoolRun, prepare_run
+from core.transport import SharedFrame, share_chunks, unwrap
+from core.work_units import WorkUnit, load_work_unit, plan_work_units, unit_fingerprints
+from validation.stats import ValidationStats
+from validation.validation_runner import build_pushdown_filter, validate_chunk
 
 REQUIRED_COLUMNS = [
     "passenger_count", "trip_distance", "tip_amount", "total_amount", "VendorID"
 ]
 
+# Metryki raportu per VendorID (średnia i maksimum)
+VENDOR_METRICS = ["fare_amount", "tip_amount", "trip_distance"]
 
-def analyze_chunk(df: pd.DataFrame) -> dict:
+# Grupowanie raportu per VendorID (silnik group-by)
+VENDOR_GROUPING = GroupBy(["VendorID"], {metric: ["mean", "max"] for metric in VENDOR_METRICS})
+
+# Raporty grupowane liczone dla całego zbioru: nazwa → grupowanie
+GROUP_REPORTS = {
+    "payment_type": GroupBy(["payment_type"], {
+        "fare_amount": ["count", "mean", "sum"],
+        "tip_amount": ["mean", "sum", "max"],
+    }),
+    "pickup_hour": GroupBy(["pickup_hour"], {
+        "fare_amount": ["count", "mean"],
+        "tip_amount": ["mean"],
+        "trip_distance": ["mean", "max"],
+    }),
+    "PULocationID": GroupBy(["PULocationID"], {
+        "fare_amount": ["count", "mean", "sum"],
+        "trip_distance": ["mean"],
+    }),
+}
+
+# Liczba najczęstszych par stref w raporcie macierzy OD
+OD_TOP_PAIRS = 25
+
+# Kolumny i liczba rekordów w podglądzie raportu anomalii
+ANOMALY_COLUMNS = ["VendorID", "fare_amount", "tip_amount", "total_amount"]
+ANOMALY_PREVIEW_ROWS = 10
+
+# Kolumny i rzędy kwantyli raportowanych w podsumowaniu (szkice KLL)
+QUANTILE_COLUMNS = ["fare_amount", "tip_amount", "trip_distance"]
+QUANTILES = {"mediana": 0.5, "p95": 0.95, "p99": 0.99}
+
+# Etykiety liczności unikalnych wartości (szkice HyperLogLog) w podsumowaniu
+DISTINCT_LABELS = {
+    "PULocationID": "Liczba unikalnych stref odbioru",
+    "DOLocationID": "Liczba unikalnych stref docelowych",
+    "OD": "Liczba unikalnych par odbiór→cel",
+}
+
+# Metryki sumowane między chunkami (wynik analyze_chunk)
+TOTAL_KEYS = ["rows", "distance", "tip", "amount", "passengers", "long_trips"]
+
+# Sposoby podziału pracy między procesy robocze
+DISPATCH_MODES = ("chunks", "row_groups")
+
+
+def analyze_chunk(
+    df: pd.DataFrame,
+    sketch_k: int = DEFAULT_K,
+    hll_precision: int = DEFAULT_PRECISION
+) -> dict:
     """
     Analizuje chunk danych, obliczając sumaryczne metryki.
 
     Args:
         df (pd.DataFrame): Fragment danych.
+        sketch_k (int): Parametr dokładności szkiców kwantyli.
+        hll_precision (int): Precyzja szkiców HyperLogLog.
 
     Returns:
-        dict: Wyniki analizy (lub zera w razie błędu).
+        dict: Wyniki analizy (w razie błędu – zera i klucz "error" z opisem błędu; taki
+        wynik nie jest wliczany do podsumowań); klucz "columns" zawiera
+        akumulatory statystyk kolumn numerycznych (describe_chunk), "quantiles"
+        – szkice kwantyli kolumn QUANTILE_COLUMNS, a "distinct" – szkice liczności
+        (distinct_partial).
     """
     try:
         if not all(col in df.columns for col in REQUIRED_COLUMNS):
@@ -44,41 +130,114 @@ def analyze_chunk(df: pd.DataFrame) -> dict:
         return {
             "rows": len(df),
             "distance": df["trip_distance"].sum(),
-            "tip": df["tip_amount"].sum(),
-            "amount": df["total_amount"].sum(),
+            "tip": column_sum(df["tip_amount"]),
+            "amount": column_sum(df["total_amount"]),
             "passengers": df["passenger_count"].sum(),
-            "long_trips": (df["trip_distance"] > 10).sum()
+            "long_trips": (df["trip_distance"] > 10).sum(),
+            "columns": describe_chunk(df),
+            "quantiles": sketch_columns(df, QUANTILE_COLUMNS, sketch_k),
+            "distinct": distinct_partial(df, hll_precision)
         }
 
     except Exception as e:
         logger.warning(f"Błąd w analyze_chunk: {e}")
         return {
             "rows": 0, "distance": 0.0, "tip": 0.0,
-            "amount": 0.0, "passengers": 0, "long_trips": 0
+            "amount": 0.0, "passengers": 0, "long_trips": 0, "columns": {}, "quantiles": {},
+            "distinct": None, "error": str(e)
         }
 
 
-def aggregate_results(results: list[dict]) -> dict:
+def process_chunk(
+    df: pd.DataFrame,
+    validate: bool = False,
+    sketch_k: int = DEFAULT_K,
+    hll_precision: int = DEFAULT_PRECISION,
+    groupings: dict[str, GroupBy] | None = None
+) -> dict:
     """
-    Sumuje dane ze wszystkich chunków.
+    Zadanie procesu roboczego: opcjonalnie waliduje chunk, analizuje go i wylicza
+    mergowalne częściowe agregaty raportów (per VendorID, grupowane, czasowe, macierz OD
+    i anomalie).
+
+    Dzięki agregatom częściowym proces główny nie musi łączyć wszystkich chunków w jeden DataFrame.
 
     Args:
-        results (list[dict]): Lista wyników z analyze_chunk.
+        df (pd.DataFrame): Fragment danych.
+        validate (bool): Czy przed analizą walidować chunk (validate_chunk).
+        sketch_k (int): Parametr dokładności szkiców kwantyli.
+        hll_precision (int): Precyzja szkiców HyperLogLog.
+        groupings (dict[str, GroupBy] | None): Raporty grupowane (domyślnie GROUP_REPORTS).
 
     Returns:
-        dict: Podsumowanie statystyk globalnych.
+        dict: Wyniki analyze_chunk oraz klucze "vendor" (vendor_partial), "groups"
+        (group_partials), "rollup" (time_rollup_partial), "od" (od_partial), "anomalies"
+        (anomalies_partial) i – w trybie walidacji – "validation" (ValidationStats).
+        Po błędzie walidacji lub analizy (klucz "error") agregaty raportów nie są liczone.
     """
-    total = {
-        "rows": 0, "distance": 0.0, "tip": 0.0,
-        "amount": 0.0, "passengers": 0, "long_trips": 0
-    }
+    result = {}
+    if validate:
+        stats = ValidationStats()
+        try:
+            df = validate_chunk(df, stats=stats)
+        except Exception as e:
+            logger.error(f"Błąd walidacji w process_chunk: {e}")
+            return {"error": f"Błąd walidacji: {e}"}
+        result["validation"] = stats
 
-    for result in results:
-        for key in total:
-            total[key] += result[key]
+    result.update(analyze_chunk(df, sketch_k, hll_precision))
+    if "error" in result:
+        return result
+    result["vendor"] = vendor_partial(df)
+    result["groups"] = group_partials(df, groupings)
+    result["rollup"] = time_rollup_partial(df)
+    result["od"] = od_partial(df)
+    result["anomalies"] = anomalies_partial(df)
+    return result
+
+
+def merge_totals(total: dict | None, result: dict) -> dict:
+    """
+    Dodaje metryki jednego chunku do sum częściowych (kolejność chunków nie ma znaczenia).
+
+    Args:
+        total (dict | None): Dotychczasowe sumy (None – brak przetworzonych chunków).
+        result (dict): Wynik analyze_chunk lub process_chunk (wyniki z kluczem "error"
+            są pomijane).
+
+    Returns:
+        dict: Zaktualizowane sumy.
+    """
+    if "error" in result:
+        return total
+    if total is None:
+        total = dict.fromkeys(TOTAL_KEYS, 0)
+        total["columns"] = None
+        total["quantiles"] = None
+        total["distinct"] = None
+    for key in TOTAL_KEYS:
+        total[key] += result[key]
+    total["columns"] = merge_column_stats(total["columns"], result.get("columns"))
+    total["quantiles"] = merge_sketches(total["quantiles"], result.get("quantiles"))
+    total["distinct"] = merge_distinct_partials(total["distinct"], result.get("distinct"))
+    return total
+
+
+def summarize_totals(total: dict | None) -> dict:
+    """
+    Zamienia sumy częściowe na podsumowanie statystyk globalnych.
+
+    Args:
+        total (dict | None): Sumy z merge_totals (None – brak danych).
+
+    Returns:
+        dict: Podsumowanie statystyk globalnych.
+    """
+    if total is None:
+        total = dict.fromkeys(TOTAL_KEYS, 0)
 
     rows = total["rows"]
-    return {
+    summary = {
         "Liczba rekordów": rows,
         "Średnia długość trasy (mile)": round(total["distance"] / rows, 2) if rows else 0,
         "Średni napiwek ($)": round(total["tip"] / rows, 2) if rows else 0,
@@ -89,24 +248,139 @@ def aggregate_results(results: list[dict]) -> dict:
         "Liczba długich kursów (>10 mil)": total["long_trips"]
     }
 
+    sketches = total.get("quantiles") or {}
+    for column in QUANTILE_COLUMNS:
+        if column in sketches:
+            for label, q in QUANTILES.items():
+                value = sketches[column].quantile(q)
+                summary[f"{column} – {label} (≈)"] = round(value, 2) if value is not None else None
 
-def save_summary_by_vendor(df: pd.DataFrame, output_path="data/output/summary_by_vendor.txt"):
+    distinct = total.get("distinct")
+    if distinct is not None:
+        for metric, label in DISTINCT_LABELS.items():
+            if metric in distinct["all"]:
+                summary[f"{label} (≈)"] = distinct["all"][metric].estimate()
+    return summary
+
+
+def aggregate_results(results: list[dict]) -> dict:
     """
-    Tworzy raport średnich i maksymalnych wartości dla każdego VendorID.
+    Sumuje dane ze wszystkich chunków.
 
     Args:
-        df (pd.DataFrame): Dane wejściowe.
+        results (list[dict]): Lista wyników z analyze_chunk.
+
+    Returns:
+        dict: Podsumowanie statystyk globalnych.
+    """
+    total = None
+    for result in results:
+        total = merge_totals(total, result)
+    return summarize_totals(total)
+
+
+def aggregate_column_stats(results: list[dict]) -> dict[str, MetricStats]:
+    """
+    Łączy akumulatory statystyk kolumn ze wszystkich chunków.
+
+    Args:
+        results (list[dict]): Lista wyników z analyze_chunk.
+
+    Returns:
+        dict[str, MetricStats]: Statystyki per kolumna dla całego zbioru.
+    """
+    stats = None
+    for result in results:
+        stats = merge_column_stats(stats, result.get("columns"))
+    return stats or {}
+
+
+def write_column_stats(stats: dict[str, MetricStats] | None, output_path="data/output/column_stats.txt"):
+    """
+    Zapisuje raport statystyk opisowych kolumn numerycznych.
+
+    Args:
+        stats (dict[str, MetricStats] | None): Wynik aggregate_column_stats lub merge_column_stats.
+        output_path (str): Ścieżka zapisu raportu.
+    """
+    if not stats:
+        logger.warning("Brak kolumn numerycznych, pominięto raport statystyk kolumn.")
+        return
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("Statystyki kolumn numerycznych:\n")
+        f.write(column_stats_frame(stats).round(2).to_string())
+        f.write("\n")
+
+
+def write_distinct_counts(distinct: dict | None, output_path="data/output/distinct_counts.txt"):
+    """
+    Zapisuje raport przybliżonych liczb unikalnych stref i par odbiór→cel:
+    łącznie, per VendorID i per dzień odbioru, z błędem względnym szkicu.
+
+    Args:
+        distinct (dict | None): Wynik distinct_partial lub merge_distinct_partials.
+        output_path (str): Ścieżka zapisu raportu.
+    """
+    if distinct is None or not distinct["all"]:
+        logger.warning("Brak kolumn PULocationID/DOLocationID, pominięto raport liczności.")
+        return
+
+    error = next(iter(distinct["all"].values())).relative_error
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("Przybliżone liczby unikalnych wartości (HyperLogLog)\n")
+        f.write(f"Błąd względny: ±{error:.1%} (1σ), ±{2 * error:.1%} (2σ)\n\n")
+        f.write("Łącznie:\n")
+        f.write(distinct_frame({"wszystkie": distinct["all"]}).to_string())
+        for breakdown, title in (("vendor", "Per VendorID"), ("day", "Per dzień odbioru")):
+            if distinct[breakdown]:
+                f.write(f"\n\n{title}:\n")
+                f.write(distinct_frame(distinct[breakdown]).to_string())
+        f.write("\n")
+
+
+def vendor_partial(df: pd.DataFrame) -> pd.DataFrame | None:
+    """
+    Wylicza mergowalny agregat częściowy per VendorID: liczność, sumę (float64) i maksimum metryk.
+
+    Args:
+        df (pd.DataFrame): Fragment danych.
+
+    Returns:
+        pd.DataFrame | None: Agregat z kolumnami (metryka, count/sum/max) lub None,
+        gdy brakuje wymaganych kolumn.
+    """
+    return VENDOR_GROUPING.partial(df)
+
+
+def merge_vendor_partials(partials: list[pd.DataFrame | None]) -> pd.DataFrame | None:
+    """
+    Łączy agregaty częściowe per VendorID z wielu chunków.
+
+    Args:
+        partials (list[pd.DataFrame | None]): Wyniki vendor_partial.
+
+    Returns:
+        pd.DataFrame | None: Połączony agregat lub None, gdy żaden chunk nie miał wymaganych kolumn.
+    """
+    return VENDOR_GROUPING.merge(partials)
+
+
+def write_summary_by_vendor(partial: pd.DataFrame | None, output_path="data/output/summary_by_vendor.txt"):
+    """
+    Zapisuje raport średnich i maksymalnych wartości dla każdego VendorID z agregatu częściowego.
+
+    Args:
+        partial (pd.DataFrame | None): Wynik vendor_partial lub merge_vendor_partials.
         output_path (str): Ścieżka zapisu pliku.
     """
-    if 'VendorID' not in df.columns:
+    if partial is None:
         logger.warning("Brak kolumny 'VendorID', pominięto raport per VendorID.")
         return
 
-    grouped = df.groupby("VendorID").agg({
-        "fare_amount": ["mean", "max"],
-        "tip_amount": ["mean", "max"],
-        "trip_distance": ["mean", "max"]
-    })
+    grouped = VENDOR_GROUPING.finalize(partial).round(2)
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as f:
@@ -115,66 +389,817 @@ def save_summary_by_vendor(df: pd.DataFrame, output_path="data/output/summary_by
         f.write("\n")
 
 
-def save_anomalies_report(df: pd.DataFrame, output_path="data/output/anomalies_report.txt"):
+def save_summary_by_vendor(df: pd.DataFrame, output_path="data/output/summary_by_vendor.txt"):
     """
-    Wyszukuje i zapisuje rekordy, w których tip_amount > total_amount.
+    Tworzy raport średnich i maksymalnych wartości dla każdego VendorID.
 
     Args:
         df (pd.DataFrame): Dane wejściowe.
+        output_path (str): Ścieżka zapisu pliku.
+    """
+    write_summary_by_vendor(vendor_partial(df), output_path)
+
+
+def group_partials(
+    df: pd.DataFrame,
+    groupings: dict[str, GroupBy] | None = None
+) -> dict[str, pd.DataFrame | None]:
+    """
+    Wylicza agregaty częściowe wszystkich raportów grupowanych dla chunku.
+
+    Args:
+        df (pd.DataFrame): Fragment danych.
+        groupings (dict[str, GroupBy] | None): Raporty grupowane (domyślnie GROUP_REPORTS).
+
+    Returns:
+        dict[str, pd.DataFrame | None]: Nazwa raportu → wynik GroupBy.partial.
+    """
+    groupings = GROUP_REPORTS if groupings is None else groupings
+    partials = {}
+    for name, grouping in groupings.items():
+        try:
+            partials[name] = grouping.partial(df)
+        except Exception as e:
+            logger.warning(f"Błąd grupowania '{name}': {e}")
+            partials[name] = None
+    return partials
+
+
+def write_grouped_reports(
+    groups: dict[str, pd.DataFrame | None],
+    groupings: dict[str, GroupBy] | None = None,
+    output_path="data/output/grouped_summary.txt"
+):
+    """
+    Zapisuje raporty grupowane (po jednej sekcji na grupowanie) z połączonych agregatów częściowych.
+
+    Args:
+        groups (dict[str, pd.DataFrame | None]): Nazwa raportu → połączony agregat częściowy.
+        groupings (dict[str, GroupBy] | None): Raporty grupowane (domyślnie GROUP_REPORTS).
         output_path (str): Ścieżka zapisu raportu.
     """
+    groupings = GROUP_REPORTS if groupings is None else groupings
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        for name, grouping in groupings.items():
+            table = grouping.finalize(groups.get(name))
+            f.write(f"Podsumowanie per {', '.join(grouping.keys)}:\n")
+            if table is None:
+                logger.warning(f"Brak kolumn dla raportu grupowanego '{name}', pominięto.")
+                f.write("(brak wymaganych kolumn)\n\n")
+                continue
+            f.write(table.round(2).to_string())
+            f.write("\n\n")
+
+
+def time_rollup_partial(df: pd.DataFrame) -> TimeRollup | None:
+    """
+    Wylicza agregaty czasowe chunku według czasu odbioru.
+
+    Args:
+        df (pd.DataFrame): Fragment danych.
+
+    Returns:
+        TimeRollup | None: Agregaty czasowe lub None w razie błędu.
+    """
+    try:
+        return TimeRollup().add(df)
+    except Exception as e:
+        logger.warning(f"Błąd agregacji czasowej: {e}")
+        return None
+
+
+def od_partial(df: pd.DataFrame) -> ODMatrix | None:
+    """
+    Wylicza macierz źródło–cel chunku.
+
+    Args:
+        df (pd.DataFrame): Fragment danych.
+
+    Returns:
+        ODMatrix | None: Macierz OD lub None, gdy brakuje kolumn stref albo wystąpił błąd.
+    """
+    if not all(col in df.columns for col in ["PULocationID", "DOLocationID"]):
+        return None
+    try:
+        return ODMatrix().add(df)
+    except Exception as e:
+        logger.warning(f"Błąd budowy macierzy OD: {e}")
+        return None
+
+
+def write_od_matrix(
+    matrix: ODMatrix | None,
+    output_path="data/output/od_matrix.npz",
+    report_path="data/output/od_top_pairs.txt"
+):
+    """
+    Zapisuje macierz źródło–cel (.npz: liczby kursów i średnie metryk) oraz raport
+    najczęstszych par stref.
+
+    Args:
+        matrix (ODMatrix | None): Połączona macierz OD.
+        output_path (str): Ścieżka zapisu macierzy.
+        report_path (str): Ścieżka zapisu raportu tekstowego.
+    """
+    if matrix is None or not matrix.total_trips:
+        logger.warning("Brak kolumn PULocationID/DOLocationID, pominięto macierz OD.")
+        return
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    matrix.save(output_path)
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(f"Macierz źródło–cel: {matrix.zones} × {matrix.zones} stref, ")
+        f.write(f"{matrix.total_trips} kursów, {int(np.count_nonzero(matrix.trips))} par stref z kursami")
+        if matrix.skipped:
+            f.write(f", pominięto {matrix.skipped} kursów ze strefą spoza zakresu")
+        f.write(f"\n\nNajczęstsze pary stref (top {OD_TOP_PAIRS}):\n")
+        f.write(matrix.top_pairs(OD_TOP_PAIRS).round(2).to_string(index=False))
+        f.write("\n")
+
+
+def anomalies_partial(df: pd.DataFrame) -> dict | None:
+    """
+    Wylicza mergowalny agregat częściowy anomalii (tip_amount > total_amount):
+    ich liczbę oraz pierwsze rekordy do podglądu.
+
+    Args:
+        df (pd.DataFrame): Fragment danych.
+
+    Returns:
+        dict | None: {"count": liczba anomalii, "head": pierwsze anomalie} lub None,
+        gdy brakuje wymaganych kolumn.
+    """
     if not all(col in df.columns for col in ["tip_amount", "total_amount"]):
+        return None
+
+    anomalies = df[df["tip_amount"] > df["total_amount"]]
+    columns = [col for col in ANOMALY_COLUMNS if col in df.columns]
+    return {"count": len(anomalies), "head": anomalies[columns].head(ANOMALY_PREVIEW_ROWS)}
+
+
+def merge_anomalies_partials(partials: list[dict | None]) -> dict | None:
+    """
+    Łączy agregaty częściowe anomalii z wielu chunków (w kolejności chunków).
+
+    Args:
+        partials (list[dict | None]): Wyniki anomalies_partial.
+
+    Returns:
+        dict | None: Połączony agregat lub None, gdy żaden chunk nie miał wymaganych kolumn.
+    """
+    partials = [p for p in partials if p is not None]
+    if not partials:
+        return None
+
+    head = pd.concat([p["head"] for p in partials], ignore_index=True).head(ANOMALY_PREVIEW_ROWS)
+    return {"count": sum(p["count"] for p in partials), "head": head}
+
+
+def write_anomalies_report(partial: dict | None, output_path="data/output/anomalies_report.txt"):
+    """
+    Zapisuje raport anomalii (tip_amount > total_amount) z agregatu częściowego.
+
+    Args:
+        partial (dict | None): Wynik anomalies_partial lub merge_anomalies_partials.
+        output_path (str): Ścieżka zapisu raportu.
+    """
+    if partial is None:
         logger.warning("Brakuje kolumn tip_amount lub total_amount, pominięto raport anomalii.")
         return
 
-    anomalies = df[df["tip_amount"] > df["total_amount"]]
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
     with open(output_path, "w", encoding="utf-8") as f:
         f.write("Anomalie: tip_amount > total_amount\n")
-        f.write(f"Liczba podejrzanych rekordów: {len(anomalies)}\n\n")
-        if not anomalies.empty:
-            f.write(anomalies[["VendorID", "fare_amount", "tip_amount", "total_amount"]].head(10).to_string())
+        f.write(f"Liczba podejrzanych rekordów: {partial['count']}\n\n")
+        if partial["count"]:
+            f.write(partial["head"].round(2).to_string())
 
 
-@measure_time
-@count_calls
-def parallel_analysis(path: str, chunksize: int = 100_000) -> dict:
+def save_anomalies_report(df: pd.DataFrame, output_path="data/output/anomalies_report.txt"):
     """
-    Główna funkcja analizy danych z wykorzystaniem multiprocessing.
+    Wyszukuje i zapisuje rekordy, w których tip_amount > total_amount.
 
     Args:
-        path (str): Ścieżka do pliku .parquet.
+        df (pd.DataFrame): Dane wejściowe.
+        output_path (str): Ścieżka zapisu raportu.
+    """
+    write_anomalies_report(anomalies_partial(df), output_path)
+
+
+def save_per_file_summary(per_file: dict[str, dict], output_path="data/output/per_file_summary.txt"):
+    """
+    Zapisuje częściowe podsumowania (wynik aggregate_results) osobno dla każdego pliku.
+
+    Args:
+        per_file (dict[str, dict]): Podsumowanie dla każdej ścieżki pliku.
+        output_path (str): Ścieżka zapisu pliku.
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("Podsumowanie per plik:\n")
+        for file_path, summary in per_file.items():
+            f.write(f"\n[{file_path}]\n")
+            for k, v in summary.items():
+                f.write(f"{k}: {v}\n")
+
+
+def _iter_file_chunks(
+    files: list[str],
+    chunksize: int,
+    low_memory: bool = False,
+    filters: pc.Expression | None = None,
+    index: HashIndex | None = None
+):
+    """
+    Wczytuje strumieniowo chunki plików, dekodując kilka plików współbieżnie w wątkach
+    (prefetch_files), i oznacza każdy chunk ścieżką pliku, z którego pochodzi. Chunki są
+    zwracane w kolejności plików, więc deduplikacja zachowuje pierwsze wystąpienie wiersza
+    w zbiorze. Kolumny są od razu rzutowane na kompaktowy schemat TAXI_DTYPES, co zmniejsza
+    także koszt serializacji chunków do procesów roboczych.
+
+    Args:
+        files (list[str]): Ścieżki do plików Parquet.
         chunksize (int): Liczba wierszy na chunk.
+        low_memory (bool): Czy wczytywać dane w trybie niskiego zużycia pamięci.
+        filters (pc.Expression | None): Filtr predicate pushdown (opcjonalnie).
+        index (HashIndex | None): Indeks globalnej deduplikacji (opcjonalnie).
+
+    Yields:
+        tuple[str, pd.DataFrame]: Ścieżka pliku i chunk danych.
+    """
+    open_file = partial(
+        load_parquet_in_chunks, chunksize=chunksize, filters=filters, low_memory=low_memory, dtypes=TAXI_DTYPES
+    )
+    for file_path, chunk in prefetch_files(files, open_file):
+        if index is not None:
+            chunk = index.drop_seen(chunk)
+        yield file_path, chunk
+
+
+def _process_file_chunk(
+    item: tuple[str, pd.DataFrame | SharedFrame],
+    validate: bool = False,
+    sketch_k: int = DEFAULT_K,
+    hll_precision: int = DEFAULT_PRECISION,
+    groupings: dict[str, GroupBy] | None = None
+) -> tuple[str, list[dict]]:
+    """
+    Wywołuje process_chunk dla chunku oznaczonego ścieżką pliku (zadanie dla Pool).
+
+    Args:
+        item (tuple[str, pd.DataFrame | SharedFrame]): Ścieżka pliku i chunk danych
+            (lub uchwyt do chunku w pamięci współdzielonej).
+        validate (bool): Czy walidować chunk przed analizą.
+        sketch_k (int): Parametr dokładności szkiców kwantyli.
+        hll_precision (int): Precyzja szkiców HyperLogLog.
+        groupings (dict[str, GroupBy] | None): Raporty grupowane (domyślnie GROUP_REPORTS).
 
     Returns:
-        dict: Podsumowanie wyników analizy (lub pusty słownik przy błędzie).
+        tuple[str, list[dict]]: Ścieżka pliku i wynik process_chunk (lista jednoelementowa,
+        jak dla jednostek pracy z _process_work_unit).
     """
-    os.makedirs("data/output", exist_ok=True)
-    logger.info(f"Start analizy równoległej ({cpu_count()} CPU)...")
+    file_path, chunk = item
+    return file_path, [process_chunk(unwrap(chunk), validate, sketch_k, hll_precision, groupings)]
+
+
+def _process_work_unit(
+    unit: WorkUnit,
+    chunksize: int,
+    low_memory: bool = False,
+    filters: pc.Expression | None = None,
+    validate: bool = False,
+    sketch_k: int = DEFAULT_K,
+    hll_precision: int = DEFAULT_PRECISION,
+    groupings: dict[str, GroupBy] | None = None
+) -> tuple[str, list[dict]]:
+    """
+    Wczytuje jednostkę pracy w procesie roboczym i wywołuje process_chunk dla jej chunków (zadanie dla Pool).
+
+    Args:
+        unit (WorkUnit): Deskryptor grup wierszy do przetworzenia.
+        chunksize (int): Liczba wierszy na chunk.
+        low_memory (bool): Czy wczytywać dane w trybie niskiego zużycia pamięci.
+        filters (pc.Expression | None): Filtr predicate pushdown (opcjonalnie).
+        validate (bool): Czy walidować chunki przed analizą.
+        sketch_k (int): Parametr dokładności szkiców kwantyli.
+        hll_precision (int): Precyzja szkiców HyperLogLog.
+        groupings (dict[str, GroupBy] | None): Raporty grupowane (domyślnie GROUP_REPORTS).
+
+    Returns:
+        tuple[str, list[dict]]: Ścieżka pliku i wyniki process_chunk dla kolejnych chunków.
+    """
+    chunks = load_work_unit(unit, chunksize, low_memory, TAXI_DTYPES, filters)
+    return unit.file_path, [process_chunk(chunk, validate, sketch_k, hll_precision, groupings) for chunk in chunks]
+
+
+def _unit_fingerprints(
+    unit: WorkUnit,
+    chunksize: int,
+    low_memory: bool = False,
+    filters: pc.Expression | None = None
+):
+    """
+    Wylicza odciski wierszy jednostki pracy w procesie roboczym (zadanie dla Pool).
+
+    Args:
+        unit (WorkUnit): Deskryptor grup wierszy.
+        chunksize (int): Liczba wierszy na chunk.
+        low_memory (bool): Czy wczytywać dane w trybie niskiego zużycia pamięci.
+        filters (pc.Expression | None): Filtr predicate pushdown (opcjonalnie).
+
+    Returns:
+        np.ndarray: Odciski uint64 wierszy jednostki.
+    """
+    return unit_fingerprints(unit, chunksize, low_memory, TAXI_DTYPES, filters)
+
 
+def _numbered_task(numbered: tuple[int, object], task: Callable):
+    """
+    Wywołuje zadanie dla elementu oznaczonego numerem (zadanie dla Pool).
+
+    Wyjątek zadania (np. błąd odczytu grup wierszy) nie przerywa analizy – zadanie zwraca
+    wtedy wynik z kluczem "error" i jest rejestrowane jako nieudane.
+
+    Args:
+        numbered (tuple[int, object]): Numer zadania i element wejścia.
+        task (Callable): Właściwe zadanie (np. _process_file_chunk).
+
+    Returns:
+        tuple[str | None, list[dict]]: Wynik zadania (ścieżka pliku i wyniki chunków).
+    """
     try:
-        chunks = list(load_parquet_in_chunks(path, chunksize))
-        logger.info(f"Załadowano {len(chunks)} chunków.")
+        return task(numbered[1])
+    except Exception as e:
+        logger.warning(f"Błąd zadania {numbered[0]}: {e}")
+        return None, [{"error": f"{type(e).__name__}: {e}"}]
 
-        with Pool(cpu_count()) as pool:
-            results = pool.map(analyze_chunk, chunks)
 
-        summary = aggregate_results(results)
+def _restore_checkpoints(
+    units: list[WorkUnit],
+    store: CheckpointStore | None,
+    aggregate: "_RunningAggregate",
+    index: HashIndex | None = None
+) -> list[tuple[int, WorkUnit]]:
+    """
+    Dołącza do agregatów wyniki jednostek zapisane w checkpointach i zwraca pozostałe.
 
-        with open("data/output/parallel_summary.txt", "w", encoding="utf-8") as f:
-            for k, v in summary.items():
-                f.write(f"{k}: {v}\n")
+    Odciski wierszy zachowanych w zapisanych jednostkach trafiają do indeksu deduplikacji,
+    więc odciski trzeba potem wyliczyć tylko dla jednostek do przetworzenia.
+
+    Args:
+        units (list[WorkUnit]): Zaplanowane jednostki (w kolejności zbioru danych).
+        store (CheckpointStore | None): Magazyn checkpointów przebiegu (None – bez checkpointów).
+        aggregate (_RunningAggregate): Agregaty przebiegu.
+        index (HashIndex | None): Indeks globalnej deduplikacji (opcjonalnie).
+
+    Returns:
+        list[tuple[int, WorkUnit]]: Numery i jednostki do przetworzenia.
+    """
+    pending = []
+    for task_no, unit in enumerate(units):
+        saved = store.load(unit) if store is not None else None
+        if saved is None:
+            pending.append((task_no, unit))
+            continue
+        aggregate.add(task_no, unit.file_path, saved["results"])
+        if index is not None:
+            index.add(saved["hashes"])
+            index.dropped += saved["dropped"]
+    if store is not None and len(pending) < len(units):
+        logger.info(f"[Checkpoint] Wczytano {len(units) - len(pending)} ukończonych jednostek, do przetworzenia: {len(pending)}.")
+    return pending
 
-        # Łączenie wszystkich chunków do raportów szczegółowych
-        full_df = pd.concat(chunks, ignore_index=True)
 
-        save_summary_by_vendor(full_df)
-        save_anomalies_report(full_df)
+def _deduplicate_units(
+    pool, items: list[tuple[int, WorkUnit]], index: HashIndex, task, collect: bool = False
+) -> dict[int, dict]:
+    """
+    Wyznacza maski globalnej deduplikacji jednostek pracy z odcisków liczonych przez procesy robocze.
+
+    Odciski są dodawane do indeksu w kolejności jednostek, więc zachowywane jest pierwsze
+    wystąpienie wiersza w zbiorze – tak jak przy deduplikacji chunków w procesie głównym.
+
+    Args:
+        pool (multiprocessing.pool.Pool): Pula procesów roboczych.
+        items (list[tuple[int, WorkUnit]]): Numery i jednostki pracy (maski są ustawiane w miejscu).
+        index (HashIndex): Indeks globalnej deduplikacji.
+        task (Callable[[WorkUnit], np.ndarray]): Zadanie wyliczające odciski jednostki.
+        collect (bool): Czy zwrócić odciski zachowanych wierszy (dla checkpointów).
+
+    Returns:
+        dict[int, dict]: Dla numeru jednostki – odciski zachowanych wierszy ("hashes")
+        i liczba usuniętych duplikatów ("dropped"), zapisywane w checkpoincie jednostki
+        (pusty słownik, gdy `collect=False`).
+    """
+    kept = {}
+    units = [unit for _, unit in items]
+    for (task_no, unit), fingerprints in zip(items, pool.imap(task, units)):
+        keep = index.add(fingerprints)
+        dropped = len(keep) - int(keep.sum())
+        index.dropped += dropped
+        unit.set_keep_mask(keep)
+        if collect:
+            kept[task_no] = {"hashes": fingerprints[keep], "dropped": dropped}
+    return kept
+
+
+class _RunningAggregate:
+    """
+    Agregaty analizy równoległej aktualizowane w miarę napływu wyników z procesów roboczych.
+
+    Wyniki mogą przychodzić w dowolnej kolejności; każdy jest oznaczony numerem zadania,
+    dzięki czemu podgląd anomalii zawiera pierwsze rekordy w kolejności zbioru danych.
+    Zadania zakończone błędem są rejestrowane (`fail`) i nie trafiają do agregatów.
+    """
+
+    def __init__(
+        self,
+        files: list[str],
+        validate: bool = False,
+        groupings: dict[str, GroupBy] | None = None
+    ):
+        """
+        Args:
+            files (list[str]): Pliki wejściowe (podsumowania per plik).
+            validate (bool): Czy wyniki zawierają statystyki walidacji.
+            groupings (dict[str, GroupBy] | None): Raporty grupowane (domyślnie GROUP_REPORTS).
+        """
+        self.chunks = 0
+        self.failed = []
+        self.totals = None
+        self.per_file = {file_path: None for file_path in files}
+        self.vendor = TreeReducer(merge_vendor_partials)
+        self.groupings = GROUP_REPORTS if groupings is None else groupings
+        self.groups = {name: TreeReducer(grouping.merge) for name, grouping in self.groupings.items()}
+        self.rollup = TimeRollup()
+        self.od = None
+        self.validation = ValidationStats() if validate else None
+        self._anomalies_count = 0
+        self._anomalies_heads = []
+        self._has_anomalies = False
+
+    def fail(self, task_no: int, item, errors: list[str]) -> None:
+        """
+        Rejestruje zadanie zakończone błędem (jego wyniki nie są wliczane).
+
+        Args:
+            task_no (int): Numer zadania w kolejności zbioru danych.
+            item: Element wejścia zadania (np. WorkUnit).
+            errors (list[str]): Opisy błędów.
+        """
+        label = item if isinstance(item, WorkUnit) else f"chunk {task_no}"
+        logger.error(f"Zadanie {label} nie powiodło się: {'; '.join(errors)}")
+        self.failed.append((task_no, label))
+
+    def add(self, task_no: int, file_path: str, results: list[dict]) -> None:
+        """
+        Dołącza wyniki jednego zadania (kolejnych chunków pliku).
+
+        Args:
+            task_no (int): Numer zadania w kolejności zbioru danych.
+            file_path (str): Plik, z którego pochodzą chunki.
+            results (list[dict]): Wyniki process_chunk.
+        """
+        for position, result in enumerate(results):
+            self.chunks += 1
+            self.totals = merge_totals(self.totals, result)
+            self.per_file[file_path] = merge_totals(self.per_file[file_path], result)
+            self.vendor.add(result["vendor"])
+            for name, group_partial in result["groups"].items():
+                self.groups[name].add(group_partial)
+            if result["rollup"] is not None:
+                self.rollup.merge(result["rollup"])
+            if result["od"] is not None:
+                self.od = result["od"] if self.od is None else self.od.merge(result["od"])
+            if self.validation is not None:
+                self.validation.merge(result["validation"])
 
-        logger.info("Analiza zakończona sukcesem. Raporty zapisane.")
+            anomalies = result["anomalies"]
+            if anomalies is not None:
+                self._has_anomalies = True
+                self._anomalies_count += anomalies["count"]
+                if len(anomalies["head"]):
+                    self._anomalies_heads.append(((task_no, position), anomalies["head"]))
+                    self._trim_anomalies_heads()
+
+    def _trim_anomalies_heads(self) -> None:
+        """
+        Zostawia tylko podglądy potrzebne do ANOMALY_PREVIEW_ROWS pierwszych anomalii.
+        """
+        self._anomalies_heads.sort(key=lambda item: item[0])
+        rows = 0
+        for keep, (_, head) in enumerate(self._anomalies_heads, start=1):
+            rows += len(head)
+            if rows >= ANOMALY_PREVIEW_ROWS:
+                del self._anomalies_heads[keep:]
+                return
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: Bieżące podsumowanie globalne (jak aggregate_results) – z liczbą
+            nieudanych zadań, jeśli takie wystąpiły.
+        """
+        summary = summarize_totals(self.totals)
+        if self.failed:
+            summary["Nieudane zadania (niewliczone)"] = len(self.failed)
         return summary
 
+    def grouped(self) -> dict[str, pd.DataFrame | None]:
+        """
+        Returns:
+            dict[str, pd.DataFrame | None]: Połączone agregaty raportów grupowanych.
+        """
+        return {name: reducer.result() for name, reducer in self.groups.items()}
+
+    def anomalies(self) -> dict | None:
+        """
+        Returns:
+            dict | None: Połączony agregat anomalii (jak merge_anomalies_partials).
+        """
+        if not self._has_anomalies:
+            return None
+        partials = [{"count": 0, "head": head} for _, head in self._anomalies_heads]
+        merged = merge_anomalies_partials(partials)
+        if merged is None:
+            return {"count": self._anomalies_count, "head": pd.DataFrame(columns=ANOMALY_COLUMNS)}
+        merged["count"] = self._anomalies_count
+        return merged
+
+
+def _record_task(
+    aggregate: _RunningAggregate,
+    task_no: int,
+    item,
+    file_path: str | None,
+    task_results: list[dict],
+    progress: Callable[[dict], None] | None
+) -> bool:
+    """
+    Dołącza wynik zadania do agregatów albo rejestruje je jako nieudane.
+
+    Args:
+        aggregate (_RunningAggregate): Agregaty przebiegu.
+        task_no (int): Numer zadania w kolejności zbioru danych.
+        item: Element wejścia zadania (chunk lub WorkUnit).
+        file_path (str | None): Plik, z którego pochodzą dane zadania.
+        task_results (list[dict]): Wyniki process_chunk.
+        progress (Callable[[dict], None] | None): Funkcja wywoływana z bieżącym podsumowaniem.
+
+    Returns:
+        bool: Czy zadanie zakończyło się sukcesem.
+    """
+    errors = [result["error"] for result in task_results if "error" in result]
+    if errors:
+        aggregate.fail(task_no, item, errors)
+        return False
+    aggregate.add(task_no, file_path, task_results)
+    if progress is not None:
+        progress(aggregate.summary())
+    return True
+
+
+def _dispatch_chunks(
+    pool,
+    run: PoolRun,
+    options: AnalysisOptions,
+    aggregate: _RunningAggregate,
+    pushdown: pc.Expression | None,
+    progress: Callable[[dict], None] | None
+) -> None:
+    """
+    Dekoduje chunki w procesie głównym (kilka plików współbieżnie) i wysyła je do procesów roboczych.
+
+    Args:
+        pool (multiprocessing.pool.Pool): Pula procesów roboczych.
+        run (PoolRun): Parametry przebiegu.
+        options (AnalysisOptions): Opcje przebiegu.
+        aggregate (_RunningAggregate): Agregaty przebiegu (uzupełniane).
+        pushdown (pc.Expression | None): Filtr walidacji przekazywany do skanera Parquet.
+        progress (Callable[[dict], None] | None): Funkcja wywoływana z bieżącym podsumowaniem.
+    """
+    shared = set()
+    try:
+        chunks = _iter_file_chunks(run.files, run.chunksize, options.low_memory, pushdown, run.index)
+        if options.transport == "shm":
+            # Ścieżki i chunki rozdzielane leniwie – zip pobiera je parami, więc tee nie buforuje danych
+            paths, frames = tee(chunks)
+            chunks = zip(
+                (file_path for file_path, _ in paths),
+                share_chunks((chunk for _, chunk in frames), shared)
+            )
+        task = partial(
+            _process_file_chunk, validate=options.validate, sketch_k=options.sketch_k,
+            hll_precision=options.hll_precision, groupings=options.groupings
+        )
+        for (task_no, item), (file_path, task_results) in bounded_imap_unordered(
+            pool, partial(_numbered_task, task=task), enumerate(chunks), run.max_in_flight
+        ):
+            if isinstance(item[1], SharedFrame):
+                shared.discard(item[1])
+                item[1].release()
+            _record_task(aggregate, task_no, item, file_path, task_results, progress)
+    finally:
+        for frame in shared:
+            frame.release()
+
+
+def _dispatch_row_groups(
+    pool,
+    path: str,
+    run: PoolRun,
+    options: AnalysisOptions,
+    aggregate: _RunningAggregate,
+    pushdown: pc.Expression | None,
+    progress: Callable[[dict], None] | None
+) -> CheckpointStore | None:
+    """
+    Wysyła do procesów roboczych deskryptory grup wierszy (opcjonalnie z checkpointami).
+
+    Args:
+        pool (multiprocessing.pool.Pool): Pula procesów roboczych.
+        path (str): Ścieżka do danych wejściowych.
+        run (PoolRun): Parametry przebiegu.
+        options (AnalysisOptions): Opcje przebiegu.
+        aggregate (_RunningAggregate): Agregaty przebiegu (uzupełniane).
+        pushdown (pc.Expression | None): Filtr walidacji przekazywany do skanera Parquet.
+        progress (Callable[[dict], None] | None): Funkcja wywoływana z bieżącym podsumowaniem.
+
+    Returns:
+        CheckpointStore | None: Magazyn checkpointów przebiegu (None – bez checkpointów).
+    """
+    store = None
+    if options.checkpoint_dir is None:
+        units = plan_work_units(path, run.chunksize)
+    else:
+        # Jednostki checkpointów są planowane z `chunksize` podanego przez użytkownika –
+        # rozmiar wyliczony z liczby CPU i wolnej pamięci zmienia się między maszynami
+        units = plan_work_units(path, options.chunksize)
+        store = CheckpointStore(run_fingerprint(
+            run.files, unit_rows=options.chunksize, deduplicate=options.deduplicate, validate=options.validate,
+            sketch_k=options.sketch_k, hll_precision=options.hll_precision, groupings=repr(aggregate.groupings)
+        ), options.checkpoint_dir, run.files)
+    logger.info(f"Zaplanowano {len(units)} jednostek pracy (grupy wierszy).")
+
+    # Zapisane jednostki najpierw – odciski liczone są tylko dla pozostałych
+    items = _restore_checkpoints(units, store, aggregate, run.index)
+    kept = {}
+    if run.index is not None:
+        fingerprint_task = partial(
+            _unit_fingerprints, chunksize=run.chunksize, low_memory=options.low_memory, filters=pushdown
+        )
+        kept = _deduplicate_units(pool, items, run.index, fingerprint_task, collect=store is not None)
+
+    task = partial(
+        _process_work_unit, chunksize=run.chunksize, low_memory=options.low_memory, filters=pushdown,
+        validate=options.validate, sketch_k=options.sketch_k, hll_precision=options.hll_precision,
+        groupings=options.groupings
+    )
+    for (task_no, unit), (file_path, task_results) in bounded_imap_unordered(
+        pool, partial(_numbered_task, task=task), items, run.max_in_flight
+    ):
+        if _record_task(aggregate, task_no, unit, file_path, task_results, progress) and store is not None:
+            unit_kept = kept.pop(task_no, {"hashes": np.empty(0, dtype=np.uint64), "dropped": 0})
+            store.save(unit, {"results": task_results, **unit_kept})
+    return store
+
+
+def _write_reports(
+    path: str,
+    run: PoolRun,
+    options: AnalysisOptions,
+    aggregate: _RunningAggregate,
+    store: CheckpointStore | None
+) -> dict:
+    """
+    Zapisuje podsumowania i raporty z agregatów przebiegu (bez łączenia chunków w jeden DataFrame).
+
+    Args:
+        path (str): Ścieżka do danych wejściowych.
+        run (PoolRun): Parametry przebiegu.
+        options (AnalysisOptions): Opcje przebiegu.
+        aggregate (_RunningAggregate): Agregaty przebiegu.
+        store (CheckpointStore | None): Magazyn checkpointów (usuwany po pełnym sukcesie).
+
+    Returns:
+        dict: Podsumowanie globalne.
+    """
+    logger.info(f"Przeanalizowano {aggregate.chunks} chunków z {len(run.files)} plików.")
+    if not aggregate.chunks:
+        raise ValueError(f"Brak danych do analizy: {path}")
+    index = run.index
+    if index is not None:
+        logger.info(f"[Dedup] Usunięto łącznie {index.dropped} duplikatów ({index.nbytes / 1024 ** 2:.1f} MB indeksu)")
+
+    if options.validate:
+        stats = aggregate.validation
+        if not aggregate.failed:
+            # Deduplikacja w procesie głównym odrzuca wiersze jeszcze przed walidacją
+            stats.record_pushdown(run.total_rows, stats.rows_in + (index.dropped if index is not None else 0))
+        if options.collect_stats:
+            stats.save("data/output/validation_stats.json")
+        logger.info(f"[Validation] {stats.rows_in} → {stats.rows_out} rekordów po walidacji")
+
+    save_per_file_summary({
+        file_path: summarize_totals(total) for file_path, total in aggregate.per_file.items()
+    })
+
+    summary = aggregate.summary()
+
+    with open("data/output/parallel_summary.txt", "w", encoding="utf-8") as f:
+        for k, v in summary.items():
+            f.write(f"{k}: {v}\n")
+
+    write_column_stats(aggregate.totals["columns"])
+    write_distinct_counts(aggregate.totals["distinct"])
+    write_summary_by_vendor(aggregate.vendor.result())
+    write_grouped_reports(aggregate.grouped(), aggregate.groupings)
+    write_time_rollups(aggregate.rollup)
+    write_od_matrix(aggregate.od)
+    write_anomalies_report(aggregate.anomalies())
+
+    if aggregate.failed:
+        logger.error(
+            f"{len(aggregate.failed)} zadań nie powiodło się – ich dane nie są wliczone do raportów"
+            + (", uruchom analizę ponownie, aby je przetworzyć." if store is not None else ".")
+        )
+        return summary
+    if store is not None:
+        store.clear()
+
+    logger.info("Analiza zakończona sukcesem. Raporty zapisane.")
+    return summary
+
+
+@measure_time
+@count_calls
+def parallel_analysis(
+    path: str,
+    options: AnalysisOptions | None = None,
+    progress: Callable[[dict], None] | None = None,
+    **overrides
+) -> dict:
+    """
+    Główna funkcja analizy danych z wykorzystaniem multiprocessing.
+
+    `path` może wskazywać pojedynczy plik, katalog (także partycjonowany w stylu Hive)
+    lub wzorzec glob. Procesy robocze zwracają metryki oraz mergowalne agregaty częściowe
+    raportów, dołączane w kolejności ukończenia – proces główny nie przechowuje całego zbioru
+    danych. W toku jest najwyżej `max_in_flight` zadań (core.dispatch). Oprócz globalnego
+    podsumowania zapisywane są podsumowania częściowe dla każdego pliku.
+
+    Podział pracy (`options.dispatch`):
+    - "chunks": proces główny dekoduje kilka plików współbieżnie i wysyła chunki (przez potok
+      puli lub – z `transport="shm"` – przez pamięć współdzieloną, core.transport),
+    - "row_groups": proces główny czyta tylko metadane i wysyła deskryptory grup wierszy
+      (core.work_units); deduplikacja wymaga wtedy przebiegu liczącego odciski wierszy.
+
+    Z `validate=True` procesy robocze walidują chunki (validate_chunk); proste reguły są
+    stosowane już przy odczycie (predicate pushdown), a statystyki odrzuceń – per reguła,
+    per chunk i przy odczycie – trafiają do `validation_stats.json`.
+
+    Z `checkpoint_dir` (włącza "row_groups") agregaty i odciski deduplikacji każdej ukończonej
+    jednostki są zapisywane (core.checkpoint). Ponowne uruchomienie przetwarza tylko brakujące
+    lub nieudane jednostki – także na innej maszynie, bo jednostki mają `chunksize` wierszy
+    niezależnie od liczby CPU i budżetu pamięci. Po pełnym sukcesie checkpointy są usuwane.
+
+    Chunki i jednostki zakończone błędem nie są wliczane do wyników (zamiast liczyć się jako
+    zera) – podsumowanie podaje wtedy ich liczbę.
+
+    Args:
+        path (str): Ścieżka do pliku .parquet, katalogu lub wzorzec glob.
+        options (AnalysisOptions | None): Opcje przebiegu (domyślnie AnalysisOptions()).
+        progress (Callable[[dict], None] | None): Funkcja wywoływana z bieżącym podsumowaniem
+            po każdym ukończonym zadaniu (opcjonalnie).
+        **overrides: Pojedyncze opcje nadpisujące `options` (np. `chunksize=50_000`).
+
+    Returns:
+        dict: Podsumowanie wyników analizy (lub pusty słownik przy błędzie).
+    """
+    options = (options or AnalysisOptions()).replace(**overrides)
+    os.makedirs("data/output", exist_ok=True)
+
+    try:
+        if options.dispatch not in DISPATCH_MODES:
+            raise ValueError(f"Nieznany sposób podziału pracy: {options.dispatch}")
+        if options.checkpoint_dir is not None and options.dispatch != "row_groups":
+            logger.info("Checkpointy są zapisywane per jednostka grup wierszy – używam dispatch='row_groups'.")
+            options = options.replace(dispatch="row_groups")
+        run = prepare_run(path, options)
+        logger.info(f"Start analizy równoległej ({run.workers} CPU)...")
+
+        aggregate = _RunningAggregate(run.files, validate=options.validate, groupings=options.groupings)
+        pushdown = build_pushdown_filter() if options.validate else None
+        store = None
+        with Pool(run.workers) as pool:
+            if options.dispatch == "row_groups":
+                store = _dispatch_row_groups(pool, path, run, options, aggregate, pushdown, progress)
+            else:
+                _dispatch_chunks(pool, run, options, aggregate, pushdown, progress)
+
+        return _write_reports(path, run, options, aggregate, store)
+
     except Exception as e:
         logger.error(f"Błąd podczas analizy multiprocessing: {e}")
         return {}
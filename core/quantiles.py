@@ -0,0 +1,192 @@
+"""
+quantiles.py
+
+Strumieniowe, przybliżone kwantyle (mediana, p95, p99) – szkic KLL.
+
+Szkic przechowuje wartości na poziomach; element na poziomie h reprezentuje 2^h wartości
+wejściowych. Gdy poziom przekroczy swoją pojemność, jest sortowany, a co drugi element
+przechodzi na poziom wyżej (kompakcja). Pojemności maleją geometrycznie w dół hierarchii,
+więc szkic mieści O(k) liczb (ok. 2,5·k) niezależnie od liczby wierszy, a błąd rangi
+maleje jak 1/k – dla k = 400 wynosi ok. 0,3% rangi, dla k = 200 ok. 0,7%.
+
+Szkice z różnych chunków i procesów roboczych łączy się (`merge`) przez złączenie poziomów
+i ponowną kompakcję. Przesunięcie kompakcji jest naprzemienne (a nie losowe), dzięki czemu
+wynik jest powtarzalny dla tych samych danych i tej samej kolejności łączenia.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+
+# Domyślny parametr dokładności szkicu (pojemność najwyższego poziomu)
+DEFAULT_K = 400
+
+# Współczynnik zmniejszania pojemności kolejnych (niższych) poziomów
+_CAPACITY_DECAY = 2 / 3
+
+# Minimalna pojemność poziomu
+_MIN_CAPACITY = 8
+
+
+class KLLSketch:
+    """
+    Mergowalny szkic kwantyli KLL dla jednej kolumny (braki danych są pomijane).
+    """
+
+    def __init__(self, k: int = DEFAULT_K):
+        """
+        Args:
+            k (int): Parametr dokładności – większe k to mniejszy błąd i większy szkic.
+        """
+        self.k = k
+        self.n = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._offsets = [0]
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def size(self) -> int:
+        """
+        Returns:
+            int: Liczba przechowywanych wartości (rozmiar szkicu).
+        """
+        return sum(len(level) for level in self.levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(_MIN_CAPACITY, math.ceil(self.k * _CAPACITY_DECAY ** depth))
+
+    def update(self, values: np.ndarray | pd.Series) -> "KLLSketch":
+        """
+        Dodaje wartości (np. kolumnę jednego chunku).
+
+        Args:
+            values (np.ndarray | pd.Series): Wartości numeryczne.
+
+        Returns:
+            KLLSketch: Ten obiekt.
+        """
+        values = np.asarray(pd.Series(values).astype("float64").dropna(), dtype=np.float64)
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Dołącza szkic z innego fragmentu danych.
+
+        Args:
+            other (KLLSketch): Szkic do dołączenia (nie jest modyfikowany).
+
+        Returns:
+            KLLSketch: Ten obiekt (po scaleniu).
+        """
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+            self._offsets.append(0)
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        """
+        Kompaktuje poziomy, dopóki szkic nie zmieści się w łącznej pojemności.
+
+        Kompaktowany jest zawsze najniższy poziom przekraczający własną pojemność, więc
+        wolne miejsce zostaje na niższych (dokładniejszych) poziomach.
+        """
+        while self.size > sum(self._capacity(level) for level in range(len(self.levels))):
+            level = next(
+                level for level in range(len(self.levels))
+                if len(self.levels[level]) > self._capacity(level)
+            )
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+                self._offsets.append(0)
+
+            items = np.sort(self.levels[level])
+            paired = len(items) - len(items) % 2
+            offset = self._offsets[level]
+            self._offsets[level] ^= 1
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset:paired:2]])
+            self.levels[level] = items[paired:]
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Zwraca przybliżony kwantyl rzędu `q` (wartość o randze ⌈q·n⌉, bez interpolacji).
+
+        Args:
+            q (float): Rząd kwantyla z przedziału [0, 1].
+
+        Returns:
+            float | None: Wartość kwantyla lub None dla pustego szkicu.
+        """
+        if self.n == 0:
+            return None
+        if q <= 0:
+            return self.minimum
+        if q >= 1:
+            return self.maximum
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level_items), 2 ** level, dtype=np.int64)
+            for level, level_items in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[order][min(position, len(items) - 1)])
+
+
+def sketch_columns(df: pd.DataFrame, columns: list[str], k: int = DEFAULT_K) -> dict[str, KLLSketch]:
+    """
+    Buduje szkice kwantyli dla wskazanych kolumn chunku (brakujące kolumny są pomijane).
+
+    Args:
+        df (pd.DataFrame): Fragment danych.
+        columns (list[str]): Kolumny numeryczne.
+        k (int): Parametr dokładności szkicu.
+
+    Returns:
+        dict[str, KLLSketch]: Szkic per kolumna.
+    """
+    return {name: KLLSketch(k).update(df[name]) for name in columns if name in df.columns}
+
+
+def merge_sketches(
+    left: dict[str, KLLSketch] | None,
+    right: dict[str, KLLSketch] | None
+) -> dict[str, KLLSketch] | None:
+    """
+    Łączy szkice kolumn z dwóch fragmentów (`left` jest modyfikowany w miejscu).
+
+    Args:
+        left (dict[str, KLLSketch] | None): Dotychczasowe szkice.
+        right (dict[str, KLLSketch] | None): Szkice do dołączenia.
+
+    Returns:
+        dict[str, KLLSketch] | None: Połączone szkice.
+    """
+    if right is None:
+        return left
+    if left is None:
+        left = {}
+    for name, sketch in right.items():
+        left.setdefault(name, KLLSketch(sketch.k)).merge(sketch)
+    return left
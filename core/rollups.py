@@ -0,0 +1,252 @@
+"""
+rollups.py
+
+Agregaty czasowe przejazdów: liczba kursów oraz sumy i średnie metryk per godzina doby,
+dzień tygodnia, dzień tygodnia × godzina oraz dzień kalendarzowy.
+
+Koszyki są wyliczane wektorowo arytmetyką całkowitą na wartościach datetime64
+(nanosekundy od epoki: godzina = ns // 3600·10⁹ mod 24, dzień = ns // 86400·10⁹,
+dzień tygodnia = (dzień + 3) mod 7), a wartości kumulowane przez `np.bincount`
+w gęstych tablicach numpy. Tablice mają stały rozmiar (24, 7, 168 koszyków; dni – zakres
+od najwcześniejszego do najpóźniejszego dnia), więc `TimeRollup` z chunków i procesów
+roboczych łączy się zwykłym dodawaniem.
+
+Wynik zapisywany jest do zwięzłego pliku CSV (`write_time_rollups`), który odczytują
+wizualizacje i aplikacja Streamlit (`load_time_rollups`).
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+# Metryki sumowane w koszykach czasowych
+ROLLUP_METRICS = ["fare_amount", "tip_amount", "trip_distance", "total_amount"]
+
+# Koszyki o stałej liczbie przedziałów
+FIXED_BUCKETS = {"hour": 24, "weekday": 7, "weekday_hour": 7 * 24}
+
+# Kolejność ziarnistości w pliku wynikowym
+GRANULARITIES = ["hour", "weekday", "weekday_hour", "day"]
+
+# Skróty nazw dni tygodnia (poniedziałek = 0)
+WEEKDAY_NAMES = ["pon", "wt", "śr", "czw", "pt", "sob", "ndz"]
+
+NS_PER_HOUR = 3_600 * 10 ** 9
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+# 1970-01-01 był czwartkiem (poniedziałek = 0)
+_EPOCH_WEEKDAY = 3
+
+
+def pickup_buckets(timestamps: pd.Series) -> dict[str, np.ndarray]:
+    """
+    Wyznacza koszyki czasowe dla znaczników czasu (braki są pomijane).
+
+    Args:
+        timestamps (pd.Series): Kolumna datetime (np. `tpep_pickup_datetime`).
+
+    Returns:
+        dict[str, np.ndarray]: Indeksy koszyków "hour", "weekday", "weekday_hour", "day"
+        (numer dnia od epoki) oraz maska "valid" wierszy z poprawnym czasem.
+    """
+    values = timestamps.to_numpy(dtype="datetime64[ns]")
+    valid = ~np.isnat(values)
+    ns = values[valid].view(np.int64)
+    day = ns // NS_PER_DAY
+    hour = (ns // NS_PER_HOUR) % 24
+    weekday = (day + _EPOCH_WEEKDAY) % 7
+    return {"hour": hour, "weekday": weekday, "weekday_hour": weekday * 24 + hour, "day": day, "valid": valid}
+
+
+class TimeRollup:
+    """
+    Mergowalne agregaty przejazdów w koszykach czasowych, przechowywane w gęstych tablicach.
+
+    Każda ziarnistość to tablica (1 + 2·m) × liczba koszyków: liczba kursów, sumy m metryk
+    i liczby niepustych wartości metryk (mianowniki średnich).
+    """
+
+    def __init__(self, metrics: list[str] | None = None):
+        """
+        Args:
+            metrics (list[str] | None): Sumowane metryki (domyślnie ROLLUP_METRICS).
+        """
+        self.metrics = list(ROLLUP_METRICS if metrics is None else metrics)
+        rows = 1 + 2 * len(self.metrics)
+        self.bins = {name: np.zeros((rows, size)) for name, size in FIXED_BUCKETS.items()}
+        self.day_origin = 0
+        self.days = np.zeros((rows, 0))
+
+    @property
+    def trips(self) -> int:
+        """
+        Returns:
+            int: Liczba kursów z poprawnym czasem odbioru.
+        """
+        return int(self.bins["hour"][0].sum())
+
+    def add(self, df: pd.DataFrame, time_column: str = "tpep_pickup_datetime") -> "TimeRollup":
+        """
+        Dodaje przejazdy z chunku (brakujące metryki są traktowane jak puste).
+
+        Args:
+            df (pd.DataFrame): Fragment danych.
+            time_column (str): Kolumna czasu, według której przejazdy trafiają do koszyków.
+
+        Returns:
+            TimeRollup: Ten obiekt.
+        """
+        if time_column not in df.columns or len(df) == 0:
+            return self
+
+        buckets = pickup_buckets(df[time_column])
+        valid = buckets["valid"]
+        weights = [np.ones(int(valid.sum()))]
+        present = []
+        for metric in self.metrics:
+            values = df[metric].to_numpy(dtype=np.float64, na_value=np.nan)[valid] \
+                if metric in df.columns else np.full(len(weights[0]), np.nan)
+            notna = ~np.isnan(values)
+            weights.append(np.where(notna, values, 0.0))
+            present.append(notna.astype(np.float64))
+        weights.extend(present)
+
+        for name, size in FIXED_BUCKETS.items():
+            self.bins[name] += _accumulate(buckets[name], weights, size)
+
+        days = buckets["day"]
+        if len(days):
+            self._cover_days(int(days.min()), int(days.max()))
+            self.days += _accumulate(days - self.day_origin, weights, self.days.shape[1])
+        return self
+
+    def merge(self, other: "TimeRollup") -> "TimeRollup":
+        """
+        Dołącza agregaty innego fragmentu danych.
+
+        Args:
+            other (TimeRollup): Agregaty o tych samych metrykach.
+
+        Returns:
+            TimeRollup: Ten obiekt (po scaleniu).
+        """
+        if other.metrics != self.metrics:
+            raise ValueError("Nie można łączyć agregatów czasowych o różnych metrykach")
+        for name in self.bins:
+            self.bins[name] += other.bins[name]
+        if other.days.shape[1]:
+            self._cover_days(other.day_origin, other.day_origin + other.days.shape[1] - 1)
+            start = other.day_origin - self.day_origin
+            self.days[:, start:start + other.days.shape[1]] += other.days
+        return self
+
+    def _cover_days(self, first: int, last: int) -> None:
+        """
+        Rozszerza tablicę dni tak, by obejmowała dni `first`–`last` (numery dni od epoki).
+        """
+        if not self.days.shape[1]:
+            self.day_origin = first
+            self.days = np.zeros((self.days.shape[0], last - first + 1))
+            return
+        end = self.day_origin + self.days.shape[1] - 1
+        before, after = max(self.day_origin - first, 0), max(last - end, 0)
+        if before or after:
+            self.days = np.pad(self.days, ((0, 0), (before, after)))
+            self.day_origin -= before
+
+    def frames(self) -> dict[str, pd.DataFrame]:
+        """
+        Zestawia agregaty w tabele: kolumna "trips" oraz suma i średnia każdej metryki.
+
+        Returns:
+            dict[str, pd.DataFrame]: Ziarnistość → tabela (dni – tylko dni z kursami).
+        """
+        frames = {name: self._frame(array) for name, array in self.bins.items()}
+        frames["hour"].index.name = "hour"
+        frames["weekday"].index.name = "weekday"
+        frames["weekday_hour"].index = pd.MultiIndex.from_product(
+            [range(7), range(24)], names=["weekday", "hour"]
+        )
+        days = self._frame(self.days)
+        days.index = pd.DatetimeIndex(pd.to_datetime(self.day_origin + days.index, unit="D"), name="day")
+        frames["day"] = days[days["trips"] > 0]
+        return frames
+
+    def _frame(self, array: np.ndarray) -> pd.DataFrame:
+        m = len(self.metrics)
+        frame = pd.DataFrame({"trips": array[0].astype(np.int64)})
+        for position, metric in enumerate(self.metrics):
+            total, count = array[1 + position], array[1 + m + position]
+            frame[f"{metric}_sum"] = total
+            frame[f"{metric}_mean"] = np.divide(total, count, out=np.full_like(total, np.nan), where=count > 0)
+        return frame
+
+
+def _accumulate(indices: np.ndarray, weights: list[np.ndarray], size: int) -> np.ndarray:
+    """
+    Sumuje wagi w koszykach (np.bincount) – jeden wiersz wyniku na wektor wag.
+    """
+    return np.vstack([np.bincount(indices, weights=w, minlength=size) for w in weights])
+
+
+def write_time_rollups(rollup: TimeRollup | None, output_path="data/output/time_rollups.csv") -> None:
+    """
+    Zapisuje agregaty czasowe do jednego pliku CSV w układzie długim
+    (kolumny: granularity, bucket, trips, <metryka>_sum, <metryka>_mean).
+
+    Koszyk dnia tygodnia × godziny zapisywany jest jako "dzień-godzina" (np. "0-08"),
+    a dzień jako data ISO.
+
+    Args:
+        rollup (TimeRollup | None): Połączone agregaty.
+        output_path (str): Ścieżka zapisu pliku.
+    """
+    if rollup is None or not rollup.trips:
+        return
+
+    parts = []
+    for name, frame in rollup.frames().items():
+        if name == "weekday_hour":
+            buckets = [f"{weekday}-{hour:02d}" for weekday, hour in frame.index]
+        elif name == "day":
+            buckets = frame.index.strftime("%Y-%m-%d")
+        else:
+            buckets = frame.index.astype(str)
+        parts.append(frame.reset_index(drop=True).assign(granularity=name, bucket=list(buckets)))
+
+    table = pd.concat(parts, ignore_index=True)
+    table = table[["granularity", "bucket", *[c for c in table.columns if c not in ("granularity", "bucket")]]]
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    table.to_csv(output_path, index=False, float_format="%.4f")
+
+
+def load_time_rollups(path: str = "data/output/time_rollups.csv") -> dict[str, pd.DataFrame]:
+    """
+    Wczytuje agregaty czasowe zapisane przez write_time_rollups.
+
+    Args:
+        path (str): Ścieżka pliku CSV.
+
+    Returns:
+        dict[str, pd.DataFrame]: Ziarnistość → tabela (indeks: godzina, dzień tygodnia,
+        para (dzień tygodnia, godzina) lub data); pusty słownik, gdy pliku brak.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    table = pd.read_csv(path, dtype={"bucket": str})
+    frames = {}
+    for name in GRANULARITIES:
+        frame = table[table["granularity"] == name].drop(columns="granularity")
+        if frame.empty:
+            continue
+        buckets = frame.pop("bucket")
+        if name == "weekday_hour":
+            parts = buckets.str.split("-", expand=True).astype(int)
+            frame.index = pd.MultiIndex.from_arrays([parts[0], parts[1]], names=["weekday", "hour"])
+        elif name == "day":
+            frame.index = pd.DatetimeIndex(pd.to_datetime(buckets), name="day")
+        else:
+            frame.index = pd.Index(buckets.astype(int), name=name)
+        frames[name] = frame
+    return frames
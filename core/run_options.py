@@ -0,0 +1,169 @@
+"""
+run_options.py
+
+Opcje przebiegu analizy równoległej i wspólne przygotowanie pracy w puli procesów.
+
+`AnalysisOptions` zbiera parametry przebiegu (rozmiar chunków, budżet pamięci, deduplikacja,
+walidacja, transport, podział pracy, szkice, checkpointy), a `prepare_run` wyznacza z nich
+to, co jest wspólne dla każdej analizy w puli procesów: pliki wejściowe, liczbę procesów,
+rozmiar zadania, limit zadań w toku i indeks deduplikacji.
+"""
+
+import copy
+from multiprocessing import cpu_count
+from core.cardinality import DEFAULT_PRECISION
+from core.chunk_sizing import rows_for_budget, rows_per_task
+from core.dedup import HashIndex
+from core.dispatch import IN_FLIGHT_PER_WORKER
+from core.groupby import GroupBy
+from core.loader import resolve_parquet_files
+from core.metadata import get_row_count
+from core.quantiles import DEFAULT_K
+from core.schema import TAXI_DTYPES
+from core.transport import prepare_transport
+
+
+class AnalysisOptions:
+    """
+    Parametry przebiegu analizy równoległej (core.pool_processor.parallel_analysis;
+    core.analyzer.parallel_analysis korzysta z części z nich).
+    """
+
+    def __init__(
+        self,
+        chunksize: int = 100_000,
+        low_memory: bool = False,
+        memory_budget: str | int | None = None,
+        deduplicate: bool = True,
+        validate: bool = False,
+        collect_stats: bool = True,
+        transport: str = "pickle",
+        dispatch: str = "chunks",
+        max_in_flight: int | None = None,
+        sketch_k: int = DEFAULT_K,
+        hll_precision: int = DEFAULT_PRECISION,
+        groupings: dict[str, GroupBy] | None = None,
+        checkpoint_dir: str | None = None
+    ):
+        """
+        Args:
+            chunksize (int): Liczba wierszy na chunk (i na jednostkę checkpointu).
+            low_memory (bool): Odczyt przez mmap i konwersja Arrow → pandas bez zbędnych kopii.
+            memory_budget (str | int | None): Budżet pamięci (np. "256 MB" na chunk lub "60%" RAM
+                dla wszystkich procesów); jeśli podany, zastępuje `chunksize` przy odczycie.
+            deduplicate (bool): Czy usuwać duplikaty wierszy w obrębie całego zbioru.
+            validate (bool): Czy walidować dane w procesach roboczych przed analizą.
+            collect_stats (bool): Czy zapisać statystyki walidacji (`validation_stats.json`).
+            transport (str): Sposób przekazania chunków: "pickle" lub "shm" (pamięć współdzielona).
+            dispatch (str): Podział pracy: "chunks" (dekodowanie w procesie głównym) lub
+                "row_groups" (dekodowanie w procesach roboczych).
+            max_in_flight (int | None): Maksymalna liczba zadań w toku (domyślnie
+                IN_FLIGHT_PER_WORKER na proces).
+            sketch_k (int): Parametr k szkiców KLL przybliżonych kwantyli.
+            hll_precision (int): Precyzja szkiców HyperLogLog liczności stref.
+            groupings (dict[str, GroupBy] | None): Raporty grupowane (domyślnie GROUP_REPORTS).
+            checkpoint_dir (str | None): Katalog checkpointów wznawialnego przebiegu.
+        """
+        self.chunksize = chunksize
+        self.low_memory = low_memory
+        self.memory_budget = memory_budget
+        self.deduplicate = deduplicate
+        self.validate = validate
+        self.collect_stats = collect_stats
+        self.transport = transport
+        self.dispatch = dispatch
+        self.max_in_flight = max_in_flight
+        self.sketch_k = sketch_k
+        self.hll_precision = hll_precision
+        self.groupings = groupings
+        self.checkpoint_dir = checkpoint_dir
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in vars(self).items())
+        return f"AnalysisOptions({fields})"
+
+    def replace(self, **changes) -> "AnalysisOptions":
+        """
+        Zwraca kopię opcji ze zmienionymi polami.
+
+        Args:
+            **changes: Nowe wartości opcji.
+
+        Returns:
+            AnalysisOptions: Kopia opcji.
+
+        Raises:
+            TypeError: Nieznana nazwa opcji.
+        """
+        options = copy.copy(self)
+        for name, value in changes.items():
+            if name not in vars(options):
+                raise TypeError(f"Nieznana opcja analizy: {name}")
+            setattr(options, name, value)
+        return options
+
+
+class PoolRun:
+    """
+    Wspólne parametry przebiegu w puli procesów wyznaczone przez `prepare_run`.
+    """
+
+    def __init__(
+        self,
+        files: list[str],
+        workers: int,
+        total_rows: int,
+        chunksize: int,
+        max_in_flight: int,
+        index: HashIndex | None
+    ):
+        """
+        Args:
+            files (list[str]): Pliki wejściowe.
+            workers (int): Liczba procesów roboczych.
+            total_rows (int): Liczba wierszy zbioru (z metadanych Parquet).
+            chunksize (int): Liczba wierszy na zadanie.
+            max_in_flight (int): Maksymalna liczba zadań w toku.
+            index (HashIndex | None): Indeks globalnej deduplikacji (None – bez deduplikacji).
+        """
+        self.files = files
+        self.workers = workers
+        self.total_rows = total_rows
+        self.chunksize = chunksize
+        self.max_in_flight = max_in_flight
+        self.index = index
+
+
+def prepare_run(path: str, options: AnalysisOptions) -> PoolRun:
+    """
+    Przygotowuje przebieg analizy w puli procesów.
+
+    Sprawdza transport, wyznacza pliki wejściowe i liczbę procesów, rozmiar zadania
+    (z budżetu pamięci, jeśli podany, i z liczby wierszy – każdy proces dostaje kilka zadań),
+    limit zadań w toku oraz tworzy indeks deduplikacji.
+
+    Args:
+        path (str): Ścieżka do pliku .parquet, katalogu lub wzorzec glob.
+        options (AnalysisOptions): Opcje przebiegu.
+
+    Returns:
+        PoolRun: Parametry przebiegu.
+
+    Raises:
+        ValueError: Nieznany sposób przekazania chunków.
+    """
+    prepare_transport(options.transport)
+    files = resolve_parquet_files(path)
+    workers = cpu_count()
+    chunksize = options.chunksize
+    if options.memory_budget is not None:
+        chunksize = rows_for_budget(path, options.memory_budget, dtypes=TAXI_DTYPES, concurrent_chunks=workers)
+    total_rows = get_row_count(path)
+    return PoolRun(
+        files=files,
+        workers=workers,
+        total_rows=total_rows,
+        chunksize=rows_per_task(total_rows, chunksize, workers),
+        max_in_flight=options.max_in_flight or workers * IN_FLIGHT_PER_WORKER,
+        index=HashIndex() if options.deduplicate else None
+    )
@@ -2,38 +2,74 @@
 sample_loader.py
 
 Moduł odpowiedzialny za załadowanie niewielkiej próbki danych z pliku .parquet
-(np. do testów, eksploracji, wykresów). Próbka pochodzi z pierwszych kilku chunków
-i jest czyszczona za pomocą clean_data.
+(np. do testów, eksploracji, wykresów). Próbka jest losowana z całego zbioru danych
+(losowe grupy wierszy + losowanie rezerwuarowe, opcjonalnie warstwowe – patrz core.sampling)
+i czyszczona za pomocą clean_data.
 """
 
 import pandas as pd
 from decorators.timer import measure_time
 from decorators.counter import count_calls
 from core.cleaner import clean_data
-from core.loader import load_parquet_in_chunks
+from core.loader import load_row_groups
+from core.logger import logger
+from core.schema import TAXI_DTYPES
+from core.chunk_sizing import AdaptiveChunkSizer
+from core.sampling import StratifiedReservoir, select_row_groups
+
+# Ile razy więcej wierszy niż rozmiar próbki odczytać (zapas na wiersze odrzucone przez walidację)
+OVERSAMPLING = 2
 
 @measure_time
 @count_calls
-def load_sample_for_visualization(path: str, chunksize: int = 100_000, max_chunks: int = 2) -> pd.DataFrame:
+def load_sample_for_visualization(
+    path: str,
+    sample_size: int = 200_000,
+    stratify_by: str | None = None,
+    allocation: str = "proportional",
+    seed: int | None = 42,
+    chunksize: int = 100_000,
+    memory_budget: str | int | None = None
+) -> pd.DataFrame:
     """
-    Ładuje i oczyszcza dane z pierwszych N chunków jako próbkę do wizualizacji.
+    Losuje i oczyszcza próbkę danych do wizualizacji.
+
+    Grupy wierszy są losowane z całego zbioru danych (a nie brane od początku pliku),
+    a z oczyszczonych wierszy wybierana jest próbka losowa o rozmiarze `sample_size`.
 
     Args:
-        path (str): Ścieżka do pliku .parquet.
+        path (str): Ścieżka do pliku .parquet, katalogu lub wzorzec glob.
+        sample_size (int): Docelowa liczba wierszy w próbce.
+        stratify_by (str | None): Warstwowanie próbki, np. "pickup_hour" lub "VendorID".
+        allocation (str): Alokacja warstw – "proportional" lub "equal".
+        seed (int | None): Ziarno losowania (ta sama wartość daje tę samą próbkę).
         chunksize (int): Liczba wierszy na chunk.
-        max_chunks (int): Maksymalna liczba chunków do załadowania.
+        memory_budget (str | int | None): Budżet pamięci na chunk (np. "256 MB"); jeśli podany,
+            zastępuje `chunksize`, a rozmiar jest korygowany według RSS mierzonego w clean_data.
 
     Returns:
-        pd.DataFrame: Połączona i oczyszczona próbka danych.
+        pd.DataFrame: Oczyszczona próbka danych.
     """
-    chunks = []
-    for i, chunk in enumerate(load_parquet_in_chunks(path, chunksize=chunksize)):
-        cleaned = clean_data(chunk)
-        chunks.append(cleaned)
-        if i + 1 >= max_chunks:
-            break
+    sizer = None
+    if memory_budget is not None:
+        sizer = AdaptiveChunkSizer(path, memory_budget, dtypes=TAXI_DTYPES)
+        chunksize = sizer
+
+    try:
+        selected = select_row_groups(path, sample_size * OVERSAMPLING, seed=seed)
+        reservoir = StratifiedReservoir(sample_size, stratify_by, allocation, seed=seed)
+    except Exception as e:
+        logger.error(f"[Sampling] Błąd podczas przygotowania próbki z {path}: {e}")
+        return pd.DataFrame()
 
-    if not chunks:
-        return pd.DataFrame()  # fallback na pusty DataFrame
+    logger.info(f"[Sampling] Wylosowano {len(selected)} grup wierszy z {path}")
+    for file_path, rg in selected:
+        for chunk in load_row_groups(file_path, [rg], chunksize=chunksize, dtypes=TAXI_DTYPES):
+            reservoir.add(clean_data(chunk, sizer=sizer))
 
-    return pd.concat(chunks, ignore_index=True)
+    sample = reservoir.result()
+    logger.info(
+        f"[Sampling] Próbka: {len(sample)} z {reservoir.rows_seen} poprawnych wierszy"
+        + (f", warstwy wg {stratify_by}: {len(reservoir.stratum_counts)}" if stratify_by else "")
+    )
+    return sample
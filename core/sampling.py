@@ -0,0 +1,219 @@
+"""
+sampling.py
+
+Silnik losowania próbek z dużych zbiorów Parquet na potrzeby wizualizacji.
+
+Zamiast brać pierwsze chunki pliku (w plikach posortowanych po czasie daje to próbkę
+z pierwszych dni miesiąca), silnik:
+- losuje grupy wierszy z całego zbioru danych (select_row_groups),
+- wewnątrz nich wykonuje losowanie rezerwuarowe z kluczami priorytetowymi
+  (StratifiedReservoir) – opcjonalnie warstwowe, np. po godzinie odbioru lub VendorID.
+
+Wyniki są powtarzalne dla ustalonego ziarna (`seed`).
+"""
+
+import math
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from core.loader import resolve_parquet_files
+
+# Zapas przy trybie proporcjonalnym – ile razy więcej wierszy niż oczekiwany udział przechowywać
+PROPORTIONAL_SLACK = 1.5
+
+# Minimalna liczba wierszy przechowywana dla każdej warstwy (chroni małe warstwy)
+MIN_PER_STRATUM = 50
+
+# Warstwy wyliczane z kolumn danych
+DERIVED_STRATA = {
+    "pickup_hour": lambda df: df["tpep_pickup_datetime"].dt.hour,
+    "pickup_weekday": lambda df: df["tpep_pickup_datetime"].dt.weekday,
+    "pickup_date": lambda df: df["tpep_pickup_datetime"].dt.date,
+}
+
+
+def stratum_keys(df: pd.DataFrame, stratify_by: str) -> pd.Series:
+    """
+    Wyznacza klucz warstwy dla każdego wiersza.
+
+    Args:
+        df (pd.DataFrame): Dane.
+        stratify_by (str): Nazwa kolumny (np. "VendorID") lub warstwy pochodnej
+            ("pickup_hour", "pickup_weekday", "pickup_date").
+
+    Returns:
+        pd.Series: Klucz warstwy dla każdego wiersza.
+    """
+    if stratify_by in DERIVED_STRATA:
+        return DERIVED_STRATA[stratify_by](df)
+    return df[stratify_by]
+
+
+def select_row_groups(
+    path: str,
+    target_rows: int,
+    seed: int | None = None,
+    min_row_groups: int = 8
+) -> list[tuple[str, int]]:
+    """
+    Losuje grupy wierszy (bez zwracania) z całego zbioru danych na podstawie metadanych.
+
+    Grupy są dobierane w losowej kolejności, dopóki ich łączna liczba wierszy nie osiągnie
+    `target_rows` i nie zostanie wybranych co najmniej `min_row_groups` grup (o ile istnieją).
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+        target_rows (int): Minimalna łączna liczba wierszy w wybranych grupach.
+        seed (int | None): Ziarno generatora losowego.
+        min_row_groups (int): Minimalna liczba wybranych grup (dla lepszego pokrycia zbioru).
+
+    Returns:
+        list[tuple[str, int]]: Pary (ścieżka pliku, numer grupy wierszy) w kolejności w zbiorze.
+    """
+    row_groups = []
+    for file_path in resolve_parquet_files(path):
+        with pq.ParquetFile(file_path) as parquet_file:
+            metadata = parquet_file.metadata
+        for rg in range(metadata.num_row_groups):
+            num_rows = metadata.row_group(rg).num_rows
+            if num_rows > 0:
+                row_groups.append((file_path, rg, num_rows))
+
+    rng = np.random.default_rng(seed)
+    selected = []
+    selected_rows = 0
+    for idx in rng.permutation(len(row_groups)):
+        if selected_rows >= target_rows and len(selected) >= min_row_groups:
+            break
+        selected.append(int(idx))
+        selected_rows += row_groups[idx][2]
+
+    return [row_groups[idx][:2] for idx in sorted(selected)]
+
+
+class StratifiedReservoir:
+    """
+    Losowanie rezerwuarowe (opcjonalnie warstwowe) o stałej pamięci.
+
+    Każdy wiersz otrzymuje losowy klucz z U(0, 1); próbka to wiersze o najmniejszych kluczach,
+    co daje losowanie bez zwracania, niezależne od kolejności i podziału danych na chunki.
+
+    Tryby alokacji dla warstw:
+    - "proportional": liczność warstwy proporcjonalna do jej udziału w danych,
+    - "equal": każda warstwa otrzymuje tyle samo wierszy (o ile ma ich dość).
+
+    Bez warstw (`stratify_by=None`) wynik jest dokładną próbką prostą o rozmiarze `sample_size`.
+    W trybie proporcjonalnym bardzo małe warstwy mogą otrzymać nieco mniej wierszy niż
+    wynikałoby z alokacji – rezerwuar przechowuje wtedy wszystkie dostępne.
+    """
+
+    def __init__(
+        self,
+        sample_size: int,
+        stratify_by: str | None = None,
+        allocation: str = "proportional",
+        seed: int | None = None
+    ):
+        """
+        Args:
+            sample_size (int): Docelowy rozmiar próbki.
+            stratify_by (str | None): Kolumna lub warstwa pochodna (patrz `stratum_keys`).
+            allocation (str): "proportional" albo "equal".
+            seed (int | None): Ziarno generatora losowego.
+        """
+        if allocation not in ("proportional", "equal"):
+            raise ValueError(f"Nieznany tryb alokacji: {allocation}")
+        self.sample_size = sample_size
+        self.stratify_by = stratify_by
+        self.allocation = allocation
+        self.rows_seen = 0
+        self.stratum_counts: dict = {}
+        self._rng = np.random.default_rng(seed)
+        self._kept: pd.DataFrame | None = None
+
+    def add(self, df: pd.DataFrame) -> None:
+        """
+        Dodaje chunk danych do rezerwuaru, po czym przycina rezerwuar do limitu.
+
+        Args:
+            df (pd.DataFrame): Chunk danych (już oczyszczony).
+        """
+        if df.empty:
+            return
+
+        df = df.assign(_key=self._rng.random(len(df)))
+        if self.stratify_by is None:
+            df["_stratum"] = 0
+        else:
+            df["_stratum"] = stratum_keys(df, self.stratify_by).to_numpy()
+
+        for stratum, count in df["_stratum"].value_counts(dropna=False).items():
+            self.stratum_counts[stratum] = self.stratum_counts.get(stratum, 0) + int(count)
+        self.rows_seen += len(df)
+
+        kept = df if self._kept is None else pd.concat([self._kept, df], ignore_index=True)
+        self._kept = self._trim(kept)
+
+    def _trim(self, kept: pd.DataFrame) -> pd.DataFrame:
+        """
+        Usuwa wiersze, które na pewno nie trafią do próbki końcowej.
+
+        Args:
+            kept (pd.DataFrame): Rezerwuar z dołączonym nowym chunkiem.
+
+        Returns:
+            pd.DataFrame: Przycięty rezerwuar.
+        """
+        if self.stratify_by is None:
+            if len(kept) <= self.sample_size:
+                return kept
+            keep = np.argpartition(kept["_key"].to_numpy(), self.sample_size - 1)[:self.sample_size]
+            return kept.iloc[np.sort(keep)].reset_index(drop=True)
+
+        rank = kept.groupby("_stratum", dropna=False)["_key"].rank(method="first")
+        if self.allocation == "equal":
+            # Liczba warstw tylko rośnie, więc limit na warstwę tylko maleje
+            per_stratum = math.ceil(self.sample_size / len(self.stratum_counts))
+            mask = rank <= per_stratum
+        else:
+            threshold = PROPORTIONAL_SLACK * self.sample_size / self.rows_seen
+            mask = (kept["_key"] <= threshold) | (rank <= MIN_PER_STRATUM)
+        return kept[mask.to_numpy()].reset_index(drop=True)
+
+    def _allocation(self) -> dict:
+        """
+        Wylicza docelową liczbę wierszy dla każdej warstwy (metoda największych reszt).
+
+        Returns:
+            dict: {warstwa: liczba wierszy}.
+        """
+        strata = list(self.stratum_counts)
+        if self.allocation == "equal":
+            base, extra = divmod(self.sample_size, len(strata))
+            return {s: base + (1 if i < extra else 0) for i, s in enumerate(strata)}
+
+        quotas = {s: self.sample_size * n / self.rows_seen for s, n in self.stratum_counts.items()}
+        allocation = {s: int(q) for s, q in quotas.items()}
+        remaining = self.sample_size - sum(allocation.values())
+        for s in sorted(strata, key=lambda s: quotas[s] - allocation[s], reverse=True)[:remaining]:
+            allocation[s] += 1
+        return allocation
+
+    def result(self) -> pd.DataFrame:
+        """
+        Zwraca próbkę końcową (bez kolumn pomocniczych).
+
+        Returns:
+            pd.DataFrame: Wylosowana próbka (pusty DataFrame, gdy nie dodano danych).
+        """
+        if self._kept is None:
+            return pd.DataFrame()
+
+        kept = self._kept
+        if self.stratify_by is not None and self.rows_seen > self.sample_size:
+            allocation = self._allocation()
+            rank = kept.groupby("_stratum", dropna=False)["_key"].rank(method="first")
+            limit = kept["_stratum"].map(allocation)
+            kept = kept[(rank <= limit).to_numpy()]
+
+        return kept.drop(columns=["_key", "_stratum"]).reset_index(drop=True)
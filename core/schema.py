@@ -0,0 +1,137 @@
+"""
+schema.py
+
+Deklaratywny, kompaktowy schemat typów kolumn danych NYC Yellow Taxi.
+
+Surowe pliki zawierają głównie float64/int64/object. Na potrzeby raportów
+zbiorczych wystarczają znacznie mniejsze typy:
+- passenger_count → Int8 (z obsługą braków),
+- VendorID, payment_type, RatecodeID → category,
+- kwoty pieniężne → float32.
+
+Schemat może być zastosowany już podczas odczytu (na poziomie Arrow – `cast_arrow`,
+`arrow_types_mapper`) albo na gotowym DataFrame (`apply_schema`).
+Sumy kolumn float32 należy liczyć w float64 (`column_sum`), aby nie tracić precyzji.
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from core.logger import logger
+
+TAXI_DTYPES = {
+    "VendorID": "category",
+    "payment_type": "category",
+    "RatecodeID": "category",
+    "passenger_count": "Int8",
+    "fare_amount": "float32",
+    "extra": "float32",
+    "mta_tax": "float32",
+    "tip_amount": "float32",
+    "tolls_amount": "float32",
+    "improvement_surcharge": "float32",
+    "total_amount": "float32",
+    "congestion_surcharge": "float32",
+    "Airport_fee": "float32",
+}
+
+# Odpowiedniki typów pandas po stronie Arrow (poza "category", która jest kodowana słownikowo)
+_ARROW_TYPES = {
+    "Int8": pa.int8(),
+    "float32": pa.float32(),
+}
+
+# Typy Arrow konwertowane do typów pandas z obsługą braków (zamiast float64).
+# W surowych danych nie występują kolumny int8, więc mapowanie dotyczy tylko kolumn ze schematu.
+_PANDAS_TYPES = {
+    pa.int8(): pd.Int8Dtype(),
+}
+
+
+def cast_arrow(data: pa.RecordBatch | pa.Table, dtypes: dict[str, str]) -> pa.RecordBatch | pa.Table:
+    """
+    Rzutuje kolumny paczki rekordów Arrow na typy ze schematu (przed konwersją do pandas).
+
+    Kolumny spoza schematu pozostają bez zmian. Jeśli rzutowanie kolumny się nie powiedzie
+    (np. wartość niecałkowita w kolumnie całkowitej), kolumna zachowuje oryginalny typ.
+
+    Args:
+        data (pa.RecordBatch | pa.Table): Dane do rzutowania.
+        dtypes (dict[str, str]): Schemat w postaci {kolumna: typ pandas}, np. TAXI_DTYPES.
+
+    Returns:
+        pa.RecordBatch | pa.Table: Dane o kompaktowych typach.
+    """
+    arrays = []
+    for name, column in zip(data.schema.names, data.columns):
+        dtype = dtypes.get(name)
+        try:
+            if dtype == "category":
+                column = pc.dictionary_encode(column)
+            elif dtype in _ARROW_TYPES:
+                column = pc.cast(column, _ARROW_TYPES[dtype])
+        except pa.ArrowInvalid as e:
+            logger.warning(f"[Schema] Nie udało się zrzutować kolumny {name} na {dtype}: {e}")
+        arrays.append(column)
+    return type(data).from_arrays(arrays, names=data.schema.names)
+
+
+def arrow_types_mapper(arrow_type: pa.DataType):
+    """
+    Mapowanie typów dla `to_pandas(types_mapper=...)` – kolumny int8 stają się
+    typem pandas Int8 z obsługą braków zamiast float64.
+
+    Args:
+        arrow_type (pa.DataType): Typ kolumny Arrow.
+
+    Returns:
+        pd.api.extensions.ExtensionDtype | None: Typ pandas lub None (domyślna konwersja).
+    """
+    return _PANDAS_TYPES.get(arrow_type)
+
+
+def apply_schema(df: pd.DataFrame, dtypes: dict[str, str] = TAXI_DTYPES) -> pd.DataFrame:
+    """
+    Rzutuje kolumny DataFrame na typy ze schematu (tylko te, które istnieją i mają inny typ).
+
+    Jak w `cast_arrow`: jeśli rzutowanie kolumny się nie powiedzie (np. wartość niecałkowita
+    lub spoza zakresu w kolumnie Int8), kolumna zachowuje oryginalny typ.
+
+    Args:
+        df (pd.DataFrame): Dane wejściowe.
+        dtypes (dict[str, str]): Schemat w postaci {kolumna: typ pandas}.
+
+    Returns:
+        pd.DataFrame: Dane o kompaktowych typach.
+    """
+    to_cast = {
+        col: dtype for col, dtype in dtypes.items()
+        if col in df.columns and str(df[col].dtype) != dtype
+    }
+    if not to_cast:
+        return df
+    try:
+        return df.astype(to_cast)
+    except (TypeError, ValueError):
+        pass
+
+    df = df.copy(deep=False)
+    for col, dtype in to_cast.items():
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[Schema] Nie udało się zrzutować kolumny {col} na {dtype}: {e}")
+    return df
+
+
+def column_sum(series: pd.Series) -> float:
+    """
+    Sumuje kolumnę z akumulatorem float64 (kolumny float32 tracą precyzję przy dużych sumach).
+
+    Args:
+        series (pd.Series): Kolumna do zsumowania.
+
+    Returns:
+        float: Suma wartości (z pominięciem braków).
+    """
+    return series.astype("float64").sum()
@@ -0,0 +1,188 @@
+"""
+transport.py
+
+Przekazywanie chunków do procesów roboczych przez pamięć współdzieloną zamiast pickle.
+
+Chunk jest zapisywany jako strumień Arrow IPC w bloku `multiprocessing.shared_memory`,
+a do procesu roboczego trafia jedynie mały uchwyt (`SharedFrame`: nazwa bloku i rozmiar).
+Proces roboczy kopiuje blok jednym `memcpy` i odtwarza kolumny ze strumienia IPC bez
+deserializacji, więc dane nie przechodzą przez potok (pipe) puli procesów i nie są
+serializowane przez pickle.
+
+Cykl życia bloku:
+- proces główny tworzy blok (`SharedFrame.create`),
+- proces roboczy kopiuje dane z bloku (`SharedFrame.load`) i zamyka swoje mapowanie,
+- proces główny zwalnia blok (`SharedFrame.release`) po otrzymaniu wyniku.
+"""
+
+from multiprocessing import resource_tracker, shared_memory
+import pandas as pd
+import pyarrow as pa
+
+TRANSPORTS = ("pickle", "shm")
+
+
+def prepare_transport(transport: str) -> None:
+    """
+    Sprawdza nazwę transportu i przygotowuje proces główny przed utworzeniem puli procesów.
+
+    Dla "shm" uruchamia resource_tracker, zanim powstaną procesy robocze – dzięki temu
+    dzielą one tracker z procesem głównym i nie zgłaszają bloków jako wycieków.
+
+    Args:
+        transport (str): "pickle" lub "shm".
+
+    Raises:
+        ValueError: Gdy transport jest nieznany.
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Nieznany transport chunków: {transport}")
+    if transport == "shm":
+        resource_tracker.ensure_running()
+
+
+def _write_ipc(table: pa.Table, sink) -> None:
+    """
+    Zapisuje tabelę Arrow jako strumień IPC.
+
+    Args:
+        table (pa.Table): Dane do zapisania.
+        sink: Strumień wyjściowy pyarrow.
+    """
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Otwiera istniejący blok pamięci współdzielonej bez przejmowania odpowiedzialności za jego usunięcie.
+
+    Args:
+        name (str): Nazwa bloku.
+
+    Returns:
+        shared_memory.SharedMemory: Otwarty blok.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: blok jest rejestrowany w resource_tracker także przy otwieraniu;
+        # procesy puli dzielą resource_tracker z procesem głównym, więc rejestracja
+        # jest idempotentna, a wyrejestrowanie następuje przy `release`.
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrame:
+    """
+    Uchwyt do DataFrame zapisanego w pamięci współdzielonej jako strumień Arrow IPC.
+
+    Przy serializacji (np. wysyłce do Pool) przekazywane są tylko nazwa bloku i rozmiar danych.
+    """
+
+    def __init__(self, name: str, size: int, rows: int):
+        """
+        Args:
+            name (str): Nazwa bloku pamięci współdzielonej.
+            size (int): Rozmiar danych w bloku (w bajtach).
+            rows (int): Liczba wierszy chunku.
+        """
+        self.name = name
+        self.size = size
+        self.rows = rows
+        self._shm: shared_memory.SharedMemory | None = None
+
+    def __getstate__(self) -> dict:
+        return {"name": self.name, "size": self.size, "rows": self.rows}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._shm = None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> "SharedFrame":
+        """
+        Zapisuje DataFrame do nowego bloku pamięci współdzielonej (w procesie głównym).
+
+        Args:
+            df (pd.DataFrame): Chunk danych.
+
+        Returns:
+            SharedFrame: Uchwyt do danych; blok należy zwolnić metodą `release`.
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sizer = pa.MockOutputStream()
+        _write_ipc(table, sizer)
+        size = sizer.size()
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            _write_ipc(table, pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf)))
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+        frame = cls(shm.name, size, len(df))
+        frame._shm = shm
+        return frame
+
+    def load(self) -> pd.DataFrame:
+        """
+        Odczytuje DataFrame z bloku pamięci współdzielonej (w procesie roboczym).
+
+        Returns:
+            pd.DataFrame: Chunk danych (kopia niezależna od bloku).
+        """
+        shm = _attach(self.name)
+        try:
+            # Kopia bloku – DataFrame może współdzielić bufory z danymi Arrow,
+            # a mapowania nie da się zamknąć, dopóki istnieją do niego referencje.
+            with shm.buf[:self.size] as view:
+                data = bytes(view)
+        finally:
+            shm.close()
+        return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+    def release(self) -> None:
+        """
+        Zwalnia blok pamięci współdzielonej (w procesie, który go utworzył).
+        """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def unwrap(chunk: pd.DataFrame | SharedFrame) -> pd.DataFrame:
+    """
+    Zwraca DataFrame niezależnie od sposobu przekazania chunku do procesu roboczego.
+
+    Args:
+        chunk (pd.DataFrame | SharedFrame): Chunk lub uchwyt do chunku w pamięci współdzielonej.
+
+    Returns:
+        pd.DataFrame: Chunk danych.
+    """
+    if isinstance(chunk, SharedFrame):
+        return chunk.load()
+    return chunk
+
+
+def share_chunks(chunks, shared: set):
+    """
+    Zapisuje kolejne chunki do pamięci współdzielonej (leniwie – po jednym na żądanie).
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Chunki danych.
+        shared (set): Zbiór utworzonych uchwytów; wywołujący zwalnia je po otrzymaniu wyników.
+
+    Yields:
+        SharedFrame: Uchwyt do kolejnego chunku.
+    """
+    for chunk in chunks:
+        frame = SharedFrame.create(chunk)
+        shared.add(frame)
+        yield frame
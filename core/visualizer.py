@@ -6,6 +6,7 @@ Moduł odpowiedzialny za tworzenie wizualizacji danych z NYC Taxi.
 Zawiera funkcje:
 - visualize_data: generuje i zapisuje 5 typów wykresów analitycznych na podstawie danych wejściowych
 - plot_memory_usage: rysuje wykres zużycia pamięci RAM na podstawie pliku .memlog
+- plot_time_rollups: rysuje rozkłady kursów w czasie z agregatów czasowych (time_rollups.csv)
 
 Wszystkie wykresy zapisywane są do folderu 'data/output'.
 """
@@ -14,6 +15,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 
+from core.rollups import WEEKDAY_NAMES, load_time_rollups
+from core.schema import apply_schema
 from decorators.counter import count_calls
 from decorators.timer import measure_time
 
@@ -37,6 +40,7 @@ def visualize_data(df):
         df (pandas.DataFrame): Oczyszczony DataFrame z danymi NYC Taxi.
     """
     os.makedirs("data/output", exist_ok=True)
+    df = apply_schema(df)
 
     # Histogram długości trasy (do 30 mil)
     filtered_df = df[df["trip_distance"] <= 30]
@@ -129,3 +133,78 @@ def plot_memory_usage(memlog_path: str):
     plt.tight_layout()
     plt.savefig("data/output/memory_usage_plot.png")
     plt.show()
+
+
+@count_calls
+@measure_time
+def plot_time_rollups(rollups_path: str = "data/output/time_rollups.csv"):
+    """
+    Tworzy wykresy rozkładu kursów w czasie na podstawie agregatów czasowych
+    z analizy równoległej (cały zbiór danych, bez próbkowania).
+
+    Generowane są:
+    1. Liczba kursów i średnia opłata per godzina odbioru
+    2. Liczba kursów per dzień tygodnia
+    3. Heatmapa: liczba kursów per dzień tygodnia i godzina
+    4. Liczba kursów per dzień
+
+    Args:
+        rollups_path (str): Ścieżka do pliku time_rollups.csv.
+    """
+    rollups = load_time_rollups(rollups_path)
+    if not rollups:
+        print(f"[Visualizer] Brak agregatów czasowych: {rollups_path}")
+        return
+    os.makedirs("data/output", exist_ok=True)
+
+    # Kursy i średnia opłata per godzina
+    hourly = rollups["hour"]
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(hourly.index, hourly["trips"], color="skyblue", edgecolor="black")
+    ax.set_xlabel("Godzina odbioru")
+    ax.set_ylabel("Liczba kursów")
+    fare_ax = ax.twinx()
+    fare_ax.plot(hourly.index, hourly["fare_amount_mean"], color="darkred", marker="o")
+    fare_ax.set_ylabel("Średnia opłata ($)")
+    plt.title("Liczba kursów i średnia opłata względem godziny odbioru")
+    plt.tight_layout()
+    plt.savefig("data/output/trips_by_hour.png")
+    plt.close()
+
+    # Kursy per dzień tygodnia
+    weekly = rollups["weekday"]
+    plt.figure(figsize=(10, 6))
+    plt.bar([WEEKDAY_NAMES[d] for d in weekly.index], weekly["trips"], color="skyblue", edgecolor="black")
+    plt.title("Liczba kursów względem dnia tygodnia")
+    plt.xlabel("Dzień tygodnia")
+    plt.ylabel("Liczba kursów")
+    plt.tight_layout()
+    plt.savefig("data/output/trips_by_weekday.png")
+    plt.close()
+
+    # Heatmapa: dzień tygodnia × godzina
+    pivot = rollups["weekday_hour"]["trips"].unstack("hour")
+    pivot.index = [WEEKDAY_NAMES[d] for d in pivot.index]
+    plt.figure(figsize=(14, 5))
+    sns.heatmap(pivot, cmap="YlGnBu")
+    plt.title("Liczba kursów: dzień tygodnia × godzina odbioru")
+    plt.xlabel("Godzina odbioru")
+    plt.ylabel("Dzień tygodnia")
+    plt.tight_layout()
+    plt.savefig("data/output/trips_weekday_hour_heatmap.png")
+    plt.close()
+
+    # Kursy per dzień
+    daily = rollups.get("day")
+    if daily is not None:
+        plt.figure(figsize=(12, 6))
+        plt.plot(daily.index, daily["trips"], color="green", marker=".")
+        plt.title("Liczba kursów per dzień")
+        plt.xlabel("Dzień")
+        plt.ylabel("Liczba kursów")
+        plt.grid(True)
+        plt.tight_layout()
+        plt.savefig("data/output/trips_by_day.png")
+        plt.close()
+
+    print("[Visualizer] Wykresy czasowe zapisane do folderu: data/output/")
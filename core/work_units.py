@@ -0,0 +1,168 @@
+"""
+work_units.py
+
+Jednostki pracy adresowane grupami wierszy Parquet (zamiast gotowych DataFrame'ów).
+
+Proces główny planuje pracę wyłącznie na podstawie metadanych plików (`plan_work_units`)
+i wysyła do procesów roboczych małe deskryptory `WorkUnit` (plik, zakres grup wierszy,
+kolumny). Każdy proces roboczy sam otwiera plik i dekoduje tylko swój fragment
+(`load_work_unit`), więc dekodowanie jest rozłożone na wszystkie rdzenie, a proces główny
+nie trzyma danych w pamięci. Deskryptory są niezależne od procesu, który je wykona.
+
+Globalna deduplikacja wymaga wtedy dwóch przebiegów: procesy robocze zwracają odciski
+wierszy swoich jednostek (`unit_fingerprints`), proces główny wyznacza z nich w kolejności
+zbioru maski pierwszych wystąpień (`WorkUnit.set_keep_mask`, 1 bit na wiersz), a drugi
+przebieg pomija wiersze spoza maski.
+"""
+
+import numpy as np
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from core.dedup import row_fingerprints
+from core.loader import load_row_groups, resolve_parquet_files
+
+
+class WorkUnit:
+    """
+    Deskryptor fragmentu danych: plik Parquet, kolejne grupy wierszy i kolumny do odczytu.
+
+    Opcjonalna maska `keep` (spakowana bitowo) wskazuje wiersze pozostawione po globalnej
+    deduplikacji – w kolejności wierszy odczytywanych z jednostki (po filtrze pushdown).
+    """
+
+    def __init__(self, file_path: str, row_groups: list[int], num_rows: int, columns: list[str] | None = None):
+        """
+        Args:
+            file_path (str): Ścieżka do pliku Parquet.
+            row_groups (list[int]): Numery grup wierszy należących do jednostki.
+            num_rows (int): Liczba wierszy w grupach (wg metadanych).
+            columns (list[str] | None): Kolumny do odczytu (domyślnie wszystkie).
+        """
+        self.file_path = file_path
+        self.row_groups = row_groups
+        self.num_rows = num_rows
+        self.columns = columns
+        self.keep = None
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __repr__(self) -> str:
+        return f"WorkUnit({self.file_path!r}, row_groups={self.row_groups}, rows={self.num_rows})"
+
+    def set_keep_mask(self, mask: np.ndarray) -> None:
+        """
+        Zapisuje maskę wierszy do zachowania (pełna maska jest pomijana – nic do usunięcia).
+
+        Args:
+            mask (np.ndarray): Maska bool w kolejności odczytu wierszy jednostki.
+        """
+        self.keep = None if mask.all() else (np.packbits(mask), len(mask))
+
+    def keep_mask(self) -> np.ndarray | None:
+        """
+        Returns:
+            np.ndarray | None: Maska bool wierszy do zachowania lub None (wszystkie wiersze).
+        """
+        if self.keep is None:
+            return None
+        packed, length = self.keep
+        return np.unpackbits(packed, count=length).astype(bool)
+
+
+def plan_work_units(path: str, rows_per_unit: int, columns: list[str] | None = None) -> list[WorkUnit]:
+    """
+    Dzieli zbiór danych na jednostki pracy z kolejnych grup wierszy (tylko metadane, bez dekodowania).
+
+    Kolejne grupy wierszy pliku są łączone, dopóki jednostka nie osiągnie `rows_per_unit`
+    wierszy; grupa większa od limitu tworzy osobną jednostkę. Jednostki nie przekraczają
+    granic plików.
+
+    Args:
+        path (str): Ścieżka do pliku Parquet, katalogu lub wzorzec glob.
+        rows_per_unit (int): Docelowa liczba wierszy na jednostkę.
+        columns (list[str] | None): Kolumny do odczytu przez procesy robocze.
+
+    Returns:
+        list[WorkUnit]: Jednostki pracy w kolejności w zbiorze danych.
+    """
+    units = []
+    for file_path in resolve_parquet_files(path):
+        with pq.ParquetFile(file_path) as parquet_file:
+            metadata = parquet_file.metadata
+        row_groups, num_rows = [], 0
+        for rg in range(metadata.num_row_groups):
+            rg_rows = metadata.row_group(rg).num_rows
+            if rg_rows == 0:
+                continue
+            if row_groups and num_rows + rg_rows > rows_per_unit:
+                units.append(WorkUnit(file_path, row_groups, num_rows, columns))
+                row_groups, num_rows = [], 0
+            row_groups.append(rg)
+            num_rows += rg_rows
+        if row_groups:
+            units.append(WorkUnit(file_path, row_groups, num_rows, columns))
+    return units
+
+
+def load_work_unit(
+    unit: WorkUnit,
+    chunksize: int = 100_000,
+    low_memory: bool = False,
+    dtypes: dict[str, str] | None = None,
+    filters: pc.Expression | None = None
+):
+    """
+    Generator wczytujący dane jednostki pracy w chunkach (w procesie roboczym).
+
+    Jeśli jednostka ma maskę deduplikacji, zwracane są tylko wiersze z maski. Błąd odczytu
+    jest zgłaszany (a nie pomijany), więc niepełna jednostka nie zostanie uznana za ukończoną.
+
+    Args:
+        unit (WorkUnit): Jednostka pracy.
+        chunksize (int): Liczba wierszy na chunk.
+        low_memory (bool): Odczyt przez mmap i konwersja bez zbędnych kopii.
+        dtypes (dict[str, str] | None): Schemat typów stosowany podczas odczytu.
+        filters (pc.Expression | None): Filtr predicate pushdown (opcjonalnie).
+
+    Yields:
+        pd.DataFrame: Kolejny fragment danych jednostki.
+    """
+    keep = unit.keep_mask()
+    offset = 0
+    chunks = load_row_groups(
+        unit.file_path, unit.row_groups, chunksize, unit.columns, low_memory, dtypes, filters, strict=True
+    )
+    for chunk in chunks:
+        if keep is not None:
+            chunk_keep = keep[offset:offset + len(chunk)]
+            offset += len(chunk)
+            chunk = chunk[chunk_keep].reset_index(drop=True)
+        yield chunk
+
+
+def unit_fingerprints(
+    unit: WorkUnit,
+    chunksize: int = 100_000,
+    low_memory: bool = False,
+    dtypes: dict[str, str] | None = None,
+    filters: pc.Expression | None = None
+) -> np.ndarray:
+    """
+    Wylicza odciski wszystkich wierszy jednostki (pierwszy przebieg globalnej deduplikacji).
+
+    Args:
+        unit (WorkUnit): Jednostka pracy (bez maski deduplikacji).
+        chunksize (int): Liczba wierszy na chunk.
+        low_memory (bool): Odczyt przez mmap i konwersja bez zbędnych kopii.
+        dtypes (dict[str, str] | None): Schemat typów stosowany podczas odczytu.
+        filters (pc.Expression | None): Filtr predicate pushdown (ten sam co w drugim przebiegu).
+
+    Returns:
+        np.ndarray: Odciski uint64 w kolejności odczytu wierszy.
+    """
+    fingerprints = [
+        row_fingerprints(chunk)
+        for chunk in load_work_unit(unit, chunksize, low_memory, dtypes, filters)
+    ]
+    return np.concatenate(fingerprints) if fingerprints else np.empty(0, dtype=np.uint64)
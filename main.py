@@ -9,10 +9,13 @@ Następnie odpala interfejs Streamlit (`streamlit_app.py`).
 import os
 import subprocess
 from pipeline.taxi_pipeline import TaxiPipeline
+from core.loader import resolve_parquet_files
 from core.logger import logger
 
 # Ścieżki do plików i folderów
-RAW_DATA_PATH = "data/raw/yellow_tripdata_2024-01.parquet"
+# Dane wejściowe: pojedynczy plik, katalog z wieloma miesiącami (także partycjonowany
+# w stylu Hive) lub wzorzec glob, np. "data/raw/yellow_tripdata_2024-*.parquet"
+RAW_DATA_PATH = "data/raw"
 OUTPUT_DIR = "data/output"
 PROFILING_DIR = "data/profiling"
 
@@ -50,11 +53,11 @@ def is_output_complete() -> bool:
 
 def generate_outputs() -> None:
     """
-    Uruchamia pipeline `TaxiPipeline`, jeśli plik źródłowy istnieje.
+    Uruchamia pipeline `TaxiPipeline`, jeśli istnieje co najmniej jeden plik źródłowy.
     Generuje wykresy, raporty oraz pliki profilowania.
     """
-    if not os.path.exists(RAW_DATA_PATH):
-        logger.error(f"Nie znaleziono pliku danych: {RAW_DATA_PATH}")
+    if not any(os.path.exists(f) for f in resolve_parquet_files(RAW_DATA_PATH)):
+        logger.error(f"Nie znaleziono plików danych: {RAW_DATA_PATH}")
         return
 
     logger.info("Uruchamiam pipeline...")
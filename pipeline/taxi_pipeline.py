@@ -13,16 +13,29 @@ Pipeline korzysta z klasy bazowej BasePipeline i metaklasy PipelineMeta.
 
 import logging
 import os
-import pandas as pd
 
-from core.visualizer import visualize_data, plot_memory_usage
+from core.visualizer import visualize_data, plot_memory_usage, plot_time_rollups
 from core.sample_loader import load_sample_for_visualization
 from core.profiling.profiler import profile_memory, profile_cpu
-from core.pool_processor import parallel_analysis, save_summary_by_vendor, save_anomalies_report
+from core.pool_processor import (
+    parallel_analysis,
+    vendor_partial,
+    anomalies_partial,
+    merge_vendor_partials,
+    merge_anomalies_partials,
+    write_summary_by_vendor,
+    write_anomalies_report
+)
+from core.dedup import HashIndex
+from core.groupby import TreeReducer
 from core.loader import load_parquet_in_chunks
+from core.metadata import describe_parquet, get_row_count, read_head
+from core.run_options import AnalysisOptions
+from core.schema import TAXI_DTYPES
 from decorators.counter import count_calls
 from decorators.timer import measure_time
 from pipeline.base import BasePipeline
+from validation.validation_runner import validate_chunk
 
 def step(func):
     """
@@ -40,27 +53,51 @@ class TaxiPipeline(BasePipeline):
     Składa się z kroków: podgląd danych, analiza równoległa, wizualizacja, raporty.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(
+        self,
+        file_path: str,
+        low_memory: bool = False,
+        memory_budget: str | int | None = None,
+        validate: bool = False,
+        checkpoint_dir: str | None = None
+    ):
         """
-        Inicjalizuje pipeline z podaną ścieżką do pliku .parquet.
+        Inicjalizuje pipeline z podaną ścieżką do danych .parquet.
 
         Args:
-            file_path (str): Ścieżka do danych wejściowych.
+            file_path (str): Ścieżka do danych wejściowych – pojedynczy plik, katalog
+                (np. partycjonowany w stylu Hive) lub wzorzec glob.
+            low_memory (bool): Tryb niskiego zużycia pamięci przy odczycie (mmap,
+                konwersja Arrow → pandas bez zbędnych kopii).
+            memory_budget (str | int | None): Budżet pamięci, z którego wyliczany jest rozmiar
+                chunku (np. "256 MB" na chunk lub "60%" RAM); domyślnie stałe 100 000 wierszy.
+            validate (bool): Czy analiza równoległa ma walidować dane w procesach roboczych
+                (proste reguły są stosowane już przy odczycie – predicate pushdown).
+            checkpoint_dir (str | None): Katalog checkpointów analizy równoległej (np. "data/checkpoints");
+                przerwana analiza wznawia się od ukończonych jednostek grup wierszy.
         """
         self.file_path = file_path
+        self.low_memory = low_memory
+        self.memory_budget = memory_budget
+        self.validate = validate
+        self.checkpoint_dir = checkpoint_dir
+        # Podsumowanie analizy równoległej (None – analiza nie została wykonana lub się nie powiodła)
+        self.analysis_summary = None
 
     @step
     @measure_time
     @count_calls
     def preview_parallel_data(self):
         """
-        Wczytuje pierwszy chunk danych i wypisuje jego podgląd w konsoli.
+        Wypisuje w konsoli liczbę wierszy, statystyki kolumn i pierwsze rekordy.
         Służy jako szybka kontrola zawartości danych przed analizą.
+
+        Liczba wierszy i statystyki pochodzą z metadanych Parquet, a podgląd
+        dekoduje tylko pierwsze rekordy – krok nie zależy od rozmiaru danych.
         """
-        for i, chunk in enumerate(load_parquet_in_chunks(self.file_path, chunksize=100_000)):
-            print(f"[Chunk {i + 1}] Preview:")
-            print(chunk.head())
-            break
+        print(f"[Preview] Liczba wierszy: {get_row_count(self.file_path)}")
+        print(describe_parquet(self.file_path).to_string())
+        print(read_head(self.file_path, n=5))
 
     @step
     @measure_time
@@ -74,7 +111,12 @@ class TaxiPipeline(BasePipeline):
         logger.info("Profilowanie CPU i pamięci...")
 
         def analysis_task():
-            parallel_analysis(self.file_path)
+            self.analysis_summary = parallel_analysis(self.file_path, AnalysisOptions(
+                low_memory=self.low_memory,
+                memory_budget=self.memory_budget,
+                validate=self.validate,
+                checkpoint_dir=self.checkpoint_dir
+            ))
 
         # Profilowanie CPU i pamięci w jednej sesji
         profile_cpu(lambda: profile_memory(analysis_task))
@@ -91,28 +133,55 @@ class TaxiPipeline(BasePipeline):
     @count_calls
     def visualize(self):
         """
-        Wczytuje próbkę danych (2 chunki), oczyszcza ją i generuje wykresy.
+        Losuje próbkę danych z całego zbioru (warstwowaną po godzinie odbioru),
+        oczyszcza ją i generuje wykresy. Wykresy czasowe powstają z agregatów
+        całego zbioru zapisanych przez analizę równoległą (time_rollups.csv).
         Służy jako szybka wizualna kontrola jakości i rozkładów danych.
         """
         df_sample = load_sample_for_visualization(
             self.file_path,
+            sample_size=200_000,
+            stratify_by="pickup_hour",
             chunksize=100_000,
-            max_chunks=2
+            memory_budget=self.memory_budget
         )
         visualize_data(df_sample)
+        plot_time_rollups()
 
     @step
     @measure_time
     @count_calls
     def generate_reports(self):
         """
-        Generuje raporty tekstowe:
+        Zapewnia raporty tekstowe:
         - `summary_by_vendor.txt` – statystyki według VendorID,
         - `anomalies_report.txt` – podejrzane napiwki większe niż całkowita kwota.
+
+        Analiza równoległa zapisuje oba raporty z agregatów częściowych procesów roboczych,
+        więc po jej powodzeniu krok niczego nie przelicza. W przeciwnym razie raporty powstają
+        w osobnym przebiegu strumieniowym – z tą samą deduplikacją globalną (HashIndex)
+        i walidacją co analiza równoległa, ale tylko z agregatami potrzebnymi do tych raportów.
         """
-        df = pd.read_parquet(self.file_path)
-        save_summary_by_vendor(df)
-        save_anomalies_report(df)
+        logger = logging.getLogger(__name__)
+        if self.analysis_summary:
+            logger.info("Raporty per VendorID i anomalii zapisane przez analizę równoległą – pominięto przeliczenie.")
+            return
+
+        index = HashIndex()
+        vendor = TreeReducer(merge_vendor_partials)
+        anomalies_partials = []
+        for chunk in load_parquet_in_chunks(self.file_path, low_memory=self.low_memory, dtypes=TAXI_DTYPES):
+            chunk = index.drop_seen(chunk)
+            if self.validate:
+                try:
+                    chunk = validate_chunk(chunk)
+                except Exception as e:
+                    logger.error(f"Błąd walidacji chunku – pominięto go w raportach: {e}")
+                    continue
+            vendor.add(vendor_partial(chunk))
+            anomalies_partials.append(anomalies_partial(chunk))
+        write_summary_by_vendor(vendor.result())
+        write_anomalies_report(merge_anomalies_partials(anomalies_partials))
 
     def run(self):
         """
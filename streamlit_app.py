@@ -5,6 +5,7 @@ Wykorzystuje bibliotekę Streamlit do wizualizacji wyników przetwarzania danych
 – uruchomienie pipeline'u (`TaxiPipeline`)
 – podgląd danych surowych
 – prezentacja wykresów i raportów
+– szeregi czasowe kursów (agregaty per godzina, dzień tygodnia i dzień)
 – przegląd logów
 
 Plik może być uruchamiany samodzielnie jako aplikacja frontendowa.
@@ -12,13 +13,15 @@ Plik może być uruchamiany samodzielnie jako aplikacja frontendowa.
 
 import streamlit as st
 import os
-import pandas as pd
+from core.loader import resolve_parquet_files
+from core.metadata import describe_parquet, get_row_count, read_head
+from core.rollups import WEEKDAY_NAMES, load_time_rollups
 from core.logger import logger as app_logger
 from pipeline.taxi_pipeline import TaxiPipeline
 
 # Stałe ścieżki i pliki
 OUTPUT_DIR = "data/output"
-RAW_DATA_PATH = "data/raw/yellow_tripdata_2024-01.parquet"
+RAW_DATA_PATH = "data/raw"  # plik, katalog (np. partycje Hive) lub wzorzec glob
 LOG_FILE_PATH = "data/logs/app.log"
 
 # Wykresy do wyświetlenia
@@ -28,14 +31,24 @@ PLOTS = {
     "Napiwki vs całkowita cena": "tip_vs_total_scatter.png",
     "Długość przejazdu – histogram": "trip_distance_hist_filtered.png",
     "Napiwki a liczba pasażerów": "tip_by_passenger_count_filtered.png",
-    "Zużycie pamięci podczas analizy": "memory_usage_plot.png"
+    "Zużycie pamięci podczas analizy": "memory_usage_plot.png",
+    "Kursy względem godziny odbioru": "trips_by_hour.png",
+    "Kursy względem dnia tygodnia": "trips_by_weekday.png",
+    "Kursy: dzień tygodnia × godzina": "trips_weekday_hour_heatmap.png",
+    "Kursy per dzień": "trips_by_day.png"
 }
 
 # Raporty tekstowe
 TEXT_REPORTS = {
     "Podsumowanie analizy równoległej": "parallel_summary.txt",
     "Raport anomalii": "anomalies_report.txt",
-    "Raport podsumowujący przewoźników": "summary_by_vendor.txt"
+    "Raport podsumowujący przewoźników": "summary_by_vendor.txt",
+    "Raporty grupowane (płatność, godzina, strefa)": "grouped_summary.txt",
+    "Najczęstsze pary stref (macierz OD)": "od_top_pairs.txt",
+    "Podsumowanie per plik": "per_file_summary.txt",
+    "Statystyki kolumn": "column_stats.txt",
+    "Liczby unikalnych stref (HyperLogLog)": "distinct_counts.txt",
+    "Statystyki walidacji (JSON)": "validation_stats.json"
 }
 
 def show_image(file_name: str) -> None:
@@ -77,14 +90,43 @@ def show_logs() -> None:
         st.error("Brak pliku logów.")
         app_logger.warning("[Streamlit] Brak pliku logów.")
 
+def show_time_rollups() -> None:
+    """
+    Wyświetla szeregi czasowe kursów z agregatów czasowych analizy równoległej
+    (`time_rollups.csv`): liczbę kursów i średnią opłatę per godzina, dzień tygodnia i dzień.
+    """
+    rollups = load_time_rollups(os.path.join(OUTPUT_DIR, "time_rollups.csv"))
+    if not rollups:
+        st.error("Brak agregatów czasowych. Uruchom analizę danych.")
+        app_logger.warning("[Streamlit] Brak pliku time_rollups.csv")
+        return
+
+    st.subheader("Kursy względem godziny odbioru")
+    st.bar_chart(rollups["hour"]["trips"])
+    st.line_chart(rollups["hour"]["fare_amount_mean"])
+
+    st.subheader("Kursy względem dnia tygodnia")
+    weekly = rollups["weekday"].set_axis([WEEKDAY_NAMES[d] for d in rollups["weekday"].index])
+    st.bar_chart(weekly["trips"])
+
+    if "day" in rollups:
+        st.subheader("Kursy per dzień")
+        st.line_chart(rollups["day"][["trips"]])
+
+    st.subheader("Dane (dzień tygodnia × godzina)")
+    st.dataframe(rollups["weekday_hour"]["trips"].unstack("hour").set_axis(WEEKDAY_NAMES[:7]))
+
 def preview_raw_data() -> None:
     """
-    Wczytuje pierwsze 10 rekordów z pliku Parquet i wyświetla jako DataFrame.
+    Wyświetla liczbę wierszy, statystyki kolumn (z metadanych Parquet)
+    oraz pierwsze 10 rekordów (dekodowana jest tylko pierwsza grupa wierszy).
     """
-    if os.path.exists(RAW_DATA_PATH):
+    if any(os.path.exists(f) for f in resolve_parquet_files(RAW_DATA_PATH)):
         try:
-            df = pd.read_parquet(RAW_DATA_PATH, engine="pyarrow")
-            st.dataframe(df.head(10))
+            st.metric("Liczba rekordów", f"{get_row_count(RAW_DATA_PATH):,}".replace(",", " "))
+            st.dataframe(read_head(RAW_DATA_PATH, n=10))
+            st.subheader("Statystyki kolumn (metadane Parquet)")
+            st.dataframe(describe_parquet(RAW_DATA_PATH).astype(str))
         except Exception as e:
             st.error(f"Nie udało się załadować danych: {e}")
             app_logger.exception("[Streamlit] Błąd przy wczytywaniu Parquet")
@@ -104,6 +146,7 @@ def main() -> None:
         "Wykresy",
         "Raporty tekstowe",
         "Wszystkie wykresy",
+        "Szeregi czasowe",
         "Podgląd danych",
         "Debug / Logi aplikacji"
     ])
@@ -151,6 +194,11 @@ def main() -> None:
                 st.info(f"Pominięto: {name} (brak pliku)")
         st.divider()
 
+    elif tab == "Szeregi czasowe":
+        st.header("Szeregi czasowe kursów (cały zbiór danych)")
+        show_time_rollups()
+        st.divider()
+
     elif tab == "Podgląd danych":
         st.header("Podgląd danych źródłowych")
         preview_raw_data()
@@ -0,0 +1,80 @@
+"""
+test_accumulators.py
+
+Testy jednostkowe dla modułu `core.accumulators` (mergowalne statystyki kolumn).
+
+Sprawdzane przypadki:
+- statystyki połączone z chunków są równe statystykom z całego DataFrame (także z brakami danych),
+- wynik nie zależy od kolejności ani sposobu grupowania łączonych chunków,
+- puste chunki i kolumny bez wartości nie zaburzają wyniku.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from core.accumulators import MetricStats, describe_chunk, merge_column_stats
+
+def _frame(rows: int = 1_000) -> pd.DataFrame:
+    """
+    Tworzy dane testowe z kolumną float32, Int8 z brakami i kolumną kategoryczną.
+    """
+    rng = np.random.default_rng(7)
+    passengers = pd.array(rng.integers(0, 6, rows), dtype="Int8")
+    passengers[::10] = pd.NA
+    return pd.DataFrame({
+        "fare_amount": (rng.normal(1e6, 5, rows)).astype("float32"),
+        "passenger_count": passengers,
+        "VendorID": pd.Categorical(rng.integers(1, 3, rows))
+    })
+
+def test_merged_chunks_match_whole_frame():
+    """
+    Średnia, odchylenie, min i max z połączonych chunków powinny odpowiadać pandas.describe().
+    """
+    df = _frame()
+    stats = None
+    for start in range(0, len(df), 137):
+        stats = merge_column_stats(stats, describe_chunk(df.iloc[start:start + 137]))
+
+    assert set(stats) == {"fare_amount", "passenger_count"}
+    for name, column in stats.items():
+        expected = df[name].astype("float64")
+        assert column.count == expected.count()
+        assert column.mean == pytest.approx(expected.mean(), rel=1e-12)
+        assert column.std == pytest.approx(expected.std(), rel=1e-9)
+        assert column.minimum == expected.min()
+        assert column.maximum == expected.max()
+
+def test_merge_is_order_independent():
+    """
+    Łączenie w odwrotnej kolejności i drzewiaście powinno dać te same statystyki.
+    """
+    values = _frame()["fare_amount"]
+    parts = [MetricStats.from_values(values[i:i + 100]) for i in range(0, len(values), 100)]
+
+    sequential = MetricStats()
+    for part in reversed(parts):
+        sequential.merge(part)
+
+    def tree(items):
+        if len(items) == 1:
+            return items[0]
+        middle = len(items) // 2
+        return MetricStats().merge(tree(items[:middle])).merge(tree(items[middle:]))
+
+    pairwise = tree([MetricStats.from_values(values[i:i + 100]) for i in range(0, len(values), 100)])
+    assert pairwise.count == sequential.count
+    assert pairwise.mean == pytest.approx(sequential.mean, rel=1e-12)
+    assert pairwise.variance == pytest.approx(sequential.variance, rel=1e-9)
+
+def test_empty_chunks_are_neutral():
+    """
+    Puste fragmenty nie powinny zmieniać statystyk; brak wartości daje None w raporcie.
+    """
+    stats = MetricStats.from_values(pd.Series([1.0, 3.0]))
+    stats.merge(MetricStats.from_values(pd.Series([], dtype="float64")))
+    assert stats.to_dict() == {"count": 2, "sum": 4.0, "mean": 2.0, "std": math.sqrt(2.0), "min": 1.0, "max": 3.0}
+
+    empty = MetricStats.from_values(pd.Series([np.nan]))
+    assert empty.to_dict()["mean"] is None and math.isnan(empty.variance)
@@ -0,0 +1,72 @@
+"""
+test_arrow_engine.py
+
+Testy jednostkowe dla silnika Arrow (`core.arrow_engine`, `validate_batch`).
+
+Sprawdzane przypadki:
+- walidacja paczki Arrow odrzuca te same wiersze co walidacja w pandas,
+- statystyki reguł z walidacji Arrow (wyrażenia liczone razem) są zgodne z pandas, także dla
+  tabeli z kolumną kodowaną słownikowo,
+- metryki liczone kernelami pyarrow.compute są zgodne z analyze_chunk.
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from core.analyzer import analyze_chunk
+from core.arrow_engine import analyze_batch
+from validation.stats import ValidationStats
+from validation.validation_runner import validate_batch, validate_chunk
+
+def _trips() -> pd.DataFrame:
+    """
+    Zwraca kursy z błędnymi wierszami (ujemny dystans, brak, za długi kurs) i duplikatem.
+    """
+    return pd.DataFrame({
+        "VendorID": [1, 2, 2, 2, 1, 2],
+        "trip_distance": [1.0, -5.0, 12.0, 12.0, 3.0, None],
+        "fare_amount": [10.0, 10.0, 30.0, 30.0, 10.0, 10.0],
+        "total_amount": [15.0, 15.0, 36.0, 36.0, 15.0, 15.0],
+        "passenger_count": [1.0, 1.0, 2.0, 2.0, 1.0, 1.0],
+        "tip_amount": [1.5, 1.0, 4.0, 4.0, 1.0, 1.0],
+        "tpep_pickup_datetime": pd.to_datetime(["2024-01-01 00:00"] * 6),
+        "tpep_dropoff_datetime": pd.to_datetime(
+            ["2024-01-01 01:00"] * 2 + ["2024-01-01 02:00"] * 2 + ["2024-01-02 03:00", "2024-01-01 01:00"]
+        )
+    })
+
+def test_validate_batch_matches_pandas():
+    """
+    Walidacja paczki Arrow powinna zachować dokładnie te same wiersze co validate_chunk.
+    """
+    df = _trips()
+    validated = validate_batch(pa.RecordBatch.from_pandas(df))
+
+    pd.testing.assert_frame_equal(validated.to_pandas(), validate_chunk(df))
+
+def test_validate_batch_stats_match_pandas():
+    """
+    Liczby odrzuceń każdej reguły powinny być takie same jak w walidacji pandas.
+    """
+    df = _trips()
+    table = pa.Table.from_pandas(df)
+    table = table.set_column(0, "VendorID", table.column("VendorID").dictionary_encode())
+    arrow_stats, pandas_stats = ValidationStats(), ValidationStats()
+
+    validated = validate_batch(table, stats=arrow_stats)
+    validate_chunk(df, stats=pandas_stats)
+
+    rejected = lambda stats: {rule: values["rejected"] for rule, values in stats.rules.items()}
+    assert rejected(arrow_stats) == rejected(pandas_stats)
+    assert arrow_stats.rules["DropDuplicatesValidator"]["rejected"] == 1
+    assert validated.num_rows == pandas_stats.rows_out
+
+def test_analyze_batch_matches_analyze_chunk():
+    """
+    Metryki z silnika Arrow powinny być równe metrykom z pandas.
+    """
+    df = validate_chunk(_trips())
+    arrow_result = analyze_batch(pa.RecordBatch.from_pandas(df))
+
+    assert arrow_result == pytest.approx(analyze_chunk(df))
+    assert arrow_result["long_trips"] == 1
@@ -0,0 +1,74 @@
+"""
+test_cardinality.py
+
+Testy jednostkowe dla modułu `core.cardinality` (szkic HyperLogLog).
+
+Sprawdzane przypadki:
+- estymata mieści się w trzykrotności deklarowanego błędu względnego (również dla małych liczności),
+- szkic połączony z chunków jest identyczny ze szkicem całych danych,
+- serializacja (zapis rzadki i gęsty) nie zmienia rejestrów,
+- agregat częściowy liczy pary odbiór→cel per VendorID i per dzień.
+"""
+
+import pickle
+import numpy as np
+import pandas as pd
+from core.cardinality import HyperLogLog, distinct_frame, distinct_partial, hash_columns, merge_distinct_partials
+
+def _trips(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "VendorID": rng.choice([1, 2], rows),
+        "tpep_pickup_datetime": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 3 * 86400, rows), unit="s"),
+        "PULocationID": rng.integers(1, 266, rows),
+        "DOLocationID": rng.integers(1, 266, rows),
+    })
+
+def test_estimate_within_error_bound():
+    """
+    Dla 100 i 200 000 unikalnych wartości błąd powinien być mniejszy niż 3σ.
+    """
+    for distinct in (100, 200_000):
+        values = pd.DataFrame({"x": np.arange(distinct).repeat(3)})
+        sketch = HyperLogLog().add_hashes(hash_columns(values, ["x"]))
+        assert abs(sketch.estimate() - distinct) <= 3 * sketch.relative_error * distinct
+
+def test_merge_matches_whole_data():
+    """
+    Maksimum rejestrów szkiców chunków to szkic całych danych.
+    """
+    df = _trips(50_000)
+    whole = distinct_partial(df)
+    merged = None
+    for start in range(0, len(df), 7_000):
+        merged = merge_distinct_partials(merged, distinct_partial(df.iloc[start:start + 7_000]))
+
+    for metric, sketch in whole["all"].items():
+        assert np.array_equal(merged["all"][metric].registers, sketch.registers)
+    assert distinct_frame(merged["day"]).equals(distinct_frame(whole["day"]))
+
+def test_pickle_round_trip():
+    """
+    Szkic prawie pusty (zapis rzadki) i pełny (zapis gęsty) po serializacji mają te same rejestry.
+    """
+    for distinct in (10, 100_000):
+        sketch = HyperLogLog().add_hashes(hash_columns(pd.DataFrame({"x": np.arange(distinct)}), ["x"]))
+        restored = pickle.loads(pickle.dumps(sketch))
+        assert np.array_equal(restored.registers, sketch.registers)
+    assert len(pickle.dumps(HyperLogLog().add_hashes(np.arange(10, dtype=np.uint64)))) < 500
+
+def test_grouped_counts():
+    """
+    Liczby par odbiór→cel per VendorID i per dzień powinny zgadzać się z dokładnymi w granicy 3σ.
+    """
+    df = _trips(30_000, seed=1)
+    partial = distinct_partial(df)
+    assert sorted(partial["vendor"]) == [1, 2]
+    assert sorted(partial["day"]) == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+    exact = df.groupby(df["tpep_pickup_datetime"].dt.strftime("%Y-%m-%d"))[["PULocationID", "DOLocationID"]] \
+        .apply(lambda g: len(g.drop_duplicates()))
+    estimated = distinct_frame(partial["day"])["OD"]
+    error = partial["all"]["OD"].relative_error
+    assert ((estimated - exact).abs() <= 3 * error * exact).all()
+    assert distinct_partial(df.drop(columns="DOLocationID")) is None
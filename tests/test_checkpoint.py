@@ -0,0 +1,285 @@
+"""
+test_checkpoint.py
+
+Testy jednostkowe dla modułu `core.checkpoint` oraz wznawiania analiz z checkpointów.
+
+Sprawdzane przypadki:
+- zapis i odczyt agregatów jednostki, usuwanie uszkodzonego checkpointu,
+- identyfikator przebiegu zależy od parametrów analizy,
+- przebiegi na zmienionych lub usuniętych danych są usuwane, pozostałe zostają,
+- nieudany chunk analizy streamingowej nie jest wliczany jako zera,
+- wznowiona analiza streamingowa przetwarza tylko nieudane jednostki i daje wynik przebiegu bez błędów
+  (także z duplikatami między jednostkami),
+- wznowiona analiza równoległa przetwarza i deduplikuje (liczy odciski) tylko nieudane jednostki
+  i daje wynik przebiegu bez błędów (także z duplikatami między jednostkami),
+- analizę równoległą można wznowić na maszynie z inną liczbą CPU (ten sam przebieg i plan jednostek).
+"""
+
+import os
+import pandas as pd
+import core.analyzer as analyzer
+import core.pool_processor as pool_processor
+import core.run_options as run_options
+from core.analyzer import streaming_global_analysis
+from core.checkpoint import CheckpointStore, prune_stale_runs, run_fingerprint
+from core.pool_processor import parallel_analysis
+from core.work_units import plan_work_units
+
+
+def _write_trips(path, rows: int, start: str = "2024-01-01", row_group_size: int | None = None) -> None:
+    """
+    Zapisuje plik .parquet z kursami przechodzącymi walidację (dystans rośnie z numerem kursu).
+    """
+    pd.DataFrame({
+        "VendorID": [1, 2] * (rows // 2),
+        "passenger_count": [1.0] * rows,
+        "trip_distance": [1.0 + i for i in range(rows)],
+        "fare_amount": [10.0 + i for i in range(rows)],
+        "tip_amount": [2.0] * rows,
+        "total_amount": [12.0 + i for i in range(rows)],
+        "PULocationID": [i % 5 + 1 for i in range(rows)],
+        "DOLocationID": [i % 3 + 1 for i in range(rows)],
+        "tpep_pickup_datetime": pd.date_range(start, periods=rows, freq="h"),
+        "tpep_dropoff_datetime": pd.date_range(pd.Timestamp(start) + pd.Timedelta("30min"), periods=rows, freq="h")
+    }).to_parquet(path, row_group_size=row_group_size)
+
+def _failing(analyze, should_fail, calls: list | None = None):
+    """
+    Zwraca wersję funkcji analizy, która dla wybranych chunków dostaje dane bez kolumny
+    `trip_distance` (analiza kończy się błędem obsłużonym przez samą funkcję).
+    """
+    def analyze_or_fail(df, *args, **kwargs):
+        if calls is not None:
+            calls.append(len(df))
+        if should_fail(df):
+            df = df.drop(columns="trip_distance")
+        return analyze(df, *args, **kwargs)
+    return analyze_or_fail
+
+def _with_distance(*distances: float):
+    """
+    Warunek błędu: chunk zawiera kurs o jednym z podanych dystansów.
+    """
+    return lambda df: df["trip_distance"].isin(distances).any()
+
+def _logged(function, log_path):
+    """
+    Zwraca wersję funkcji dopisującą linię do pliku przy każdym wywołaniu
+    (wywołania w forkowanych procesach roboczych są widoczne w procesie testu).
+    """
+    def logged(*args, **kwargs):
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("call\n")
+        return function(*args, **kwargs)
+    return logged
+
+def _calls(log_path) -> int:
+    """
+    Zwraca liczbę wywołań zapisanych przez `_logged` i czyści plik.
+    """
+    if not os.path.exists(log_path):
+        return 0
+    with open(log_path, encoding="utf-8") as f:
+        count = len(f.readlines())
+    os.remove(log_path)
+    return count
+
+def _exact(summary: dict) -> dict:
+    """
+    Pomija klucze przybliżone (kolejność łączenia szkiców zmienia się po wznowieniu).
+    """
+    return {key: value for key, value in summary.items() if "(≈)" not in key}
+
+def test_checkpoint_store_round_trip(tmp_path):
+    """
+    Zapisane agregaty powinny być odczytywane per jednostka, a uszkodzony plik usuwany.
+    """
+    path = tmp_path / "trips.parquet"
+    _write_trips(path, rows=30, row_group_size=10)
+    first, second = plan_work_units(str(path), rows_per_unit=10)[:2]
+    store = CheckpointStore("run", str(tmp_path / "checkpoints"))
+
+    store.save(first, {"rows": 10})
+    assert store.load(first) == {"rows": 10}
+    assert store.load(second) is None
+    assert len(store) == 1
+
+    with open(store._file(first), "wb") as f:
+        f.write(b"uszkodzony")
+    assert store.load(first) is None
+    assert len(store) == 0
+
+    store.clear()
+    assert not os.path.exists(store.path)
+
+def test_run_fingerprint_depends_on_params(tmp_path):
+    """
+    Zmiana parametrów analizy powinna rozpocząć nowy przebieg.
+    """
+    path = tmp_path / "trips.parquet"
+    _write_trips(path, rows=10)
+    files = [str(path)]
+
+    assert run_fingerprint(files, chunksize=8) == run_fingerprint(files, chunksize=8)
+    assert run_fingerprint(files, chunksize=8) != run_fingerprint(files, chunksize=16)
+
+def test_stale_runs_are_pruned(tmp_path):
+    """
+    Otwarcie magazynu powinno usunąć przebiegi, których dane wejściowe zmieniły się lub zniknęły.
+    """
+    changed, kept, removed = (tmp_path / f"{name}.parquet" for name in ("changed", "kept", "removed"))
+    for path in (changed, kept, removed):
+        _write_trips(path, rows=10)
+    checkpoints = str(tmp_path / "checkpoints")
+    old = CheckpointStore("old", checkpoints, [str(changed)])
+    other = CheckpointStore("other", checkpoints, [str(kept)])
+    gone = CheckpointStore("gone", checkpoints, [str(removed)])
+
+    _write_trips(changed, rows=20)
+    os.remove(removed)
+    new = CheckpointStore("new", checkpoints, [str(changed)])
+
+    assert not os.path.exists(old.path)
+    assert not os.path.exists(gone.path)
+    assert os.path.exists(other.path)
+    assert os.path.exists(new.path)
+    assert prune_stale_runs(checkpoints) == 0
+
+def test_failed_chunk_is_not_counted(tmp_path, monkeypatch):
+    """
+    Chunk, którego analiza się nie powiodła, powinien zostać pominięty i zgłoszony w podsumowaniu.
+    """
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "trips.parquet"
+    _write_trips(path, rows=40, row_group_size=10)
+    monkeypatch.setattr(analyzer, "analyze_chunk", _failing(analyzer.analyze_chunk, _with_distance(1.0)))
+
+    summary = streaming_global_analysis(str(path), chunksize=10)
+
+    assert summary["Liczba rekordów"] == 30
+    assert summary["Nieudane chunki (niewliczone)"] == 1
+    assert summary["Średnia długość trasy (mile)"] == round(sum(range(11, 41)) / 30, 2)
+
+def test_streaming_resume_processes_only_failed_units(tmp_path, monkeypatch):
+    """
+    Po nieudanym przebiegu ponowne uruchomienie powinno przeliczyć tylko nieudaną jednostkę
+    i dać podsumowanie przebiegu bez błędów – także gdy jej wiersze powtarzają się w innej jednostce.
+    """
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "trips.parquet"
+    _write_trips(tmp_path / "base.parquet", rows=30)
+    trips = pd.read_parquet(tmp_path / "base.parquet")
+    # Ostatnia jednostka powtarza wiersze pierwszej (nieudanej w pierwszym przebiegu)
+    pd.concat([trips, trips.iloc[:10]]).to_parquet(path, row_group_size=10)
+    clean = streaming_global_analysis(str(path), chunksize=10)
+    checkpoints = str(tmp_path / "checkpoints")
+    original = analyzer.analyze_chunk
+
+    calls = []
+    monkeypatch.setattr(analyzer, "analyze_chunk", _failing(original, lambda df: len(calls) == 1, calls))
+    failed = streaming_global_analysis(str(path), chunksize=10, checkpoint_dir=checkpoints)
+    assert failed["Nieudane jednostki (niewliczone)"] == 1
+    assert failed["Liczba rekordów"] == 30
+
+    calls = []
+    monkeypatch.setattr(analyzer, "analyze_chunk", _failing(original, lambda df: False, calls))
+    resumed = streaming_global_analysis(str(path), chunksize=10, checkpoint_dir=checkpoints)
+
+    assert len(calls) == 1
+    assert resumed == clean
+    assert clean["Liczba rekordów"] == 30
+    assert os.listdir(checkpoints) == []
+
+def test_parallel_resume_processes_only_failed_units(tmp_path, monkeypatch):
+    """
+    Wznowiona analiza równoległa powinna przeliczyć tylko nieudane jednostki grup wierszy.
+    """
+    monkeypatch.chdir(tmp_path)
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _write_trips(raw_dir / "yellow_tripdata_2024-01.parquet", rows=40, row_group_size=10)
+    _write_trips(raw_dir / "yellow_tripdata_2024-02.parquet", rows=20, start="2024-02-01", row_group_size=10)
+    clean = parallel_analysis(str(raw_dir), chunksize=10, dispatch="row_groups")
+    checkpoints = str(tmp_path / "checkpoints")
+    original = pool_processor.analyze_chunk
+
+    log_path = str(tmp_path / "fingerprints.log")
+    monkeypatch.setattr(pool_processor, "unit_fingerprints", _logged(pool_processor.unit_fingerprints, log_path))
+
+    monkeypatch.setattr(pool_processor, "analyze_chunk", _failing(original, _with_distance(25.0, 35.0)))
+    failed = parallel_analysis(str(raw_dir), chunksize=10, checkpoint_dir=checkpoints)
+    assert failed["Nieudane zadania (niewliczone)"] == 2
+    assert failed["Liczba rekordów"] == 40
+    assert _calls(log_path) == 6
+
+    # Procesy robocze są forkowane – przetworzenia liczy rozmiar zapisanego magazynu,
+    # a odciski – plik dziennika
+    monkeypatch.setattr(pool_processor, "analyze_chunk", original)
+    run_dir = os.path.join(checkpoints, os.listdir(checkpoints)[0])
+    assert len(CheckpointStore(os.path.basename(run_dir), checkpoints)) == 4
+    resumed = parallel_analysis(str(raw_dir), chunksize=10, checkpoint_dir=checkpoints)
+
+    assert _calls(log_path) == 2
+    assert _exact(resumed) == _exact(clean)
+    assert not os.path.exists(run_dir)
+
+def test_parallel_resume_keeps_cross_unit_duplicates_out(tmp_path, monkeypatch):
+    """
+    Wznowiona analiza równoległa powinna odtworzyć indeks deduplikacji z checkpointów,
+    tak by wiersze powtórzone w innej jednostce były policzone dokładnie raz.
+    """
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "trips.parquet"
+    _write_trips(tmp_path / "base.parquet", rows=30)
+    trips = pd.read_parquet(tmp_path / "base.parquet")
+    # Ostatnia jednostka powtarza wiersze pierwszej
+    pd.concat([trips, trips.iloc[:10]]).to_parquet(path, row_group_size=10)
+    clean = parallel_analysis(str(path), chunksize=10, dispatch="row_groups")
+    checkpoints = str(tmp_path / "checkpoints")
+    original = pool_processor.load_work_unit
+
+    def load_or_fail(failing_group):
+        def load(unit, *args, **kwargs):
+            if unit.row_groups == [failing_group]:
+                raise OSError("przerwany odczyt")
+            return original(unit, *args, **kwargs)
+        return load
+
+    # Nieudana pierwsza jednostka (oryginały) albo ostatnia (powtórzenia)
+    for failing_group in (0, 3):
+        monkeypatch.setattr(pool_processor, "load_work_unit", load_or_fail(failing_group))
+        failed = parallel_analysis(str(path), chunksize=10, checkpoint_dir=checkpoints)
+        assert failed["Nieudane zadania (niewliczone)"] == 1
+
+        monkeypatch.setattr(pool_processor, "load_work_unit", original)
+        resumed = parallel_analysis(str(path), chunksize=10, checkpoint_dir=checkpoints)
+
+        assert clean["Liczba rekordów"] == 30
+        assert _exact(resumed) == _exact(clean)
+        assert os.listdir(checkpoints) == []
+
+def test_parallel_resume_on_other_machine(tmp_path, monkeypatch):
+    """
+    Wznowienie na maszynie z inną liczbą CPU (i innym rozmiarem zadań) powinno użyć tego samego
+    przebiegu i planu jednostek zamiast zaczynać od nowa.
+    """
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "trips.parquet"
+    _write_trips(path, rows=40, row_group_size=10)
+    clean = parallel_analysis(str(path), chunksize=20, dispatch="row_groups")
+    checkpoints = str(tmp_path / "checkpoints")
+    original = pool_processor.analyze_chunk
+
+    monkeypatch.setattr(pool_processor, "analyze_chunk", _failing(original, _with_distance(35.0)))
+    failed = parallel_analysis(str(path), chunksize=20, checkpoint_dir=checkpoints)
+    assert failed["Nieudane zadania (niewliczone)"] == 1
+    run_dir = os.path.join(checkpoints, os.listdir(checkpoints)[0])
+
+    monkeypatch.setattr(pool_processor, "analyze_chunk", original)
+    monkeypatch.setattr(run_options, "cpu_count", lambda: 4)
+    monkeypatch.setattr(run_options, "rows_per_task", lambda total_rows, chunksize, workers: 10)
+    resumed = parallel_analysis(str(path), chunksize=20, checkpoint_dir=checkpoints)
+
+    assert _exact(resumed) == _exact(clean)
+    assert os.listdir(checkpoints) == []
+    assert not os.path.exists(run_dir)
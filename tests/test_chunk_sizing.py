@@ -0,0 +1,85 @@
+"""
+test_chunk_sizing.py
+
+Testy jednostkowe dla doboru rozmiaru chunku według budżetu pamięci (`core.chunk_sizing`).
+
+Sprawdzane przypadki:
+- parsowanie budżetu podanego w bajtach, jednostkach i procentach RAM,
+- wyliczanie liczby wierszy z metadanych pliku Parquet (kolumna spoza schematu – ValueError),
+- korekta rozmiaru chunku na podstawie zmierzonego RSS,
+- wczytywanie chunków o zmiennym rozmiarze przez loader.
+"""
+
+import pandas as pd
+import pytest
+from core.chunk_sizing import (
+    AdaptiveChunkSizer, MIN_CHUNK_ROWS, estimate_row_bytes, parse_memory_budget, rows_for_budget
+)
+from core.loader import load_parquet_in_chunks
+
+def _write_numbers(path, rows: int) -> None:
+    """
+    Zapisuje plik .parquet z dwiema kolumnami float64 (16 bajtów na wiersz).
+    """
+    pd.DataFrame({"trip_distance": [1.0] * rows, "tip_amount": [2.0] * rows}).to_parquet(path)
+
+def test_parse_memory_budget_units():
+    """
+    Budżet może być liczbą bajtów, wartością z jednostką lub procentem RAM.
+    """
+    assert parse_memory_budget(1024) == 1024
+    assert parse_memory_budget("256 MB") == 256 * 1024 ** 2
+    assert parse_memory_budget("1.5GB") == int(1.5 * 1024 ** 3)
+    assert parse_memory_budget("2g") == 2 * 1024 ** 3
+    assert parse_memory_budget("60%", concurrent_chunks=4) < parse_memory_budget("60%")
+
+    with pytest.raises(ValueError):
+        parse_memory_budget("dużo")
+
+def test_rows_for_budget_uses_schema_and_workers(tmp_path):
+    """
+    Liczba wierszy powinna rosnąć z budżetem oraz przy mniejszej liczbie lub węższych kolumnach.
+    """
+    path = tmp_path / "trips.parquet"
+    _write_numbers(path, rows=1000)
+
+    row_bytes = estimate_row_bytes(str(path))
+    compact_bytes = estimate_row_bytes(str(path), dtypes={"tip_amount": "float32"})
+    assert compact_bytes < row_bytes
+
+    rows = rows_for_budget(str(path), "8 MB")
+    assert rows == int(8 * 1024 ** 2 / row_bytes)
+    assert rows_for_budget(str(path), "16 MB") > rows
+    assert rows_for_budget(str(path), "8 MB", columns=["tip_amount"]) > rows
+    assert AdaptiveChunkSizer(str(path), "8 MB")() == rows
+
+    with pytest.raises(ValueError, match="fare_amount"):
+        estimate_row_bytes(str(path), columns=["tip_amount", "fare_amount"])
+
+def test_adaptive_sizer_reacts_to_rss(tmp_path):
+    """
+    Przekroczenie budżetu powinno zmniejszyć chunk, a niskie zużycie – zwiększyć go.
+    """
+    path = tmp_path / "trips.parquet"
+    _write_numbers(path, rows=1000)
+    sizer = AdaptiveChunkSizer(str(path), "64 MB")
+    initial = sizer()
+    sizer.observe(sizer.baseline_rss)  # pierwszy pomiar kalibruje poziom bazowy
+
+    shrunk = sizer.observe(sizer.baseline_rss + 4 * sizer.total_budget)
+    assert MIN_CHUNK_ROWS <= shrunk < initial
+
+    grown = sizer.observe(sizer.baseline_rss + sizer.total_budget // 10)
+    assert grown > shrunk
+
+def test_loader_accepts_variable_chunksize(tmp_path):
+    """
+    Loader powinien odpytywać funkcję `chunksize` przed składaniem każdego chunku.
+    """
+    path = tmp_path / "trips.parquet"
+    _write_numbers(path, rows=50_000)
+    sizes = iter([20_000, 10_000, 15_000, 15_000])
+
+    chunks = list(load_parquet_in_chunks(str(path), chunksize=lambda: next(sizes)))
+
+    assert [len(c) for c in chunks] == [20_000, 10_000, 15_000, 5_000]
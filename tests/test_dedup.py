@@ -0,0 +1,66 @@
+"""
+test_dedup.py
+
+Testy jednostkowe dla modułu `core.dedup` (globalna deduplikacja wierszy).
+
+Sprawdzane przypadki:
+- duplikaty w obrębie chunku i między chunkami są usuwane, pierwsze wystąpienie zostaje,
+- indeks przechowuje 8 bajtów na unikalny wiersz,
+- przy wielu chunkach indeks zgadza się ze zbiorem odcisków, a liczba przebiegów rośnie logarytmicznie,
+- przywrócenie stanu (`rollback`) usuwa odciski dodane po `snapshot`.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from core.dedup import HashIndex
+
+def test_drop_seen_removes_duplicates_across_chunks():
+    """
+    Wiersz powtórzony w kolejnym chunku (oraz w tym samym chunku) powinien zostać usunięty.
+    """
+    first = pd.DataFrame({"VendorID": [1, 2, 2], "fare_amount": [10.0, 12.5, 12.5]})
+    second = pd.DataFrame({"VendorID": [2, 1], "fare_amount": [12.5, 11.0]})
+
+    index = HashIndex()
+    deduplicated = pd.concat([index.drop_seen(first), index.drop_seen(second)], ignore_index=True)
+
+    assert deduplicated.values.tolist() == [[1, 10.0], [2, 12.5], [1, 11.0]]
+    assert index.dropped == 2
+    assert len(index) == 3
+    assert index.nbytes == 3 * 8
+
+def test_hash_index_many_chunks_matches_set():
+    """
+    Maski pierwszych wystąpień w wielu chunkach powinny zgadzać się ze zbiorem Pythona,
+    a przebiegów powinno być O(log n).
+    """
+    rng = np.random.default_rng(7)
+    index = HashIndex()
+    seen = set()
+    for _ in range(200):
+        hashes = rng.integers(0, 5_000, size=300).astype(np.uint64)
+        expected = []
+        for value in hashes.tolist():
+            expected.append(value not in seen)
+            seen.add(value)
+        assert index.add(hashes).tolist() == expected
+        assert len(index._runs) <= math.log2(len(index)) + 1
+
+    assert len(index) == len(seen)
+    assert index.contains(np.array(sorted(seen), dtype=np.uint64)).all()
+    assert not index.contains(np.array([5_000, 10_000], dtype=np.uint64)).any()
+
+def test_hash_index_rollback():
+    """
+    Po `rollback` indeks nie powinien zawierać odcisków dodanych po `snapshot`.
+    """
+    index = HashIndex()
+    index.add(np.arange(10, dtype=np.uint64))
+    state = index.snapshot()
+    index.add(np.arange(5, 50, dtype=np.uint64))
+
+    index.rollback(state)
+
+    assert len(index) == 10
+    assert index.contains(np.array([9, 10], dtype=np.uint64)).tolist() == [True, False]
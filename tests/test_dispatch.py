@@ -0,0 +1,58 @@
+"""
+test_dispatch.py
+
+Testy jednostkowe dla modułu `core.dispatch` (wysyłanie zadań z ograniczeniem liczby zadań w toku).
+
+Sprawdzane przypadki:
+- wejście jest pobierane leniwie – w toku nigdy nie ma więcej zadań niż limit,
+- wyjątek zgłoszony przez zadanie jest przekazywany do wywołującego.
+"""
+
+from multiprocessing import Pool
+import pytest
+from core.chunk_sizing import MIN_TASK_ROWS, rows_per_task
+from core.dispatch import bounded_imap_unordered
+
+def _square(x: int) -> int:
+    """
+    Zadanie testowe (musi być funkcją modułu, aby dało się je przesłać do procesu).
+    """
+    if x < 0:
+        raise ValueError("ujemna liczba")
+    return x * x
+
+def test_bounded_dispatch_limits_in_flight():
+    """
+    Generator wejścia nie powinien wyprzedzać odebranych wyników o więcej niż limit zadań.
+    """
+    pulled = 0
+
+    def items():
+        nonlocal pulled
+        for x in range(20):
+            pulled += 1
+            yield x
+
+    received = {}
+    with Pool(2) as pool:
+        for x, result in bounded_imap_unordered(pool, _square, items(), max_in_flight=3):
+            received[x] = result
+            assert pulled - len(received) <= 3
+
+    assert received == {x: x * x for x in range(20)}
+
+def test_bounded_dispatch_propagates_errors():
+    """
+    Błąd w zadaniu powinien przerwać iterację wyjątkiem z procesu roboczego.
+    """
+    with Pool(2) as pool, pytest.raises(ValueError, match="ujemna"):
+        list(bounded_imap_unordered(pool, _square, [1, -1, 2], max_in_flight=2))
+
+def test_rows_per_task_balances_small_inputs():
+    """
+    Rozmiar zadania powinien maleć dla małych zbiorów, ale nie poniżej MIN_TASK_ROWS i nie powyżej chunksize.
+    """
+    assert rows_per_task(10_000_000, 100_000, workers=8) == 100_000
+    assert rows_per_task(1_000_000, 100_000, workers=8) == 31_250
+    assert rows_per_task(50_000, 100_000, workers=8) == MIN_TASK_ROWS
+    assert rows_per_task(50_000, 8, workers=8) == 8
@@ -0,0 +1,71 @@
+"""
+test_groupby.py
+
+Testy jednostkowe dla modułu `core.groupby` (silnik grupowania i redukcja drzewiasta).
+
+Sprawdzane przypadki:
+- agregaty połączone redukcją drzewiastą z wielu chunków są równe agregatom całego DataFrame,
+- klucze pochodne (godzina odbioru) i kategoryczne o różnych kategoriach w chunkach,
+- brak wymaganych kolumn daje None, a nieznany agregat – ValueError,
+- redukcja drzewiasta przechowuje najwyżej log₂(n) + 1 agregatów.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from core.groupby import GroupBy, TreeReducer
+
+def _trips(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        "VendorID": pd.Categorical(rng.choice([1, 2, 6], rows)),
+        "tpep_pickup_datetime": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 86400, rows), unit="s"),
+        "fare_amount": rng.uniform(3, 60, rows).astype("float32"),
+        "tip_amount": np.where(rng.random(rows) < 0.1, np.nan, rng.uniform(0, 10, rows)),
+    })
+
+def test_tree_reduction_matches_whole_data():
+    """
+    Wynik z 13 chunków (z własnymi kategoriami VendorID) powinien odpowiadać groupby na całości.
+    """
+    df = _trips(10_000)
+    grouping = GroupBy(["VendorID", "pickup_hour"], {
+        "fare_amount": ["count", "sum", "mean", "min", "max"],
+        "tip_amount": ["count", "mean"],
+    })
+    reducer = TreeReducer(grouping.merge)
+    for start in range(0, len(df), 800):
+        chunk = df.iloc[start:start + 800].copy()
+        chunk["VendorID"] = chunk["VendorID"].cat.remove_unused_categories()
+        reducer.add(grouping.partial(chunk))
+    result = grouping.finalize(reducer.result())
+
+    expected = df.astype({"fare_amount": "float64"}).groupby(
+        [df["VendorID"].astype(int), df["tpep_pickup_datetime"].dt.hour.rename("pickup_hour")]
+    ).agg({"fare_amount": ["count", "sum", "mean", "min", "max"], "tip_amount": ["count", "mean"]})
+    assert len(result) == 3 * 24
+    np.testing.assert_allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+    assert list(result.index.get_level_values("VendorID").unique()) == [1, 2, 6]
+
+def test_missing_columns_and_unknown_aggregate():
+    """
+    Brak kolumny klucza lub metryki daje None; nieznany agregat jest błędem konfiguracji.
+    """
+    df = _trips(10)
+    assert GroupBy(["payment_type"], {"fare_amount": ["sum"]}).partial(df) is None
+    assert GroupBy(["VendorID"], {"trip_distance": ["sum"]}).partial(df) is None
+    assert GroupBy(["VendorID"], {"fare_amount": ["sum"]}).merge([None, None]) is None
+    with pytest.raises(ValueError):
+        GroupBy(["VendorID"], {"fare_amount": ["median"]})
+
+def test_tree_reducer_keeps_log_partials():
+    """
+    Po 1000 dołączeniach na stosie jest tyle agregatów, ile jedynek w zapisie binarnym 1000.
+    """
+    merges = []
+    reducer = TreeReducer(lambda parts: merges.append(len(parts)) or sum(parts))
+    for _ in range(1000):
+        reducer.add(1)
+    assert len(reducer) == bin(1000).count("1")
+    assert reducer.result() == 1000
+    assert max(merges[:-1]) == 2
@@ -6,12 +6,18 @@ Testy jednostkowe dla funkcji `load_parquet_in_chunks` z modułu `core.loader`.
 Sprawdzane przypadki:
 - poprawne wczytywanie danych z dużego pliku Parquet w chunkach,
 - obsługa nieistniejącej ścieżki (zwraca pustą listę zamiast wyjątku),
-- poprawne zachowanie przy pustym pliku/parquet mockowanym do pustego DataFrame.
+- poprawne zachowanie przy pustym pliku Parquet,
+- strumieniowe dzielenie na chunki niezależnie od grup wierszy w pliku,
+- filtrowanie podczas odczytu oraz odczyt wielu plików (katalog, glob, partycje Hive),
+- wczytywanie chunków z wyprzedzeniem w tle (prefetching),
+- współbieżny odczyt kilku plików z zachowaniem kolejności plików.
 """
 
 import os
+import threading
 import pandas as pd
-from core.loader import load_parquet_in_chunks
+import pytest
+from core.loader import load_parquet_in_chunks, prefetch_chunks, prefetch_files, resolve_parquet_files
 
 def test_load_parquet_in_chunks_reads_data():
     """
@@ -38,16 +44,143 @@ def test_load_parquet_in_chunks_invalid_path():
 
     assert chunks == [], "Dla nieistniejącego pliku powinien być pusty wynik"
 
-def test_load_parquet_in_chunks_empty_file(monkeypatch):
+def test_load_parquet_in_chunks_empty_file(tmp_path):
     """
-    Gdy `read_parquet` zwraca pusty DataFrame (symulacja pustego pliku),
-    funkcja powinna zwrócić pustą listę.
+    Dla pustego pliku Parquet (0 wierszy) funkcja powinna zwrócić pustą listę.
     """
-    def fake_parquet(*args, **kwargs):
-        return pd.DataFrame()
+    path = tmp_path / "empty.parquet"
+    pd.DataFrame({"trip_distance": pd.Series([], dtype="float64")}).to_parquet(path)
 
-    monkeypatch.setattr(pd, "read_parquet", fake_parquet)
-
-    chunks = list(load_parquet_in_chunks("fake_path.parquet", chunksize=10_000))
+    chunks = list(load_parquet_in_chunks(str(path), chunksize=10_000))
 
     assert chunks == [], "Pusty plik powinien dawać pusty wynik"
+
+def test_load_parquet_in_chunks_streams_row_groups(tmp_path):
+    """
+    Chunki powinny mieć zadany rozmiar niezależnie od podziału pliku na grupy wierszy,
+    a argument `columns` powinien ograniczać wczytywane kolumny.
+    """
+    path = tmp_path / "data.parquet"
+    df = pd.DataFrame({"trip_distance": range(25), "tip_amount": range(25)})
+    df.to_parquet(path, row_group_size=7)
+
+    chunks = list(load_parquet_in_chunks(str(path), chunksize=10, columns=["tip_amount"]))
+
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert all(list(c.columns) == ["tip_amount"] for c in chunks)
+    assert pd.concat(chunks)["tip_amount"].tolist() == list(range(25))
+
+def test_load_parquet_in_chunks_with_filters(tmp_path):
+    """
+    Filtr przekazany do loadera powinien odrzucić rekordy jeszcze przed konwersją do pandas,
+    a chunki powinny zachować zadany rozmiar.
+    """
+    path = tmp_path / "data.parquet"
+    df = pd.DataFrame({"trip_distance": [float(i % 3) for i in range(30)], "tip_amount": range(30)})
+    df.to_parquet(path, row_group_size=4)
+
+    chunks = list(load_parquet_in_chunks(
+        str(path), chunksize=8, columns=["tip_amount"], filters=[("trip_distance", ">", 0)]
+    ))
+
+    assert [len(c) for c in chunks] == [8, 8, 4]
+    assert pd.concat(chunks)["tip_amount"].tolist() == [i for i in range(30) if i % 3]
+
+def test_load_parquet_in_chunks_multiple_files(tmp_path):
+    """
+    Katalog (także z partycjami w stylu Hive) i wzorzec glob powinny być traktowane
+    jak jeden zbiór danych złożony ze wszystkich pasujących plików.
+    """
+    for month in (1, 2):
+        part_dir = tmp_path / "year=2024" / f"month={month:02d}"
+        part_dir.mkdir(parents=True)
+        pd.DataFrame({"tip_amount": [float(month)] * 5}).to_parquet(part_dir / "part-0.parquet")
+
+    files = resolve_parquet_files(str(tmp_path))
+    assert len(files) == 2
+    assert resolve_parquet_files(str(tmp_path / "year=2024" / "month=*" / "*.parquet")) == files
+
+    chunks = list(load_parquet_in_chunks(str(tmp_path), chunksize=3))
+    assert [len(c) for c in chunks] == [3, 2, 3, 2]
+    assert pd.concat(chunks)["tip_amount"].tolist() == [1.0] * 5 + [2.0] * 5
+
+def test_load_parquet_in_chunks_low_memory_matches_default(tmp_path):
+    """
+    Tryb niskiego zużycia pamięci (mmap, konwersja bez kopii) powinien zwracać te same dane,
+    zarówno przy zwykłym odczycie, jak i z filtrem.
+    """
+    path = tmp_path / "data.parquet"
+    df = pd.DataFrame({
+        "trip_distance": [0.5 * i for i in range(20)],
+        "passenger_count": [None if i % 5 == 0 else float(i % 3) for i in range(20)],
+        "store_and_fwd_flag": ["N", "Y"] * 10
+    })
+    df.to_parquet(path, row_group_size=6)
+
+    for filters in (None, [("trip_distance", ">", 2)]):
+        default = pd.concat(load_parquet_in_chunks(str(path), chunksize=7, filters=filters))
+        low_memory = pd.concat(load_parquet_in_chunks(str(path), chunksize=7, filters=filters, low_memory=True))
+        pd.testing.assert_frame_equal(default, low_memory)
+
+def test_prefetch_chunks_keeps_order_and_stops_early():
+    """
+    Prefetcher powinien zachować kolejność chunków, a przerwanie iteracji
+    powinno zamknąć źródło danych.
+    """
+    closed = []
+
+    def source():
+        try:
+            for i in range(10):
+                yield i
+        finally:
+            closed.append(True)
+
+    assert list(prefetch_chunks(source(), depth=3)) == list(range(10))
+
+    closed.clear()
+    prefetched = prefetch_chunks(source(), depth=2)
+    assert [next(prefetched), next(prefetched)] == [0, 1]
+    prefetched.close()
+    assert closed == [True]
+
+def test_prefetch_chunks_propagates_errors():
+    """
+    Wyjątek zgłoszony w wątku czytającym powinien trafić do konsumenta.
+    """
+    def source():
+        yield 1
+        raise RuntimeError("uszkodzony plik")
+
+    prefetched = prefetch_chunks(source(), depth=2)
+    assert next(prefetched) == 1
+    with pytest.raises(RuntimeError, match="uszkodzony plik"):
+        next(prefetched)
+
+def test_prefetch_files_reads_concurrently_in_file_order():
+    """
+    Kolejny plik powinien być czytany, zanim skończy się bieżący, a chunki powinny
+    wrócić w kolejności plików; przerwanie iteracji zamyka wszystkie otwarte źródła.
+    """
+    started = {name: threading.Event() for name in "abc"}
+    closed = []
+
+    def open_file(name):
+        started[name].set()
+        try:
+            if name == "a":
+                # Plik "a" kończy się dopiero, gdy "b" jest już czytany
+                assert started["b"].wait(timeout=5)
+            for i in range(3):
+                yield f"{name}{i}"
+        finally:
+            closed.append(name)
+
+    chunks = list(prefetch_files(["a", "b", "c"], open_file, readers=2))
+    assert chunks == [(name, f"{name}{i}") for name in "abc" for i in range(3)]
+
+    closed.clear()
+    prefetched = prefetch_files(["a", "b", "c"], open_file, readers=2, depth=1)
+    assert next(prefetched) == ("a", "a0")
+    prefetched.close()
+    assert sorted(closed) == ["a", "b"]
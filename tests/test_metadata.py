@@ -0,0 +1,60 @@
+"""
+test_metadata.py
+
+Testy jednostkowe dla modułu `core.metadata` (odpowiedzi z metadanych Parquet).
+
+Sprawdzane przypadki:
+- liczba wierszy i statystyki min/max/braki zgodne z danymi, także dla wielu plików,
+- odczyt pierwszych wierszy tylko z początkowych paczek rekordów, także z kolejnych plików.
+"""
+
+import pandas as pd
+from core.metadata import describe_parquet, get_column_stats, get_row_count, read_head
+
+def _write_month(path, start: int, rows: int) -> None:
+    """
+    Zapisuje plik .parquet z kolejnymi wartościami i jednym brakiem w passenger_count.
+    """
+    pd.DataFrame({
+        "trip_distance": [float(start + i) for i in range(rows)],
+        "passenger_count": [None] + [1.0] * (rows - 1)
+    }).to_parquet(path, row_group_size=4)
+
+def test_row_count_and_stats_from_metadata(tmp_path):
+    """
+    Liczba wierszy i statystyki kolumn powinny odpowiadać danym z wszystkich plików.
+    """
+    _write_month(tmp_path / "2024-01.parquet", start=0, rows=10)
+    _write_month(tmp_path / "2024-02.parquet", start=100, rows=6)
+
+    assert get_row_count(str(tmp_path)) == 16
+
+    stats = get_column_stats(str(tmp_path))
+    assert stats["trip_distance"] == {"min": 0.0, "max": 105.0, "null_count": 0}
+    assert stats["passenger_count"]["null_count"] == 2
+
+    described = describe_parquet(str(tmp_path))
+    assert described.loc["trip_distance", "typ"] == "double"
+    assert described.loc["passenger_count", "braki"] == 2
+
+def test_read_head_reads_leading_row_groups(tmp_path):
+    """
+    Podgląd powinien zwrócić dokładnie `n` pierwszych wierszy, także ponad granicą grup wierszy.
+    """
+    _write_month(tmp_path / "2024-01.parquet", start=0, rows=10)
+
+    head = read_head(str(tmp_path / "2024-01.parquet"), n=6, columns=["trip_distance"])
+
+    assert head["trip_distance"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert read_head(str(tmp_path / "brak" / "*.parquet")).empty
+
+def test_read_head_spans_files(tmp_path):
+    """
+    Gdy pierwszy plik ma mniej niż `n` wierszy, podgląd powinien sięgnąć do kolejnego pliku.
+    """
+    _write_month(tmp_path / "2024-01.parquet", start=0, rows=3)
+    _write_month(tmp_path / "2024-02.parquet", start=100, rows=10)
+
+    head = read_head(str(tmp_path), n=5, columns=["trip_distance"])
+
+    assert head["trip_distance"].tolist() == [0.0, 1.0, 2.0, 100.0, 101.0]
@@ -0,0 +1,89 @@
+"""
+test_od_matrix.py
+
+Testy jednostkowe dla modułu `core.od_matrix` (gęsta macierz źródło–cel).
+
+Sprawdzane przypadki:
+- liczby kursów i średnie odpowiadają groupby pandas po parze stref,
+- macierz połączona z chunków (także po serializacji rzadkiej) jest równa macierzy całości,
+- braki metryk nie zaniżają średnich, a strefy spoza zakresu są pomijane,
+- zapis .npz i odczyt (load_od_matrix) oraz ranking najczęstszych par.
+"""
+
+import pickle
+import numpy as np
+import pandas as pd
+from core.od_matrix import ODMatrix, load_od_matrix
+
+def _trips(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({
+        "PULocationID": rng.integers(1, 40, rows).astype("int32"),
+        "DOLocationID": rng.integers(1, 40, rows).astype("int32"),
+        "fare_amount": rng.uniform(3, 60, rows).astype("float32"),
+        "trip_distance": rng.uniform(0, 20, rows),
+    })
+
+def test_matches_pandas_groupby():
+    """
+    Komórka [PU, DO] zawiera liczbę kursów i średnie tej pary stref.
+    """
+    df = _trips(5_000)
+    matrix = ODMatrix().add(df)
+    expected = df.groupby(["PULocationID", "DOLocationID"]).agg(
+        trips=("fare_amount", "size"), fare=("fare_amount", "mean"), distance=("trip_distance", "mean")
+    )
+    pickup = expected.index.get_level_values(0)
+    dropoff = expected.index.get_level_values(1)
+    assert (matrix.trips[pickup, dropoff] == expected["trips"]).all()
+    assert matrix.total_trips == len(df)
+    np.testing.assert_allclose(matrix.means("fare_amount")[pickup, dropoff], expected["fare"], rtol=1e-6)
+    np.testing.assert_allclose(matrix.means("trip_distance")[pickup, dropoff], expected["distance"])
+
+def test_merged_chunks_match_whole_data():
+    """
+    Macierze chunków przesłane przez pickle (zapis rzadki) po zsumowaniu dają macierz całości.
+    """
+    df = _trips(20_000)
+    merged = ODMatrix()
+    for start in range(0, len(df), 300):
+        chunk = pickle.loads(pickle.dumps(ODMatrix().add(df.iloc[start:start + 300])))
+        merged.merge(chunk)
+    whole = ODMatrix().add(df)
+    assert np.array_equal(merged.trips, whole.trips)
+    np.testing.assert_allclose(merged.sums["fare_amount"], whole.sums["fare_amount"])
+    assert len(pickle.dumps(ODMatrix().add(df.iloc[:300]))) < 20_000
+
+def test_missing_metrics_and_out_of_range_zones():
+    """
+    Brak opłaty w jednym chunku nie zaniża średniej; strefa spoza zakresu i brak strefy są pomijane.
+    """
+    first = pd.DataFrame({
+        "PULocationID": pd.array([1, 1, 500, None], dtype="Int32"),
+        "DOLocationID": pd.array([2, 2, 2, 2], dtype="Int32"),
+        "fare_amount": [10.0, np.nan, 5.0, 5.0],
+        "trip_distance": [1.0, 2.0, 3.0, 4.0],
+    })
+    second = first.iloc[:1].assign(fare_amount=20.0)
+    matrix = ODMatrix().add(second).merge(ODMatrix().add(first))
+    assert matrix.trips[1, 2] == 3
+    assert matrix.skipped == 2
+    assert matrix.means("fare_amount")[1, 2] == 15.0
+    assert matrix.means("trip_distance")[1, 2] == 4 / 3
+    assert np.isnan(matrix.means("fare_amount")[2, 1])
+
+def test_save_load_and_top_pairs(tmp_path):
+    """
+    Plik .npz zawiera liczby kursów i średnie; top_pairs zwraca pary malejąco po liczbie kursów.
+    """
+    matrix = ODMatrix().add(_trips(3_000))
+    path = tmp_path / "od_matrix.npz"
+    matrix.save(str(path))
+    loaded = load_od_matrix(str(path))
+    assert sorted(loaded) == ["fare_amount_mean", "trip_distance_mean", "trips"]
+    assert np.array_equal(loaded["trips"], matrix.trips)
+
+    top = matrix.top_pairs(5)
+    assert top["trips"].is_monotonic_decreasing
+    assert top["trips"].iloc[0] == matrix.trips.max()
+    assert (matrix.trips[top["PULocationID"], top["DOLocationID"]] == top["trips"]).all()
@@ -5,11 +5,51 @@ Testy jednostkowe dla funkcji `parallel_analysis` z modułu `core.pool_processor
 
 Sprawdzane przypadki:
 - poprawna analiza pliku `.parquet` z danymi (czy generuje wynik i pliki wyjściowe),
-- obsługa błędnej/niewłaściwej ścieżki (czy zwraca pusty słownik).
+- obsługa błędnej/niewłaściwej ścieżki (czy zwraca pusty słownik),
+- analiza katalogu z wieloma plikami (podsumowanie globalne, per plik i statystyki kolumn),
+- usuwanie duplikatów występujących w różnych plikach,
+- tryb z walidacją w procesach roboczych zgodny z analizą streamingową,
+- chunk, którego nie da się zwalidować, jest zgłaszany jako błąd (a nie wynik z zerami),
+- statystyki walidacji obejmują wszystkie wiersze (odrzucone przy odczycie w pozycji "pushdown") i zapisy chunków,
+- raporty z połączonych agregatów częściowych zgodne z raportami z całego DataFrame,
+- odczyt grup wierszy przez procesy robocze daje ten sam wynik co wysyłanie chunków,
+- wyniki dołączane w dowolnej kolejności dają podgląd anomalii w kolejności zbioru danych.
 """
 
+import json
 import os
-from core.pool_processor import parallel_analysis
+from functools import partial
+import pandas as pd
+import pyarrow.parquet as pq
+from core.analyzer import streaming_global_analysis
+from core.pool_processor import (
+    _RunningAggregate,
+    aggregate_results,
+    parallel_analysis,
+    process_chunk,
+    vendor_partial,
+    merge_vendor_partials,
+    anomalies_partial,
+    merge_anomalies_partials,
+    merge_totals
+)
+from validation.validation_runner import build_pushdown_filter
+
+
+def _write_trips(path, rows: int, vendor: int, distance: float) -> None:
+    """
+    Zapisuje prosty plik .parquet z kolumnami wymaganymi przez analizę
+    (kolejne kursy różnią się czasem odbioru, więc nie są duplikatami).
+    """
+    pd.DataFrame({
+        "VendorID": [vendor] * rows,
+        "tpep_pickup_datetime": pd.date_range(f"2024-0{vendor}-01", periods=rows, freq="min"),
+        "passenger_count": [1.0] * rows,
+        "trip_distance": [distance] * rows,
+        "fare_amount": [10.0] * rows,
+        "tip_amount": [2.0] * rows,
+        "total_amount": [12.0] * rows
+    }).to_parquet(path)
 
 def test_parallel_analysis_runs():
     """
@@ -54,3 +94,187 @@ def test_parallel_analysis_invalid_path():
     result = parallel_analysis(path, chunksize=100_000)
 
     assert result == {}, "Dla nieistniejącego pliku wynik powinien być pustym słownikiem"
+
+def test_parallel_analysis_multiple_files(tmp_path, monkeypatch):
+    """
+    Katalog z kilkoma plikami powinien dać jedno globalne podsumowanie
+    oraz raport z podsumowaniami częściowymi dla każdego pliku.
+    """
+    monkeypatch.chdir(tmp_path)
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _write_trips(raw_dir / "yellow_tripdata_2024-01.parquet", rows=30, vendor=1, distance=2.0)
+    _write_trips(raw_dir / "yellow_tripdata_2024-02.parquet", rows=20, vendor=2, distance=12.0)
+
+    result = parallel_analysis(str(raw_dir), chunksize=8)
+
+    assert result["Liczba rekordów"] == 50
+    assert result["Liczba długich kursów (>10 mil)"] == 20
+    assert result["Średnia długość trasy (mile)"] == 6.0
+
+    with open("data/output/per_file_summary.txt", encoding="utf-8") as f:
+        report = f.read()
+    assert "yellow_tripdata_2024-01.parquet" in report
+    assert "yellow_tripdata_2024-02.parquet" in report
+    assert "Liczba rekordów: 30" in report
+    assert "Liczba rekordów: 20" in report
+
+    with open("data/output/column_stats.txt", encoding="utf-8") as f:
+        column_stats = f.read()
+    assert "trip_distance" in column_stats
+
+def test_parallel_analysis_drops_duplicates_across_files(tmp_path, monkeypatch):
+    """
+    Ten sam kurs zapisany w dwóch plikach powinien zostać policzony tylko raz.
+    """
+    monkeypatch.chdir(tmp_path)
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _write_trips(raw_dir / "yellow_tripdata_2024-01.parquet", rows=30, vendor=1, distance=2.0)
+    _write_trips(raw_dir / "yellow_tripdata_2024-01-copy.parquet", rows=30, vendor=1, distance=2.0)
+
+    assert parallel_analysis(str(raw_dir), chunksize=8)["Liczba rekordów"] == 30
+    assert parallel_analysis(str(raw_dir), chunksize=8, deduplicate=False)["Liczba rekordów"] == 60
+
+def test_validated_parallel_matches_streaming(tmp_path, monkeypatch):
+    """
+    Analiza równoległa z walidacją powinna dać to samo podsumowanie co analiza streamingowa.
+    """
+    monkeypatch.chdir(tmp_path)
+    rows = 40
+    path = tmp_path / "trips.parquet"
+    pd.DataFrame({
+        "VendorID": [1, 2] * (rows // 2),
+        "passenger_count": [0.0, 1.0, 2.0, 1.0] * (rows // 4),
+        "trip_distance": [float(i % 15) for i in range(rows)],
+        "fare_amount": [10.0] * rows,
+        "tip_amount": [2.0, -1.0] * (rows // 2),
+        "total_amount": [12.0] * rows,
+        "tpep_pickup_datetime": pd.date_range("2024-01-01", periods=rows, freq="h"),
+        "tpep_dropoff_datetime": pd.date_range("2024-01-01 00:30", periods=rows, freq="h")
+    }).to_parquet(path)
+
+    validated = parallel_analysis(str(path), chunksize=8, validate=True)
+    streaming = streaming_global_analysis(str(path), chunksize=8)
+
+    # Analiza równoległa dodaje do podsumowania przybliżone kwantyle
+    assert {key: validated[key] for key in streaming} == streaming
+    assert "trip_distance – mediana (≈)" in validated
+    assert 0 < validated["Liczba rekordów"] < rows
+    assert os.path.exists("data/output/validation_stats.json")
+
+def test_validation_stats_cover_all_rows(tmp_path, monkeypatch):
+    """
+    Wiersze odrzucone przez filtr pushdown powinny trafić do pozycji "pushdown" statystyk,
+    pozostałe – do reguł, a wyłączenie zapisu statystyk nie powinno zmieniać wyniku.
+    """
+    monkeypatch.chdir(tmp_path)
+    rows = 40
+    path = tmp_path / "trips.parquet"
+    pd.DataFrame({
+        "VendorID": [1, 2] * (rows // 2),
+        "passenger_count": [0.0, 1.0, 2.0, 1.0] * (rows // 4),
+        "trip_distance": [float(i % 15) for i in range(rows)],
+        "fare_amount": [10.0] * rows,
+        "tip_amount": [2.0] * rows,
+        "total_amount": [12.0] * rows,
+        "tpep_pickup_datetime": pd.date_range("2024-01-01", periods=rows, freq="h"),
+        "tpep_dropoff_datetime": pd.date_range("2024-01-01 00:30", periods=rows, freq="h")
+    }).to_parquet(path)
+    scanned = pq.read_table(path).filter(build_pushdown_filter()).num_rows
+
+    for analysis in (streaming_global_analysis, partial(parallel_analysis, validate=True)):
+        summary = analysis(str(path), chunksize=8)
+        with open("data/output/validation_stats.json", encoding="utf-8") as f:
+            report = json.load(f)
+
+        assert scanned < rows
+        assert report["pushdown"] == {"rows_total": rows, "rejected": rows - scanned}
+        assert report["rows_in"] == scanned
+        assert sum(chunk["rows_in"] for chunk in report["per_chunk"]) == scanned
+        assert len(report["per_chunk"]) == report["chunks"]
+        os.remove("data/output/validation_stats.json")
+
+        # Przybliżone kwantyle zależą od kolejności ukończenia zadań
+        pushdown = analysis(str(path), chunksize=8, collect_stats=False)
+        assert {key: pushdown[key] for key in summary if "(≈)" not in key} == \
+            {key: value for key, value in summary.items() if "(≈)" not in key}
+        assert not os.path.exists("data/output/validation_stats.json")
+
+def test_process_chunk_reports_validation_error():
+    """
+    Chunk bez wymaganych kolumn powinien dać wynik z kluczem "error", a nie zero wierszy.
+    """
+    df = pd.DataFrame({"passenger_count": [1.0], "trip_distance": [2.0], "fare_amount": [10.0]})
+
+    result = process_chunk(df, validate=True)
+
+    assert "Brakuje wymaganych kolumn" in result["error"]
+    assert "rows" not in result
+    assert merge_totals(None, result) is None
+
+def test_merged_partials_match_whole_dataframe():
+    """
+    Agregaty częściowe z kilku chunków po połączeniu powinny dać te same średnie, maksima
+    i anomalie co obliczenia na całym DataFrame.
+    """
+    df = pd.DataFrame({
+        "VendorID": [1, 2, 1, 2, 1, 1],
+        "fare_amount": [10.0, 20.0, 30.0, 5.0, 7.0, 9.0],
+        "tip_amount": [1.0, 25.0, 3.0, 6.0, 0.5, 10.0],
+        "total_amount": [12.0, 22.0, 33.0, 5.5, 8.0, 9.5],
+        "trip_distance": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    })
+    chunks = [df.iloc[:2], df.iloc[2:5], df.iloc[5:]]
+
+    merged = merge_vendor_partials([vendor_partial(chunk) for chunk in chunks])
+    whole = vendor_partial(df)
+    pd.testing.assert_frame_equal(merged, whole, check_names=False, check_index_type=False)
+    assert merged.loc[1, ("fare_amount", "sum")] / merged.loc[1, ("fare_amount", "count")] == 14.0
+
+    anomalies = merge_anomalies_partials([anomalies_partial(chunk) for chunk in chunks])
+    assert anomalies["count"] == 3
+    assert anomalies["head"]["tip_amount"].tolist() == [25.0, 6.0, 10.0]
+
+def test_row_group_dispatch_matches_chunks(tmp_path, monkeypatch):
+    """
+    Deskryptory grup wierszy powinny dać to samo podsumowanie co chunki dekodowane
+    w procesie głównym – także z deduplikacją między plikami.
+    """
+    monkeypatch.chdir(tmp_path)
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _write_trips(raw_dir / "yellow_tripdata_2024-01.parquet", rows=30, vendor=1, distance=2.0)
+    _write_trips(raw_dir / "yellow_tripdata_2024-01-copy.parquet", rows=30, vendor=1, distance=2.0)
+    _write_trips(raw_dir / "yellow_tripdata_2024-02.parquet", rows=20, vendor=2, distance=12.0)
+
+    for deduplicate, rows in ((True, 50), (False, 80)):
+        chunks = parallel_analysis(str(raw_dir), chunksize=8, deduplicate=deduplicate)
+        row_groups = parallel_analysis(str(raw_dir), chunksize=8, deduplicate=deduplicate, dispatch="row_groups")
+        assert row_groups == chunks
+        assert row_groups["Liczba rekordów"] == rows
+
+def test_running_aggregate_is_order_independent():
+    """
+    Wyniki zadań dołączane w odwrotnej kolejności powinny dać to samo podsumowanie
+    i ten sam podgląd anomalii co połączenie agregatów w kolejności chunków.
+    """
+    df = pd.DataFrame({
+        "VendorID": [1, 2] * 15,
+        "passenger_count": [1.0] * 30,
+        "trip_distance": [float(i) for i in range(30)],
+        "fare_amount": [10.0] * 30,
+        "tip_amount": [float(i) for i in range(30)],
+        "total_amount": [12.0] * 30
+    })
+    chunks = [df.iloc[start:start + 6] for start in range(0, 30, 6)]
+    results = [process_chunk(chunk) for chunk in chunks]
+
+    aggregate = _RunningAggregate(["trips.parquet"])
+    for task_no in reversed(range(len(results))):
+        aggregate.add(task_no, "trips.parquet", [results[task_no]])
+
+    expected = merge_anomalies_partials([r["anomalies"] for r in results])
+    assert aggregate.summary() == aggregate_results(results)
+    assert aggregate.anomalies()["count"] == expected["count"] == 17
+    pd.testing.assert_frame_equal(aggregate.anomalies()["head"], expected["head"])
@@ -0,0 +1,50 @@
+"""
+test_quantiles.py
+
+Testy jednostkowe dla modułu `core.quantiles` (szkic kwantyli KLL).
+
+Sprawdzane przypadki:
+- dla małej liczby wartości szkic jest dokładny,
+- szkic połączony z wielu chunków mieści się w deklarowanym błędzie rangi przy stałym rozmiarze,
+- braki danych są pomijane, a pusty szkic zwraca None.
+"""
+
+import numpy as np
+import pandas as pd
+from core.quantiles import KLLSketch, merge_sketches, sketch_columns
+
+def test_small_input_is_exact():
+    """
+    Bez kompakcji kwantyl to wartość o randze ⌈q·n⌉.
+    """
+    sketch = KLLSketch().update(np.array([5.0, 1.0, 4.0, 2.0, 3.0]))
+    assert [sketch.quantile(q) for q in (0, 0.2, 0.5, 0.9, 1)] == [1.0, 1.0, 3.0, 5.0, 5.0]
+
+def test_merged_sketch_rank_error():
+    """
+    Szkic z 1 mln wartości w 27 chunkach powinien mieć błąd rangi poniżej 1% i rozmiar rzędu k.
+    """
+    values = np.random.default_rng(3).lognormal(2, 1, 1_000_000)
+    chunks = [pd.DataFrame({"fare_amount": values[i:i + 37_000]}) for i in range(0, len(values), 37_000)]
+
+    sketches = None
+    for chunk in chunks:
+        sketches = merge_sketches(sketches, sketch_columns(chunk, ["fare_amount", "tip_amount"], k=200))
+
+    sketch = sketches["fare_amount"]
+    ordered = np.sort(values)
+    for q in (0.5, 0.95, 0.99):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.01
+    assert len(sketch) == len(values)
+    assert sketch.size < 3 * 200
+    assert set(sketches) == {"fare_amount"}
+
+def test_missing_values_and_empty_sketch():
+    """
+    NaN/NA powinny być pomijane; szkic bez wartości zwraca None.
+    """
+    sketch = KLLSketch().update(pd.array([1, None, 3], dtype="Int8"))
+    assert len(sketch) == 2
+    assert sketch.quantile(0.5) == 1.0
+    assert KLLSketch().merge(KLLSketch()).quantile(0.5) is None
@@ -0,0 +1,79 @@
+"""
+test_rollups.py
+
+Testy jednostkowe dla modułu `core.rollups` (agregaty czasowe w gęstych tablicach).
+
+Sprawdzane przypadki:
+- koszyki godziny, dnia tygodnia i dnia zgadzają się z akcesorami `.dt` pandas,
+- agregaty połączone z chunków o różnych zakresach dni są równe agregatom całości,
+- braki czasu i metryk są pomijane w licznościach i średnich,
+- zapis do CSV i odczyt (load_time_rollups) zachowują tabele.
+"""
+
+import numpy as np
+import pandas as pd
+from core.rollups import TimeRollup, load_time_rollups, pickup_buckets, write_time_rollups
+
+def _trips(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "tpep_pickup_datetime": pd.Timestamp("2023-12-25") + pd.to_timedelta(rng.integers(0, 20 * 86400, rows), unit="s"),
+        "fare_amount": rng.uniform(3, 60, rows).astype("float32"),
+        "tip_amount": rng.uniform(0, 10, rows),
+        "trip_distance": rng.uniform(0, 20, rows),
+        "total_amount": rng.uniform(5, 80, rows),
+    }).sort_values("tpep_pickup_datetime", ignore_index=True)
+
+def test_buckets_match_pandas_accessors():
+    """
+    Arytmetyka całkowita na datetime64 daje te same koszyki co `.dt.hour` i `.dt.weekday`.
+    """
+    timestamps = pd.Series(pd.to_datetime(["1969-12-31 23:30", "2024-01-01 00:00", "2024-03-10 13:59", None]))
+    buckets = pickup_buckets(timestamps)
+    valid = timestamps.dropna()
+    assert buckets["valid"].tolist() == [True, True, True, False]
+    assert buckets["hour"].tolist() == valid.dt.hour.tolist()
+    assert buckets["weekday"].tolist() == valid.dt.weekday.tolist()
+    assert pd.to_datetime(buckets["day"], unit="D").tolist() == valid.dt.normalize().tolist()
+
+def test_merged_chunks_match_whole_data():
+    """
+    Chunki posortowane po czasie mają rozłączne zakresy dni – po połączeniu wynik jest jak dla całości.
+    """
+    df = _trips(20_000)
+    merged = TimeRollup()
+    for start in reversed(range(0, len(df), 3_000)):
+        merged.merge(TimeRollup().add(df.iloc[start:start + 3_000]))
+    whole = TimeRollup().add(df)
+    for name, frame in whole.frames().items():
+        pd.testing.assert_frame_equal(merged.frames()[name], frame)
+
+    hourly = df.groupby(df["tpep_pickup_datetime"].dt.hour)["fare_amount"].agg(["count", "mean"])
+    assert merged.frames()["hour"]["trips"].tolist() == hourly["count"].tolist()
+    np.testing.assert_allclose(merged.frames()["hour"]["fare_amount_mean"], hourly["mean"], rtol=1e-6)
+    assert len(merged.frames()["day"]) == 20
+
+def test_missing_values_are_skipped():
+    """
+    Wiersz bez czasu nie jest liczony, a brak metryki nie zaniża średniej.
+    """
+    df = pd.DataFrame({
+        "tpep_pickup_datetime": pd.to_datetime(["2024-01-01 08:10", "2024-01-01 08:50", None]),
+        "fare_amount": [10.0, np.nan, 30.0],
+    })
+    hour = TimeRollup(metrics=["fare_amount", "tip_amount"]).add(df).frames()["hour"].loc[8]
+    assert hour["trips"] == 2
+    assert hour["fare_amount_mean"] == 10.0
+    assert np.isnan(hour["tip_amount_mean"])
+
+def test_csv_round_trip(tmp_path):
+    """
+    Tabele odczytane z pliku CSV odpowiadają tabelom TimeRollup.frames().
+    """
+    rollup = TimeRollup().add(_trips(2_000))
+    path = tmp_path / "time_rollups.csv"
+    write_time_rollups(rollup, str(path))
+    loaded = load_time_rollups(str(path))
+    for name, frame in rollup.frames().items():
+        pd.testing.assert_frame_equal(loaded[name], frame, check_index_type=False, check_freq=False, atol=1e-4)
+    assert load_time_rollups(str(tmp_path / "brak.csv")) == {}
@@ -0,0 +1,76 @@
+"""
+test_run_options.py
+
+Testy jednostkowe dla modułu `core.run_options` (opcje przebiegu i przygotowanie puli procesów).
+
+Sprawdzane przypadki:
+- kopia opcji ze zmienionymi polami nie zmienia oryginału, a nieznana opcja jest błędem,
+- przygotowanie przebiegu: pliki, rozmiar zadania z budżetu pamięci, indeks deduplikacji,
+- analiza równoległa z obiektem opcji daje ten sam wynik co z pojedynczymi opcjami.
+"""
+
+import pandas as pd
+import pytest
+import core.analyzer as analyzer
+from core.chunk_sizing import MIN_CHUNK_ROWS
+from core.pool_processor import parallel_analysis
+from core.run_options import AnalysisOptions, prepare_run
+
+def _write_trips(path, rows: int = 40) -> None:
+    """
+    Zapisuje prosty plik .parquet z kolumnami wymaganymi przez analizę.
+    """
+    pd.DataFrame({
+        "VendorID": [1, 2] * (rows // 2),
+        "tpep_pickup_datetime": pd.date_range("2024-01-01", periods=rows, freq="min"),
+        "passenger_count": [1.0, 2.0] * (rows // 2),
+        "trip_distance": [2.0, 12.0] * (rows // 2),
+        "fare_amount": [10.0, 30.0] * (rows // 2),
+        "tip_amount": [2.0, 5.0] * (rows // 2),
+        "total_amount": [12.0, 35.0] * (rows // 2)
+    }).to_parquet(path)
+
+def test_replace_copies_options():
+    """
+    `replace` powinno zwrócić zmienioną kopię i odrzucić nieznaną opcję.
+    """
+    options = AnalysisOptions(chunksize=8)
+
+    changed = options.replace(dispatch="row_groups")
+
+    assert (changed.chunksize, changed.dispatch) == (8, "row_groups")
+    assert options.dispatch == "chunks"
+    with pytest.raises(TypeError, match="chunk_size"):
+        options.replace(chunk_size=8)
+
+def test_prepare_run(tmp_path):
+    """
+    Przygotowanie przebiegu powinno wyznaczyć pliki, rozmiar zadania i indeks deduplikacji.
+    """
+    path = tmp_path / "trips.parquet"
+    _write_trips(path)
+
+    run = prepare_run(str(path), AnalysisOptions(chunksize=8))
+    assert run.files == [str(path)]
+    assert (run.total_rows, run.chunksize) == (40, 8)
+    assert run.index is not None and run.max_in_flight >= run.workers
+
+    # Budżet zastępuje chunksize (tu: dolna granica rozmiaru chunku)
+    budgeted = prepare_run(str(path), AnalysisOptions(chunksize=8, memory_budget="1 KB", deduplicate=False))
+    assert budgeted.chunksize == MIN_CHUNK_ROWS
+    assert budgeted.index is None
+
+    with pytest.raises(ValueError):
+        prepare_run(str(path), AnalysisOptions(transport="mmap"))
+
+def test_parallel_analysis_accepts_options(tmp_path, monkeypatch):
+    """
+    Obiekt opcji i pojedyncze opcje (nadpisujące obiekt) powinny dawać ten sam wynik.
+    """
+    monkeypatch.chdir(tmp_path)
+    _write_trips(tmp_path / "trips.parquet")
+    options = AnalysisOptions(chunksize=8, transport="shm")
+
+    assert parallel_analysis("trips.parquet", options) == parallel_analysis("trips.parquet", chunksize=8, transport="shm")
+    assert parallel_analysis("trips.parquet", options, dispatch="row_groups")["Liczba rekordów"] == 40
+    assert analyzer.parallel_analysis("trips.parquet", options)["Liczba rekordów"] == 40
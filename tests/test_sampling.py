@@ -0,0 +1,60 @@
+"""
+test_sampling.py
+
+Testy jednostkowe dla modułu `core.sampling` (losowanie próbek do wizualizacji).
+
+Sprawdzane przypadki:
+- losowanie grup wierszy obejmuje cały zbiór danych i jest powtarzalne dla ziarna,
+- próbka rezerwuarowa ma zadany rozmiar i nie zależy od podziału danych na chunki,
+- alokacja proporcjonalna i równa w próbce warstwowej.
+"""
+
+import numpy as np
+import pandas as pd
+from core.sampling import StratifiedReservoir, select_row_groups
+
+def test_select_row_groups_spans_dataset(tmp_path):
+    """
+    Wybrane grupy wierszy powinny pochodzić z całego zbioru, a nie tylko z jego początku.
+    """
+    for month in ("2024-01", "2024-02"):
+        pd.DataFrame({"x": range(100)}).to_parquet(tmp_path / f"{month}.parquet", row_group_size=10)
+
+    selected = select_row_groups(str(tmp_path), target_rows=50, seed=1)
+
+    assert selected == select_row_groups(str(tmp_path), target_rows=50, seed=1)
+    assert len(selected) == 8  # min_row_groups > 50 / 10
+    assert len({file for file, _ in selected}) == 2
+    assert max(rg for _, rg in selected) > 4
+
+def test_reservoir_independent_of_chunking():
+    """
+    Próbka prosta powinna mieć zadany rozmiar i być taka sama niezależnie od podziału na chunki.
+    """
+    df = pd.DataFrame({"x": range(1000)})
+
+    whole = StratifiedReservoir(100, seed=7)
+    whole.add(df)
+    chunked = StratifiedReservoir(100, seed=7)
+    for start in range(0, 1000, 250):
+        chunked.add(df.iloc[start:start + 250])
+
+    assert len(whole.result()) == 100
+    assert whole.result()["x"].is_unique
+    assert sorted(whole.result()["x"]) == sorted(chunked.result()["x"])
+
+def test_stratified_allocation():
+    """
+    Alokacja proporcjonalna powinna odwzorować udziały warstw, a równa – wyrównać je.
+    """
+    df = pd.DataFrame({"VendorID": np.repeat([1, 2], [9000, 1000])})
+    chunks = [df.iloc[start:start + 1000] for start in range(0, 10_000, 1000)]
+
+    proportional = StratifiedReservoir(500, stratify_by="VendorID", seed=3)
+    equal = StratifiedReservoir(500, stratify_by="VendorID", allocation="equal", seed=3)
+    for chunk in chunks:
+        proportional.add(chunk)
+        equal.add(chunk)
+
+    assert proportional.result()["VendorID"].value_counts().to_dict() == {1: 450, 2: 50}
+    assert equal.result()["VendorID"].value_counts().to_dict() == {1: 250, 2: 250}
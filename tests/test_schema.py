@@ -0,0 +1,76 @@
+"""
+test_schema.py
+
+Testy jednostkowe dla kompaktowego schematu typów z modułu `core.schema`.
+
+Sprawdzane przypadki:
+- rzutowanie kolumn DataFrame na typy ze schematu,
+- kolumna, której nie da się zrzutować, zachowuje oryginalny typ (reszta jest rzutowana),
+- stosowanie schematu podczas odczytu pliku Parquet (po stronie Arrow),
+- sumowanie kolumn float32 bez utraty precyzji.
+"""
+
+import pandas as pd
+from core.loader import load_parquet_in_chunks
+from core.schema import TAXI_DTYPES, apply_schema, column_sum
+
+def _raw_trips() -> pd.DataFrame:
+    """
+    Tworzy fragment danych o typach jak w surowych plikach NYC Taxi.
+    """
+    return pd.DataFrame({
+        "VendorID": pd.Series([1, 2, 2], dtype="int32"),
+        "passenger_count": [1.0, None, 3.0],
+        "trip_distance": [1.5, 2.5, 3.5],
+        "tip_amount": [1.0, 2.0, 3.0],
+        "total_amount": [10.0, 20.0, 30.0],
+        "PULocationID": pd.Series([10, 20, 30], dtype="int32")
+    })
+
+def test_apply_schema_casts_known_columns():
+    """
+    Kolumny ze schematu powinny otrzymać kompaktowe typy, a pozostałe zostać bez zmian.
+    """
+    df = apply_schema(_raw_trips())
+
+    assert str(df["VendorID"].dtype) == "category"
+    assert str(df["passenger_count"].dtype) == "Int8"
+    assert df["passenger_count"].isna().tolist() == [False, True, False]
+    assert str(df["tip_amount"].dtype) == "float32"
+    assert str(df["trip_distance"].dtype) == "float64"
+    assert str(df["PULocationID"].dtype) == "int32"
+
+def test_apply_schema_keeps_uncastable_column():
+    """
+    Wartość niecałkowita w kolumnie Int8 nie powinna przerywać rzutowania pozostałych kolumn.
+    """
+    raw = _raw_trips()
+    raw["passenger_count"] = [1.5, None, 300.0]
+    df = apply_schema(raw)
+
+    assert str(df["passenger_count"].dtype) == "float64"
+    assert df["passenger_count"].tolist()[::2] == [1.5, 300.0]
+    assert str(df["VendorID"].dtype) == "category"
+    assert str(df["tip_amount"].dtype) == "float32"
+    assert len(df) == 3
+
+def test_loader_applies_schema_while_reading(tmp_path):
+    """
+    Loader ze schematem powinien zwracać te same typy co `apply_schema`, zużywając mniej pamięci.
+    """
+    path = tmp_path / "trips.parquet"
+    _raw_trips().to_parquet(path)
+
+    raw = pd.concat(load_parquet_in_chunks(str(path)))
+    compact = pd.concat(load_parquet_in_chunks(str(path), dtypes=TAXI_DTYPES))
+
+    assert compact.dtypes.astype(str).tolist() == apply_schema(raw).dtypes.astype(str).tolist()
+    assert compact["passenger_count"].sum() == 4
+    assert compact.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum()
+
+def test_column_sum_uses_float64_accumulator():
+    """
+    Suma kolumny float32 powinna być liczona w float64.
+    """
+    series = pd.Series([0.1] * 1_000_000, dtype="float32")
+    assert abs(column_sum(series) - 100_000.0) < 0.01
@@ -0,0 +1,59 @@
+"""
+test_transport.py
+
+Testy jednostkowe dla modułu `core.transport` (przekazywanie chunków przez pamięć współdzieloną).
+
+Sprawdzane przypadki:
+- chunk odczytany z pamięci współdzielonej jest identyczny z oryginałem (także typy kolumn),
+- analiza równoległa z transportem "shm" daje ten sam wynik co z "pickle" i nie zostawia bloków.
+"""
+
+import pickle
+import pandas as pd
+import pytest
+from core.pool_processor import parallel_analysis
+from core.transport import SharedFrame, unwrap
+
+def test_shared_frame_round_trip():
+    """
+    Uchwyt po serializacji powinien odtworzyć ten sam DataFrame w innym „procesie”.
+    """
+    df = pd.DataFrame({
+        "VendorID": pd.array([1, 2, None], dtype="Int8"),
+        "store_and_fwd_flag": pd.Categorical(["N", "Y", "N"]),
+        "tpep_pickup_datetime": pd.date_range("2024-01-01", periods=3, freq="min"),
+        "fare_amount": [10.0, 12.5, 7.0]
+    })
+
+    frame = SharedFrame.create(df)
+    try:
+        handle = pickle.loads(pickle.dumps(frame))
+        assert len(pickle.dumps(frame)) < 200
+        pd.testing.assert_frame_equal(unwrap(handle), df)
+    finally:
+        frame.release()
+
+    with pytest.raises(FileNotFoundError):
+        SharedFrame(frame.name, frame.size, frame.rows).load()
+
+def test_parallel_analysis_shm_matches_pickle(tmp_path, monkeypatch):
+    """
+    Sposób przekazania chunków nie powinien wpływać na wynik analizy.
+    """
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({
+        "VendorID": [1, 2] * 20,
+        "tpep_pickup_datetime": pd.date_range("2024-01-01", periods=40, freq="min"),
+        "passenger_count": [1.0, 2.0] * 20,
+        "trip_distance": [2.0, 12.0] * 20,
+        "fare_amount": [10.0, 30.0] * 20,
+        "tip_amount": [2.0, 5.0] * 20,
+        "total_amount": [12.0, 35.0] * 20
+    }).to_parquet(tmp_path / "trips.parquet")
+
+    pickled = parallel_analysis("trips.parquet", chunksize=8)
+    shared = parallel_analysis("trips.parquet", chunksize=8, transport="shm")
+
+    assert shared == pickled
+    assert shared["Liczba rekordów"] == 40
+    assert parallel_analysis("trips.parquet", transport="mmap") == {}
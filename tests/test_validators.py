@@ -7,12 +7,17 @@ Sprawdzane przypadki:
 - poprawna walidacja czystych danych,
 - odrzucanie niepoprawnych lub niekompletnych wierszy,
 - sprawdzanie poprawności kolumn i wartości null,
-- wykrywanie złych zakresów czasu i duplikatów.
+- wykrywanie złych zakresów czasu i duplikatów,
+- tłumaczenie prostych reguł na filtr pyarrow (predicate pushdown),
+- zgodność walidacji jedną połączoną maską z walidacją sekwencyjną,
+- statystyki odrzuceń per reguła i per chunk oraz ich łączenie między chunkami.
 """
 
 import pandas as pd
+import pyarrow as pa
 import pytest
-from validation.validation_runner import run_all_validations
+from validation.validation_runner import run_all_validations, build_pushdown_filter, validate_chunk
+from validation.stats import ValidationStats
 
 def test_validators_pass_on_clean_data():
     """
@@ -110,3 +115,69 @@ def test_duplicates_are_removed():
 
     validated_df = run_all_validations(df)
     assert len(validated_df) == 1
+
+def test_pushdown_filter_matches_simple_rules():
+    """
+    Filtr pyarrow zbudowany z walidatorów powinien odrzucić te same rekordy co proste reguły.
+    """
+    df = pd.DataFrame({
+        "trip_distance": [1.0, -5.0, 2.0],
+        "fare_amount": [10.0, 10.0, 10.0],
+        "total_amount": [15.0, 15.0, 15.0],
+        "passenger_count": [1, 1, 0],
+        "tip_amount": [1.5, 1.0, 1.0],
+        "tpep_pickup_datetime": pd.to_datetime(["2024-01-01 00:00"] * 3),
+        "tpep_dropoff_datetime": pd.to_datetime(["2024-01-01 01:00"] * 3)
+    })
+
+    filtered = pa.Table.from_pandas(df).filter(build_pushdown_filter()).to_pandas()
+    assert filtered["trip_distance"].tolist() == [1.0]
+
+def test_fused_mask_matches_sequential_validation():
+    """
+    Walidacja jedną połączoną maską powinna dać ten sam wynik co sekwencja walidatorów.
+    """
+    df = pd.DataFrame({
+        "trip_distance": [1.0, -5.0, 2.0, 2.0, 3.0, None],
+        "fare_amount": [10.0, 10.0, 12.0, 12.0, 10.0, 10.0],
+        "total_amount": [15.0, 15.0, 16.0, 16.0, 15.0, 15.0],
+        "passenger_count": pd.array([1, 1, 2, 2, None, 1], dtype="Int8"),
+        "tip_amount": [1.5, 1.0, 1.0, 1.0, 1.0, 1.0],
+        "tpep_pickup_datetime": pd.to_datetime(["2024-01-01 00:00"] * 6),
+        "tpep_dropoff_datetime": pd.to_datetime(
+            ["2024-01-01 01:00"] * 3 + ["2024-01-01 01:00", "2024-01-02 02:00", "2024-01-01 01:00"]
+        )
+    })
+
+    fused = validate_chunk(df)
+    pd.testing.assert_frame_equal(fused, validate_chunk(df, fused=False))
+    assert fused["trip_distance"].tolist() == [1.0, 2.0]
+
+def test_validation_stats_per_rule():
+    """
+    Statystyki powinny zliczać odrzucenia każdej reguły i sumować się między chunkami.
+    """
+    df = pd.DataFrame({
+        "trip_distance": [1.0, -5.0, 2.0, -1.0],
+        "fare_amount": [10.0, 10.0, -1.0, 10.0],
+        "total_amount": [15.0, 15.0, 15.0, 15.0],
+        "passenger_count": [1, 1, 1, 1],
+        "tip_amount": [1.5, 1.0, 1.0, 1.0],
+        "tpep_pickup_datetime": pd.to_datetime(["2024-01-01 00:00"] * 4),
+        "tpep_dropoff_datetime": pd.to_datetime(["2024-01-01 01:00"] * 4)
+    })
+
+    stats = ValidationStats()
+    validate_chunk(df, stats=stats)
+    other = ValidationStats()
+    validate_chunk(df, stats=other)
+    report = stats.merge(other).to_dict()
+
+    assert (report["chunks"], report["rows_in"], report["rows_out"]) == (2, 8, 2)
+    rules = {r["rule"]: r for r in report["rules"]}
+    assert rules["PositiveDistanceValidator"]["rejected"] == 4
+    assert rules["PositiveDistanceValidator"]["rejected_only"] == 4
+    assert rules["PositiveFareValidator"]["rejected"] == 2
+    assert rules["NoMissingValuesValidator"]["rejected"] == 0
+    assert [(c["chunk"], c["rows_in"], c["rows_out"]) for c in report["per_chunk"]] == [(0, 4, 1), (1, 4, 1)]
+    assert report["per_chunk"][1]["rejected"]["PositiveDistanceValidator"] == 2
@@ -0,0 +1,51 @@
+"""
+test_work_units.py
+
+Testy jednostkowe dla modułu `core.work_units` (jednostki pracy adresowane grupami wierszy).
+
+Sprawdzane przypadki:
+- planowanie łączy kolejne grupy wierszy pliku do zadanego rozmiaru jednostki,
+- jednostka z maską deduplikacji zwraca tylko wiersze z maski (także po serializacji).
+"""
+
+import pickle
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from core.work_units import load_work_unit, plan_work_units
+
+def _write_row_groups(path, rows: int, row_group_size: int) -> None:
+    """
+    Zapisuje plik .parquet z kolumną `trip_id` podzielony na grupy wierszy o zadanym rozmiarze.
+    """
+    pq.write_table(pa.table({"trip_id": np.arange(rows)}), path, row_group_size=row_group_size)
+
+def test_plan_work_units_groups_row_groups(tmp_path):
+    """
+    Grupy wierszy powinny być łączone w jednostki do limitu wierszy, bez przekraczania granic plików.
+    """
+    _write_row_groups(tmp_path / "a.parquet", rows=50, row_group_size=10)
+    _write_row_groups(tmp_path / "b.parquet", rows=15, row_group_size=10)
+
+    units = plan_work_units(str(tmp_path), rows_per_unit=25)
+
+    assert [(u.file_path.split("/")[-1], u.row_groups, len(u)) for u in units] == [
+        ("a.parquet", [0, 1], 20),
+        ("a.parquet", [2, 3], 20),
+        ("a.parquet", [4], 10),
+        ("b.parquet", [0, 1], 15)
+    ]
+
+def test_load_work_unit_applies_keep_mask(tmp_path):
+    """
+    Deskryptor z maską powinien po przesłaniu do innego procesu wczytać tylko zachowane wiersze.
+    """
+    _write_row_groups(tmp_path / "a.parquet", rows=50, row_group_size=10)
+    unit = plan_work_units(str(tmp_path), rows_per_unit=30)[1]
+
+    unit.set_keep_mask(np.arange(len(unit)) % 2 == 0)
+    unit = pickle.loads(pickle.dumps(unit))
+    chunks = list(load_work_unit(unit, chunksize=7))
+
+    assert pd.concat(chunks)["trip_id"].tolist() == list(range(30, 50, 2))
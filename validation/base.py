@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 
 class BaseValidator(ABC):
     """
@@ -7,6 +11,13 @@ class BaseValidator(ABC):
 
     Każda klasa dziedzicząca musi zaimplementować metodę `validate`, która
     przyjmuje DataFrame i zwraca przefiltrowany DataFrame zgodnie z daną regułą.
+
+    Walidatory opisujące prostą regułę porównania mogą dodatkowo nadpisać metodę
+    `to_filter`, aby regułę dało się zastosować już podczas odczytu pliku Parquet.
+
+    Metoda `mask` zwraca regułę jako maskę logiczną – runner łączy maski wszystkich
+    walidatorów i filtruje chunk jednokrotnie (bez kopii DataFrame po każdej regule).
+    Metoda `arrow_mask` robi to samo dla paczki rekordów Arrow (silnik `core.arrow_engine`).
     """
 
     @abstractmethod
@@ -18,3 +29,41 @@ class BaseValidator(ABC):
         :return: Przefiltrowany DataFrame
         """
         pass
+
+    def to_filter(self) -> pc.Expression | None:
+        """
+        Zwraca regułę walidatora jako wyrażenie filtrujące pyarrow (predicate pushdown).
+
+        Domyślnie walidator nie ma odpowiednika po stronie skanera Parquet.
+
+        :return: Wyrażenie pyarrow lub None, jeśli reguły nie da się tak wyrazić
+        """
+        return None
+
+    def mask(self, df: pd.DataFrame) -> pd.Series | np.ndarray | None:
+        """
+        Zwraca maskę logiczną wierszy spełniających regułę (bez kopiowania danych).
+
+        Domyślna implementacja wyznacza maskę na podstawie `validate` (wymaga unikalnego indeksu),
+        więc walidatory powinny ją nadpisywać własnym, tańszym wyrażeniem.
+
+        :param df: DataFrame do sprawdzenia
+        :return: Maska wierszy do zachowania lub None, jeśli reguła nie odrzuca wierszy
+        """
+        return df.index.isin(self.validate(df).index)
+
+    def arrow_mask(self, batch: pa.RecordBatch | pa.Table) -> pa.BooleanArray | pa.ChunkedArray | None:
+        """
+        Zwraca maskę wierszy spełniających regułę dla paczki rekordów Arrow (bez pandas).
+
+        Domyślnie wylicza wyrażenie z `to_filter`; walidatory bez wyrażenia muszą ją nadpisać.
+
+        :param batch: Paczka rekordów (lub tabela złożona z paczek) do sprawdzenia
+        :return: Maska wierszy do zachowania (braki oznaczają odrzucenie) lub None, jeśli reguła nie odrzuca wierszy
+        :raises NotImplementedError: Gdy reguły nie da się policzyć na danych Arrow
+        """
+        expression = self.to_filter()
+        if expression is None:
+            raise NotImplementedError(f"{type(self).__name__} nie obsługuje danych Arrow")
+        table = batch if isinstance(batch, pa.Table) else pa.Table.from_batches([batch])
+        return ds.dataset(table).to_table(columns={"mask": expression}).column("mask")
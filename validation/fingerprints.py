@@ -0,0 +1,62 @@
+"""
+Moduł `fingerprints.py` wylicza 64-bitowe odciski wierszy (identyczne wiersze mają identyczne odciski).
+
+Odciski służą do wykrywania duplikatów – w obrębie chunku (`DropDuplicatesValidator`) oraz
+w całym zbiorze danych (`core.dedup.HashIndex`). Moduł nie zależy od pakietu `core`,
+więc walidatory mogą z niego korzystać bez zależności cyklicznej.
+
+Paczki rekordów Arrow mają własną funkcję odcisków (`batch_fingerprints`); odciski
+z obu funkcji nie są wymienne, więc jeden indeks powinien być zasilany jedną z nich.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Mnożnik używany przy łączeniu odcisków kolejnych kolumn
+_COMBINE_MULTIPLIER = np.uint64(1_000_003)
+
+def row_fingerprints(df: pd.DataFrame, columns: list[str] | None = None) -> np.ndarray:
+    """
+    Wylicza 64-bitowy odcisk każdego wiersza DataFrame.
+
+    :param df: Dane
+    :param columns: Kolumny brane pod uwagę (domyślnie wszystkie)
+    :return: Tablica uint64 o długości `len(df)`
+    """
+    if columns is not None:
+        df = df[columns]
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+def batch_fingerprints(batch: pa.RecordBatch | pa.Table, columns: list[str] | None = None) -> np.ndarray:
+    """
+    Wylicza 64-bitowy odcisk każdego wiersza paczki rekordów Arrow (bez tworzenia DataFrame).
+
+    Każda kolumna jest haszowana osobno (`pd.util.hash_array` na widoku numpy),
+    a odciski kolumn są łączone multiplikatywnie.
+
+    :param batch: Paczka rekordów (lub tabela złożona z paczek)
+    :param columns: Kolumny brane pod uwagę (domyślnie wszystkie)
+    :return: Tablica uint64 o długości `batch.num_rows`
+    """
+    names = columns or batch.schema.names
+    combined = np.zeros(batch.num_rows, dtype=np.uint64)
+    for name in names:
+        column = batch.column(name)
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        values = column.to_numpy(zero_copy_only=False)
+        combined = (combined ^ pd.util.hash_array(values)) * _COMBINE_MULTIPLIER
+    return combined
+
+def first_occurrences(fingerprints: np.ndarray) -> np.ndarray:
+    """
+    Wyznacza maskę pierwszych wystąpień odcisków (odpowiednik `~DataFrame.duplicated()`).
+
+    :param fingerprints: Odciski wierszy w kolejności wierszy
+    :return: Maska bool – True dla wierszy, których odcisk nie wystąpił wcześniej
+    """
+    _, first = np.unique(fingerprints, return_index=True)
+    mask = np.zeros(len(fingerprints), dtype=bool)
+    mask[first] = True
+    return mask
@@ -0,0 +1,134 @@
+"""
+Moduł `stats.py` zbiera statystyki odrzuceń dla każdej reguły walidacji.
+
+`ValidationStats` jest wypełniany przez `validate_chunk` na podstawie tych samych masek,
+którymi filtrowane są dane (bez dodatkowego przebiegu po danych). Obiekty z różnych
+chunków i procesów roboczych można łączyć (`merge`), a wynik zapisać jako JSON – sumy
+per reguła oraz zapis każdego chunku (liczby wierszy i odrzuceń per reguła).
+
+Reguły widzą tylko wiersze, które dotarły do walidacji. Wiersze odrzucone wcześniej przez
+filtr pushdown skanera Parquet (wraz z pominiętymi grupami wierszy) trafiają do osobnej
+pozycji "pushdown" – liczba wierszy z metadanych minus liczba wierszy odczytanych.
+"""
+
+import json
+import os
+
+
+class ValidationStats:
+    """
+    Mergowalne statystyki walidacji: liczba sprawdzonych wierszy oraz, dla każdej reguły,
+    liczba odrzuconych wierszy i łączny czas jej wykonania.
+
+    W trybie połączonym (maska) `rejected` to liczba wierszy niespełniających danej reguły
+    (reguły mogą się pokrywać), a `rejected_only` – wierszy odrzuconych wyłącznie przez nią.
+    W trybie sekwencyjnym `rejected` to liczba wierszy usuniętych na danym etapie.
+    """
+
+    def __init__(self):
+        self.chunks = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.rules: dict[str, dict] = {}
+        self.per_chunk: list[dict] = []
+        self.pushdown: dict | None = None
+        self._chunk_rules: dict[str, int] = {}
+
+    def record_chunk(self, rows_in: int, rows_out: int) -> None:
+        """
+        Rejestruje jeden przetworzony chunk.
+
+        :param rows_in: Liczba wierszy przed walidacją
+        :param rows_out: Liczba wierszy po walidacji
+        """
+        self.chunks += 1
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+        self.per_chunk.append({"rows_in": rows_in, "rows_out": rows_out, "rejected": self._chunk_rules})
+        self._chunk_rules = {}
+
+    def record_rule(self, rule: str, rejected: int, seconds: float, rejected_only: int | None = None) -> None:
+        """
+        Rejestruje wynik jednej reguły dla jednego chunku (zapis chunku zamyka `record_chunk`).
+
+        :param rule: Nazwa reguły (nazwa klasy walidatora)
+        :param rejected: Liczba wierszy odrzuconych przez regułę
+        :param seconds: Czas wykonania reguły w sekundach
+        :param rejected_only: Liczba wierszy odrzuconych wyłącznie przez tę regułę (tryb maski)
+        """
+        entry = self.rules.setdefault(rule, {"rejected": 0, "rejected_only": 0, "seconds": 0.0})
+        entry["rejected"] += int(rejected)
+        entry["rejected_only"] += int(rejected_only or 0)
+        entry["seconds"] += seconds
+        self._chunk_rules[rule] = self._chunk_rules.get(rule, 0) + int(rejected)
+
+    def record_pushdown(self, rows_total: int, rows_scanned: int) -> None:
+        """
+        Rejestruje wiersze odrzucone przy odczycie przez filtr pushdown (bez przypisania do reguł).
+
+        :param rows_total: Liczba wierszy zbioru według metadanych Parquet
+        :param rows_scanned: Liczba wierszy odczytanych przez skaner (po filtrze)
+        """
+        entry = self.pushdown or {"rows_total": 0, "rejected": 0}
+        entry["rows_total"] += int(rows_total)
+        entry["rejected"] += int(rows_total - rows_scanned)
+        self.pushdown = entry
+
+    def merge(self, other: "ValidationStats") -> "ValidationStats":
+        """
+        Dołącza statystyki z innego obiektu (np. z innego procesu roboczego).
+
+        :param other: Statystyki do dołączenia
+        :return: Ten obiekt (po scaleniu)
+        """
+        self.chunks += other.chunks
+        self.rows_in += other.rows_in
+        self.rows_out += other.rows_out
+        for rule, values in other.rules.items():
+            entry = self.rules.setdefault(rule, {"rejected": 0, "rejected_only": 0, "seconds": 0.0})
+            for key in entry:
+                entry[key] += values[key]
+        self.per_chunk.extend(other.per_chunk)
+        if other.pushdown is not None:
+            self.record_pushdown(other.pushdown["rows_total"], other.pushdown["rows_total"] - other.pushdown["rejected"])
+        return self
+
+    def to_dict(self) -> dict:
+        """
+        Zwraca statystyki w postaci nadającej się do zapisu jako JSON.
+
+        Reguły są posortowane malejąco według selektywności (udziału odrzuconych wierszy).
+        Zapisy chunków ("per_chunk") są w kolejności dołączania (w analizie równoległej –
+        w kolejności ukończenia zadań). "pushdown" to None, gdy filtr skanera nie był użyty.
+
+        :return: Słownik z sumami, odrzuceniami przy odczycie, listą reguł oraz zapisami chunków
+        """
+        rules = []
+        for rule, values in self.rules.items():
+            rules.append({
+                "rule": rule,
+                "rejected": values["rejected"],
+                "rejected_only": values["rejected_only"],
+                "selectivity": round(values["rejected"] / self.rows_in, 6) if self.rows_in else 0.0,
+                "seconds": round(values["seconds"], 6),
+            })
+        rules.sort(key=lambda r: r["selectivity"], reverse=True)
+        return {
+            "chunks": self.chunks,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rejected": self.rows_in - self.rows_out,
+            "pushdown": self.pushdown,
+            "rules": rules,
+            "per_chunk": [{"chunk": number, **chunk} for number, chunk in enumerate(self.per_chunk)],
+        }
+
+    def save(self, path: str = "data/output/validation_stats.json") -> None:
+        """
+        Zapisuje statystyki do pliku JSON.
+
+        :param path: Ścieżka zapisu
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
@@ -7,7 +7,16 @@ na danych typu DataFrame, filtrując niepoprawne rekordy i przygotowując dane d
 Używany m.in. w pipeline, czyszczeniu i testach.
 """
 
+from functools import reduce
+import operator
+import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from validation.base import BaseValidator
+from validation.stats import ValidationStats
 from validation.validators import (
     ColumnExistenceValidator,
     NoMissingValuesValidator,
@@ -25,21 +34,13 @@ REQUIRED_COLUMNS = [
     "fare_amount", "tpep_pickup_datetime", "tpep_dropoff_datetime"
 ]
 
-def validate_chunk(df: pd.DataFrame) -> pd.DataFrame:
+def build_validators() -> list[BaseValidator]:
     """
-    Przepuszcza dany DataFrame przez zestaw walidatorów.
-
-    Każdy walidator sprawdza określone zasady poprawności:
-    - obecność wymaganych kolumn
-    - brak wartości NaN
-    - dodatnie wartości liczbowe
-    - poprawność dat i czasu trwania przejazdu
-    - usunięcie duplikatów
+    Tworzy domyślną sekwencję walidatorów w kolejności ich stosowania.
 
-    :param df: Surowy DataFrame do walidacji
-    :return: Oczyszczony i zweryfikowany DataFrame
+    :return: Lista instancji walidatorów
     """
-    validators = [
+    return [
         ColumnExistenceValidator(REQUIRED_COLUMNS),
         NoMissingValuesValidator(),
         PositivePassengerCountValidator(),
@@ -51,16 +52,188 @@ def validate_chunk(df: pd.DataFrame) -> pd.DataFrame:
         DropDuplicatesValidator()
     ]
 
+def build_mask(
+    df: pd.DataFrame,
+    validators: list[BaseValidator] | None = None,
+    stats: ValidationStats | None = None
+) -> np.ndarray:
+    """
+    Łączy maski walidatorów w jedną maskę logiczną wierszy poprawnych.
+
+    Braki (NA) w maskach reguł są traktowane jako odrzucenie wiersza.
+
+    :param df: DataFrame do sprawdzenia
+    :param validators: Walidatory do zastosowania (domyślnie `build_validators()`)
+    :param stats: Jeśli podano, otrzymuje liczbę odrzuceń i czas każdej reguły
+    :return: Tablica bool o długości `len(df)`
+    """
+    if validators is None:
+        validators = build_validators()
+
+    combined = np.ones(len(df), dtype=bool)
+    rule_masks = {}
     for validator in validators:
-        df = validator.validate(df)
+        start = time.perf_counter()
+        mask = validator.mask(df)
+        if isinstance(mask, pd.Series):
+            mask = mask.to_numpy(dtype=bool, na_value=False)
+        if mask is not None:
+            combined &= mask
+        if stats is not None:
+            rule_masks[type(validator).__name__] = (mask, time.perf_counter() - start)
+
+    if stats is not None:
+        _record_mask_stats(stats, rule_masks)
+    return combined
+
+def build_arrow_mask(
+    batch: pa.RecordBatch | pa.Table,
+    validators: list[BaseValidator] | None = None,
+    stats: ValidationStats | None = None
+) -> np.ndarray:
+    """
+    Odpowiednik `build_mask` dla paczki rekordów Arrow – reguły liczone kernelami pyarrow.compute.
+
+    Reguły wyrażone tylko przez `to_filter` (bez własnej `arrow_mask`) są liczone razem –
+    jedną projekcją wszystkich wyrażeń na paczce; ich łączny czas jest dzielony po równo
+    między te reguły w statystykach.
+
+    :param batch: Paczka rekordów (lub tabela złożona z paczek) do sprawdzenia
+    :param validators: Walidatory do zastosowania (domyślnie `build_validators()`)
+    :param stats: Jeśli podano, otrzymuje liczbę odrzuceń i czas każdej reguły
+    :return: Tablica bool o długości `batch.num_rows`
+    """
+    if validators is None:
+        validators = build_validators()
+
+    combined = np.ones(batch.num_rows, dtype=bool)
+    rule_masks = {}
+    expressions = {}
+    for validator in validators:
+        if type(validator).arrow_mask is BaseValidator.arrow_mask and validator.to_filter() is not None:
+            expressions[type(validator).__name__] = validator.to_filter()
+            continue
+        start = time.perf_counter()
+        mask = validator.arrow_mask(batch)
+        if mask is not None:
+            mask = pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+            combined &= mask
+        rule_masks[type(validator).__name__] = (mask, time.perf_counter() - start)
+
+    if expressions:
+        start = time.perf_counter()
+        table = batch if isinstance(batch, pa.Table) else pa.Table.from_batches([batch])
+        masks = ds.dataset(table).to_table(columns=expressions)
+        seconds = (time.perf_counter() - start) / len(expressions)
+        for rule in expressions:
+            mask = pc.fill_null(masks.column(rule), False).to_numpy(zero_copy_only=False)
+            combined &= mask
+            rule_masks[rule] = (mask, seconds)
+
+    if stats is not None:
+        _record_mask_stats(stats, rule_masks)
+    return combined
+
+def _record_mask_stats(stats: ValidationStats, rule_masks: dict) -> None:
+    """
+    Zlicza odrzucenia każdej reguły na podstawie jej maski (bez ponownej walidacji danych).
 
+    :param stats: Statystyki do uzupełnienia
+    :param rule_masks: {nazwa reguły: (maska lub None, czas w sekundach)}
+    """
+    failures = [~mask for mask, _ in rule_masks.values() if mask is not None]
+    fail_count = np.sum(failures, axis=0) if failures else None
+    for rule, (mask, seconds) in rule_masks.items():
+        if mask is None:
+            stats.record_rule(rule, 0, seconds)
+            continue
+        rejected = ~mask
+        stats.record_rule(rule, rejected.sum(), seconds, (rejected & (fail_count == 1)).sum())
+
+def validate_chunk(
+    df: pd.DataFrame,
+    fused: bool = True,
+    stats: ValidationStats | None = None
+) -> pd.DataFrame:
+    """
+    Przepuszcza dany DataFrame przez zestaw walidatorów.
+
+    Każdy walidator sprawdza określone zasady poprawności:
+    - obecność wymaganych kolumn
+    - brak wartości NaN
+    - dodatnie wartości liczbowe
+    - poprawność dat i czasu trwania przejazdu
+    - usunięcie duplikatów
+
+    W trybie połączonym (domyślnym) reguły są liczone jako maski na oryginalnym chunku,
+    a dane są filtrowane tylko raz. Tryb sekwencyjny wywołuje `validate` każdego walidatora
+    po kolei (kopia danych po każdej regule).
+
+    :param df: Surowy DataFrame do walidacji
+    :param fused: Czy użyć jednej połączonej maski zamiast filtracji sekwencyjnej
+    :param stats: Jeśli podano, zbiera liczbę odrzuceń i czas każdej reguły (z tych samych masek)
+    :return: Oczyszczony i zweryfikowany DataFrame
+    """
+    rows_in = len(df)
+    if fused:
+        mask = build_mask(df, stats=stats)
+        if not mask.all():
+            df = df[mask]
+    else:
+        for validator in build_validators():
+            start = time.perf_counter()
+            rows_before = len(df)
+            df = validator.validate(df)
+            if stats is not None:
+                stats.record_rule(type(validator).__name__, rows_before - len(df), time.perf_counter() - start)
+
+    if stats is not None:
+        stats.record_chunk(rows_in, len(df))
     return df.reset_index(drop=True)
 
-def run_all_validations(df: pd.DataFrame) -> pd.DataFrame:
+def validate_batch(
+    batch: pa.RecordBatch | pa.Table,
+    stats: ValidationStats | None = None
+) -> pa.RecordBatch | pa.Table:
+    """
+    Waliduje paczkę rekordów Arrow bez konwersji do pandas (jedna maska, jedno filtrowanie).
+
+    :param batch: Surowa paczka rekordów (lub tabela złożona z paczek)
+    :param stats: Jeśli podano, zbiera liczbę odrzuceń i czas każdej reguły
+    :return: Dane tego samego typu zawierające tylko poprawne wiersze
+    """
+    mask = build_arrow_mask(batch, stats=stats)
+    if not mask.all():
+        batch = batch.filter(pa.array(mask))
+    if stats is not None:
+        stats.record_chunk(len(mask), batch.num_rows)
+    return batch
+
+def build_pushdown_filter(validators: list[BaseValidator] | None = None) -> pc.Expression | None:
+    """
+    Łączy proste reguły walidatorów w jedno wyrażenie filtrujące dla skanera Parquet.
+
+    Wyrażenie jest jedynie wstępnym filtrem – rekordy, które je spełniają, nadal
+    przechodzą przez `validate_chunk` (reguły bez odpowiednika w pyarrow, np. duplikaty).
+
+    :param validators: Walidatory do przetłumaczenia (domyślnie `build_validators()`)
+    :return: Koniunkcja wyrażeń pyarrow lub None, jeśli żadna reguła się nie kwalifikuje
+    """
+    if validators is None:
+        validators = build_validators()
+
+    expressions = [v.to_filter() for v in validators]
+    expressions = [e for e in expressions if e is not None]
+    if not expressions:
+        return None
+    return reduce(operator.and_, expressions)
+
+def run_all_validations(df: pd.DataFrame, stats: ValidationStats | None = None) -> pd.DataFrame:
     """
     Alias dla validate_chunk – stosowany w pipeline i testach.
 
     :param df: DataFrame do walidacji
+    :param stats: Opcjonalne statystyki odrzuceń per reguła
     :return: Zweryfikowany i przefiltrowany DataFrame
     """
-    return validate_chunk(df)
+    return validate_chunk(df, stats=stats)
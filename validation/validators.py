@@ -10,36 +10,67 @@ Każdy walidator realizuje jedną konkretną zasadę filtracji danych, np.:
 Walidatory mogą być stosowane niezależnie lub jako sekwencja w `validation_runner.py`.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from validation.base import BaseValidator
+from validation.fingerprints import batch_fingerprints, first_occurrences
+
+MIN_TRIP_DURATION = pd.Timedelta(0)
+MAX_TRIP_DURATION = pd.Timedelta(seconds=86400)
 
 class PositivePassengerCountValidator(BaseValidator):
     """
     Przepuszcza tylko rekordy z liczbą pasażerów > 0.
     """
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df[df["passenger_count"] > 0]
+        return df[self.mask(df)]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return df["passenger_count"] > 0
+
+    def to_filter(self) -> pc.Expression:
+        return pc.field("passenger_count") > 0
 
 class PositiveDistanceValidator(BaseValidator):
     """
     Filtruje rekordy z dodatnią długością trasy (> 0 mil).
     """
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df[df["trip_distance"] > 0]
+        return df[self.mask(df)]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return df["trip_distance"] > 0
+
+    def to_filter(self) -> pc.Expression:
+        return pc.field("trip_distance") > 0
 
 class PositiveFareValidator(BaseValidator):
     """
     Akceptuje tylko rekordy, gdzie fare_amount i total_amount są dodatnie (> 0).
     """
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df[(df["fare_amount"] > 0) & (df["total_amount"] > 0)]
+        return df[self.mask(df)]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return (df["fare_amount"] > 0) & (df["total_amount"] > 0)
+
+    def to_filter(self) -> pc.Expression:
+        return (pc.field("fare_amount") > 0) & (pc.field("total_amount") > 0)
 
 class ValidDateRangeValidator(BaseValidator):
     """
     Usuwa rekordy, gdzie data zakończenia kursu jest wcześniejsza niż data rozpoczęcia.
     """
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df[df["tpep_dropoff_datetime"] > df["tpep_pickup_datetime"]]
+        return df[self.mask(df)]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return df["tpep_dropoff_datetime"] > df["tpep_pickup_datetime"]
+
+    def to_filter(self) -> pc.Expression:
+        return pc.field("tpep_dropoff_datetime") > pc.field("tpep_pickup_datetime")
 
 class DropDuplicatesValidator(BaseValidator):
     """
@@ -48,12 +79,26 @@ class DropDuplicatesValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
         return df.drop_duplicates()
 
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        # Duplikaty są identyczne w całości, więc pozostałe reguły zawsze odrzucają je razem
+        # z oryginałem – maska liczona na całym chunku daje ten sam wynik co po filtracji.
+        return ~df.duplicated()
+
+    def arrow_mask(self, batch: pa.RecordBatch | pa.Table) -> pa.BooleanArray:
+        return pa.array(first_occurrences(batch_fingerprints(batch)))
+
 class PositiveTipValidator(BaseValidator):
     """
     Usuwa rekordy z ujemną wartością napiwku (tip_amount >= 0).
     """
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df[df["tip_amount"] >= 0]
+        return df[self.mask(df)]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return df["tip_amount"] >= 0
+
+    def to_filter(self) -> pc.Expression:
+        return pc.field("tip_amount") >= 0
 
 class ColumnExistenceValidator(BaseValidator):
     """
@@ -71,6 +116,16 @@ class ColumnExistenceValidator(BaseValidator):
             raise ValueError(f"Brakuje wymaganych kolumn: {missing}")
         return df
 
+    def mask(self, df: pd.DataFrame) -> None:
+        self.validate(df)
+        return None
+
+    def arrow_mask(self, batch: pa.RecordBatch | pa.Table) -> None:
+        missing = [col for col in self.required_columns if col not in batch.schema.names]
+        if missing:
+            raise ValueError(f"Brakuje wymaganych kolumn: {missing}")
+        return None
+
 class NoMissingValuesValidator(BaseValidator):
     """
     Usuwa rekordy zawierające jakiekolwiek wartości NaN.
@@ -78,6 +133,16 @@ class NoMissingValuesValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
         return df.dropna()
 
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return df.notna().all(axis=1)
+
+    def arrow_mask(self, batch: pa.RecordBatch | pa.Table) -> pa.BooleanArray:
+        valid = pa.array(np.ones(batch.num_rows, dtype=bool))
+        for column in batch.columns:
+            if column.null_count or pa.types.is_floating(column.type):
+                valid = pc.and_(valid, pc.invert(pc.is_null(column, nan_is_null=True)))
+        return valid
+
 class TripDurationValidator(BaseValidator):
     """
     Filtruje rekordy, gdzie czas trwania przejazdu jest ≤ 0 lub > 24h.
@@ -85,5 +150,16 @@ class TripDurationValidator(BaseValidator):
     Zakładamy, że kurs nie powinien trwać dłużej niż 86400 sekund (24 godziny).
     """
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
-        duration = (df["tpep_dropoff_datetime"] - df["tpep_pickup_datetime"]).dt.total_seconds()
-        return df[(duration > 0) & (duration < 86400)]
+        return df[self.mask(df)]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        # Porównanie na timedelta – bez konwersji całej kolumny na sekundy (float)
+        duration = df["tpep_dropoff_datetime"] - df["tpep_pickup_datetime"]
+        return (duration > MIN_TRIP_DURATION) & (duration < MAX_TRIP_DURATION)
+
+    def arrow_mask(self, batch: pa.RecordBatch | pa.Table) -> pa.BooleanArray:
+        duration = pc.subtract(batch.column("tpep_dropoff_datetime"), batch.column("tpep_pickup_datetime"))
+        return pc.and_(
+            pc.greater(duration, pa.scalar(MIN_TRIP_DURATION.to_pytimedelta(), type=duration.type)),
+            pc.less(duration, pa.scalar(MAX_TRIP_DURATION.to_pytimedelta(), type=duration.type))
+        )